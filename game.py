@@ -1,16 +1,8 @@
 # -*- coding: utf-8 -*-
 
-from astrobox.space_field import SpaceField
-
-from yurikov_team.yurikov import YurikovDrone
-from yurikov_team import settings
+from runner.cli import main
 
 if __name__ == '__main__':
-    scene = SpaceField(
-        speed=settings.DRONES_SPEED,
-        asteroids_count=settings.ASTEROIDS_AMOUNT,
-    )
-    drones = [YurikovDrone() for _ in range(settings.DRONES_AMOUNT)]
-    scene.go()
+    main(teams=['yurikov'])
 
 # Второй этап: зачёт!
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+Профилировщик выделений памяти в горячих функциях команд (включается только явно).
+
+Для каждой функции из HOT_FUNCTIONS считаются вызовы, созданные объекты Point/Vector и пик
+временной памяти за вызов (tracemalloc), с разбивкой по командам. Для всего матча считаются
+Point/Vector за шаг и сборки мусора по поколениям на 1000 шагов.
+
+Запуск:
+    python -m runner.allocations yurikov reaper driller devastator --steps 2000 --seed 3 --can-fight
+"""
+import argparse
+import contextlib
+import gc
+import importlib
+import io
+import sys
+import tracemalloc
+
+from runner.match import run_match
+from runner.teams import available_teams
+from yurikov_team import settings
+
+# (модуль, имя функции или Класс.метод)
+HOT_FUNCTIONS = (
+    ('yurikov_team.utils', 'get_combat_point'),
+    ('yurikov_team.utils', 'normalize_point'),
+    ('yurikov_team.utils', 'get_next_point'),
+    ('stage_03_harvesters.utils.states', 'get_point_on_way_to'),
+    ('stage_04_soldiers.devastator', 'Headquarters.get_place_near'),
+    ('stage_04_soldiers.devastator', 'Headquarters.get_place_for_attack'),
+)
+
+
+class FunctionStats:
+
+    def __init__(self):
+        self.calls = 0
+        self.geometry = 0
+        self.peak_bytes = 0
+
+
+class AllocationProfiler:
+    """
+    Профилировщик выделений памяти.
+
+    Функции оборачиваются на время install() - uninstall(). Вложенные вызовы профилируемых функций
+    считаются отдельно: пик памяти внешнего вызова не теряется при сбросе пика во вложенном.
+
+    """
+
+    def __init__(self, functions: tuple = HOT_FUNCTIONS, trace_memory: bool = True):
+        self.functions = functions
+        self.trace_memory = trace_memory
+        self.stats = {}
+        self.ticks = 0
+        self.geometry_total = 0
+        self.collections = [0, 0, 0]
+        self._patched = []
+        self._stack = []
+
+    def install(self) -> None:
+        from robogame_engine import geometry
+
+        for module_name, name in self.functions:
+            module = importlib.import_module(module_name)
+            if '.' in name:
+                class_name, method = name.split('.')
+                owner = getattr(module, class_name)
+                self._patch(owner, method, self._wrap(owner.__dict__[method], name, module_name))
+            else:
+                func = getattr(module, name)
+                wrapper = self._wrap(func, name, module_name)
+                # Функцию могли импортировать в другие модули через from ... import
+                for other in list(sys.modules.values()):
+                    if getattr(other, name, None) is func:
+                        self._patch(other, name, wrapper)
+        for cls in (geometry.Point, geometry.Vector):
+            self._patch(cls, '__init__', self._count(cls.__init__))
+        gc.callbacks.append(self._on_gc)
+        if self.trace_memory:
+            tracemalloc.start()
+
+    def uninstall(self) -> None:
+        if self.trace_memory:
+            tracemalloc.stop()
+        gc.callbacks.remove(self._on_gc)
+        for owner, name, original in reversed(self._patched):
+            setattr(owner, name, original)
+        self._patched = []
+
+    def end_tick(self) -> None:
+        self.ticks += 1
+
+    def _patch(self, owner, name, wrapper) -> None:
+        self._patched.append((owner, name, getattr(owner, name)))
+        setattr(owner, name, wrapper)
+
+    def _on_gc(self, phase: str, info: dict) -> None:
+        if phase == 'start':
+            self.collections[info['generation']] += 1
+
+    def _count(self, init):
+        profiler = self
+
+        def wrapper(obj, *args, **kwargs):
+            profiler.geometry_total += 1
+            if profiler._stack:
+                profiler._stack[-1][0].geometry += 1
+            init(obj, *args, **kwargs)
+
+        return wrapper
+
+    def _wrap(self, func, name: str, module_name: str):
+        profiler = self
+        default_team = module_name.split('.')[0]
+
+        def wrapper(*args, **kwargs):
+            first = args[0] if args else next(iter(kwargs.values()), None)
+            team = getattr(first, 'team', None)
+            if not isinstance(team, str):
+                team = default_team
+            key = (name, team)
+            if key not in profiler.stats:
+                profiler.stats[key] = FunctionStats()
+            stats = profiler.stats[key]
+            stats.calls += 1
+            start = 0
+            if profiler.trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                if profiler._stack:
+                    parent = profiler._stack[-1]
+                    parent[2] = max(parent[2], peak - parent[1])
+                tracemalloc.reset_peak()
+                start = current
+            frame = [stats, start, 0]
+            profiler._stack.append(frame)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler._stack.pop()
+                if profiler.trace_memory:
+                    stats.peak_bytes += max(frame[2], tracemalloc.get_traced_memory()[1] - start)
+
+        return wrapper
+
+    def format(self) -> str:
+        ticks = max(self.ticks, 1)
+        lines = ['{:<36}{:<18}{:>8}{:>12}{:>14}{:>14}'.format(
+            'function', 'team', 'calls', 'calls/tick', 'Point+Vector', 'peak B/call')]
+        for (name, team), stats in sorted(self.stats.items()):
+            peak = '{:.0f}'.format(stats.peak_bytes / stats.calls) if self.trace_memory else '-'
+            lines.append('{:<36}{:<18}{:>8}{:>12.2f}{:>14}{:>14}'.format(
+                name, team, stats.calls, stats.calls / ticks, stats.geometry, peak))
+        lines.append('ticks {}, Point+Vector per tick {:.1f}, gc collections per 1000 ticks: {}'.format(
+            self.ticks, self.geometry_total / ticks,
+            ' / '.join('{:.1f}'.format(c * 1000 / ticks) for c in self.collections)))
+        return '\n'.join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Allocation profile of hot team functions')
+    parser.add_argument('teams', nargs='+', choices=available_teams())
+    parser.add_argument('--steps', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--can-fight', action='store_true')
+    parser.add_argument('--field', type=int, nargs=2, default=settings.FIELD_SIZE, metavar=('WIDTH', 'HEIGHT'))
+    parser.add_argument('--no-tracemalloc', action='store_true', help='count objects and gc runs only')
+    args = parser.parse_args()
+
+    profiler = AllocationProfiler(trace_memory=not args.no_tracemalloc)
+    # Импорт команд до установки обёрток, чтобы подменить функции во всех модулях
+    for module_name, _ in profiler.functions:
+        importlib.import_module(module_name)
+    profiler.install()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_match(args.teams, field=tuple(args.field), can_fight=args.can_fight, headless=True, seed=args.seed,
+                      max_steps=args.steps, on_step=profiler.end_tick)
+    finally:
+        profiler.uninstall()
+    print(profiler.format())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""
+Замер стоимости решений команд за один шаг игры.
+
+Для каждой комбинации (астероидов, дронов в команде, команд в матче) играется короткий матч
+без интерфейса, время обработчиков команд суммируется по шагам. Результат - таблица и JSON,
+который можно сравнить с сохранённым ранее (--baseline).
+
+Запуск:
+    python -m runner.bench --asteroids 27 500 --drones 5 20 --team-counts 2 4 --output bench.json
+    python -m runner.bench --baseline bench.json --threshold .1 --tail-threshold .25
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import multiprocessing
+import statistics
+import sys
+import time
+
+from runner.match import run_match
+from runner.patching import Patcher, team_callbacks
+from runner.scenarios import Scenario
+from runner.teams import available_teams, load_team
+from runner.warm import WarmPool
+
+# Площадь поля на один астероид как в стандартной игре: 27 астероидов на поле 1200x1200
+FIELD_AREA_PER_ASTEROID = 1200 * 1200 / 27
+
+
+class DecisionTimer:
+    """
+    Таймер решений команд.
+
+    Оборачивает обработчики on_* и game_step, объявленные в классах команды, и суммирует их время
+    по командам за каждый шаг игры. Время движка (astrobox Drone.game_step), вызванного из game_step
+    команды, вычитается, а вызванные из него обработчики команды считаются отдельно.
+
+    """
+
+    def __init__(self, drone_classes: list):
+        from astrobox.core import Drone
+
+        self._engine_class = Drone
+        self._drone_classes = drone_classes
+        self._patcher = Patcher()
+        self._depth = 0
+        self._excluded = 0.0
+        self.current = {cls.__name__: 0.0 for cls in drone_classes}
+        self.samples = {cls.__name__: [] for cls in drone_classes}
+
+    def install(self) -> None:
+        for cls, name in team_callbacks(self._drone_classes, self._engine_class):
+            self._patcher.patch(cls, name, self._decision)
+        self._patcher.patch(self._engine_class, 'game_step', self._engine)
+
+    def uninstall(self) -> None:
+        self._patcher.restore()
+
+    def _decision(self, func):
+        timer = self
+
+        def wrapper(obj, *args, **kwargs):
+            if timer._depth:
+                return func(obj, *args, **kwargs)
+            timer._depth += 1
+            timer._excluded = 0.0
+            begin = time.perf_counter()
+            try:
+                return func(obj, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - begin - timer._excluded
+                timer._depth -= 1
+                team = type(obj).__name__
+                if team in timer.current:
+                    timer.current[team] += elapsed
+
+        return wrapper
+
+    def _engine(self, func):
+        timer = self
+
+        def wrapper(obj, *args, **kwargs):
+            if not timer._depth:
+                return func(obj, *args, **kwargs)
+            depth, excluded = timer._depth, timer._excluded
+            timer._depth = 0
+            begin = time.perf_counter()
+            try:
+                return func(obj, *args, **kwargs)
+            finally:
+                timer._depth = depth
+                timer._excluded = excluded + time.perf_counter() - begin
+
+        return wrapper
+
+    def end_tick(self) -> None:
+        for team, elapsed in self.current.items():
+            self.samples[team].append(elapsed)
+            self.current[team] = 0.0
+
+
+def percentile(values: list, rate: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(math.ceil(rate * len(ordered))) - 1))]
+
+
+def summarize(samples: list) -> dict:
+    """
+    Посчитать статистику времени решений за шаг (в микросекундах).
+
+    :param samples: list, время решений команды за каждый шаг в секундах
+    :return: dict, ticks, mean_us, p50_us, p95_us, p99_us, max_us
+    """
+
+    micro = [s * 1e6 for s in samples]
+    return dict(ticks=len(micro), mean_us=round(statistics.mean(micro), 2), p50_us=round(percentile(micro, .5), 2),
+                p95_us=round(percentile(micro, .95), 2), p99_us=round(percentile(micro, .99), 2),
+                max_us=round(max(micro), 2))
+
+
+def bench_match(task: tuple) -> list:
+    """
+    Сыграть один матч с таймером решений (в процессе-исполнителе).
+
+    :param task: tuple, (команды, астероидов, дронов в команде, шагов, зерно, стрельба)
+    :return: list, строки результата для каждой команды матча
+    """
+
+    teams, asteroids, drones, steps, seed, can_fight = task
+    side = max(1200, int(round(math.sqrt(asteroids * FIELD_AREA_PER_ASTEROID), -2)))
+    scenario = Scenario('bench', seed, field=(side, side), asteroids=asteroids, teams=len(teams), drones=drones)
+    timer = DecisionTimer([load_team(name) for name in teams])
+    timer.install()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_match(teams, headless=True, seed=seed, max_steps=steps, scenario=scenario, can_fight=can_fight,
+                      on_step=timer.end_tick)
+    finally:
+        timer.uninstall()
+    rows = []
+    for name in teams:
+        samples = timer.samples[load_team(name).__name__]
+        rows.append(dict(summarize(samples), team=name, asteroids=asteroids, drones=drones, teams=len(teams)))
+    return rows
+
+
+def make_tasks(teams: list, asteroids: list, drones: list, team_counts: list, steps: int, seed: int,
+               can_fight: bool) -> list:
+    """
+    Составить матчи матрицы. Для k команд в матче список команд делится на группы по k
+    (последняя группа дополняется с начала списка), так что каждая команда играет хотя бы раз.
+
+    """
+
+    tasks = []
+    for count in team_counts:
+        groups = []
+        for start in range(0, len(teams), count):
+            groups.append([teams[(start + i) % len(teams)] for i in range(min(count, len(teams)))])
+        for a in asteroids:
+            for d in drones:
+                for group in groups:
+                    tasks.append((group, a, d, steps, seed, can_fight))
+    return tasks
+
+
+def row_key(row: dict) -> tuple:
+    return row['team'], row['asteroids'], row['drones'], row['teams']
+
+
+def merge_rows(rows: list) -> list:
+    # Команда могла сыграть в нескольких матчах одной ячейки матрицы - берём худший результат
+    merged = {}
+    for row in rows:
+        key = row_key(row)
+        if key not in merged or row['mean_us'] > merged[key]['mean_us']:
+            merged[key] = row
+    return [merged[key] for key in sorted(merged)]
+
+
+def compare(rows: list, baseline: list, threshold: float, tail_threshold: float) -> list:
+    """
+    Сравнить результаты с базовыми.
+
+    :param rows: list, текущие результаты
+    :param baseline: list, сохранённые результаты
+    :param threshold: float, допустимый относительный рост среднего времени
+    :param tail_threshold: float, допустимый относительный рост p99
+    :return: list, описания регрессий
+    """
+
+    base = {row_key(row): row for row in baseline}
+    regressions = []
+    for row in rows:
+        old = base.get(row_key(row))
+        if old is None:
+            continue
+        for field, limit in (('mean_us', threshold), ('p99_us', tail_threshold)):
+            if old[field] > 0 and row[field] > old[field] * (1.0 + limit):
+                regressions.append('{} {}: {:.1f} -> {:.1f} us (+{:.0%})'.format(
+                    row_key(row), field, old[field], row[field], row[field] / old[field] - 1.0))
+    return regressions
+
+
+def format_table(rows: list, baseline: list = None) -> str:
+    base = {row_key(row): row for row in baseline or []}
+    lines = ['{:<11}{:>10}{:>7}{:>6}{:>11}{:>11}{:>11}{:>11}{:>9}'.format(
+        'team', 'asteroids', 'drones', 'teams', 'mean us', 'p95 us', 'p99 us', 'max us', 'vs base')]
+    for row in rows:
+        old = base.get(row_key(row))
+        diff = '{:+.0%}'.format(row['mean_us'] / old['mean_us'] - 1.0) if old and old['mean_us'] else ''
+        lines.append('{:<11}{:>10}{:>7}{:>6}{:>11.1f}{:>11.1f}{:>11.1f}{:>11.1f}{:>9}'.format(
+            row['team'], row['asteroids'], row['drones'], row['teams'], row['mean_us'], row['p95_us'],
+            row['p99_us'], row['max_us'], diff))
+    return '\n'.join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Per-tick decision cost benchmark')
+    parser.add_argument('--teams', nargs='+', default=available_teams(), choices=available_teams())
+    parser.add_argument('--asteroids', type=int, nargs='+', default=[27, 200])
+    parser.add_argument('--drones', type=int, nargs='+', default=[5, 20])
+    parser.add_argument('--team-counts', type=int, nargs='+', default=[2, 4])
+    parser.add_argument('--steps', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--peaceful', action='store_true', help='drones can not fight')
+    parser.add_argument('--workers', type=int, default=1, help='parallel matches (timings get noisier)')
+    parser.add_argument('--warm', action='store_true', help='reuse worker processes between matches')
+    parser.add_argument('--output', default='bench.json')
+    parser.add_argument('--baseline', help='results file to compare with')
+    parser.add_argument('--threshold', type=float, default=.1, help='allowed mean growth')
+    parser.add_argument('--tail-threshold', type=float, default=.25, help='allowed p99 growth')
+    args = parser.parse_args()
+
+    tasks = make_tasks(args.teams, args.asteroids, args.drones, args.team_counts, args.steps, args.seed,
+                       not args.peaceful)
+    # Состояние сцены и команд хранится в атрибутах классов, поэтому каждый матч - в новом процессе
+    # или в тёплом, где это состояние сбрасывается после матча
+    if args.warm:
+        with WarmPool(args.teams, processes=args.workers) as pool:
+            results = pool.map(bench_match, tasks)
+    else:
+        with multiprocessing.Pool(processes=args.workers, maxtasksperchild=1) as pool:
+            results = pool.map(bench_match, tasks, chunksize=1)
+    rows = merge_rows([row for rows in results for row in rows])
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+    print(format_table(rows, baseline))
+
+    meta = dict(steps=args.steps, seed=args.seed, can_fight=not args.peaceful, python=sys.version.split()[0])
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(dict(meta=meta, results=rows), f, indent=1, sort_keys=True)
+
+    if baseline is not None:
+        regressions = compare(rows, baseline, args.threshold, args.tail_threshold)
+        for line in regressions:
+            print('REGRESSION', line)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+Контрольная точка посреди матча: что было бы, если бы с этого шага команда играла иначе.
+
+Матч без интерфейса играется до шага tick, затем процесс делится (os.fork, страницы памяти
+копируются только при записи). Каждый дочерний процесс применяет свою ветку - параметры команды
+(см. runner.params) или функцию, которая меняет стратегию, - и доигрывает матч; сам процесс
+доигрывает матч без изменений (ветка baseline). Результаты веток приходят по каналам.
+
+Начало матча не переигрывается, поэтому поздние решения (например, отступление в бою
+yurikov_team.states.CombatState) сравниваются в несколько раз дешевле, чем полными матчами.
+Параметры, которые команда читает только при рождении дронов (LIMIT_HEALTH_MIN у devastator), в ветках
+уже не действуют. Потоки не переживают fork: фоновое планирование (HARVEST_TOUR_BACKGROUND) должно быть выключено.
+
+Запуск:
+    python -m runner.checkpoint yurikov devastator --can-fight --seed 1 --tick 3000 --max-steps 6000 \
+        --branch cautious yurikov_team.settings.RETREAT_HEALTH=.7 \
+        --branch brave yurikov_team.settings.RETREAT_HEALTH=.2
+"""
+import argparse
+import ast
+import contextlib
+import io
+import os
+import pickle
+import sys
+import traceback
+
+from runner.match import run_match
+from runner.params import apply_params
+from runner.teams import available_teams
+from yurikov_team import settings
+
+BASELINE = 'baseline'
+
+
+class Checkpoint:
+    """
+    Деление матча на ветки на шаге tick.
+
+    branches - {имя ветки: параметры {'модуль.ИМЯ': значение} или функция от сцены}.
+    Одновременно идут не больше workers дочерних процессов (None - по числу процессоров).
+
+    """
+
+    def __init__(self, tick: int, branches: dict, workers: int = None):
+        if not hasattr(os, 'fork'):
+            raise RuntimeError('Checkpoints need os.fork, not available on {}'.format(sys.platform))
+        if BASELINE in branches:
+            raise ValueError('Branch name {!r} is reserved'.format(BASELINE))
+        self.tick = tick
+        self.branches = branches
+        self.workers = workers or os.cpu_count() or 1
+        # Имя ветки в дочернем процессе, None - в исходном
+        self.branch = None
+        self.forked = False
+        self.results = {}
+        self._scene = None
+        self._running = []
+        self._pipe = None
+
+    def attach(self, scene) -> None:
+        self._scene = scene
+
+    def on_step(self) -> None:
+        """
+        Вызывается после каждого шага игры.
+
+        :return: None
+        """
+
+        if self.forked or self._scene._step < self.tick:
+            return
+        self.forked = True
+        sys.stdout.flush()
+        sys.stderr.flush()
+        for name, branch in self.branches.items():
+            if len(self._running) >= self.workers:
+                self._collect(self._running.pop(0))
+            read_end, write_end = os.pipe()
+            pid = os.fork()
+            if pid == 0:
+                os.close(read_end)
+                self.branch, self._pipe, self._running = name, write_end, []
+                if callable(branch):
+                    branch(self._scene)
+                else:
+                    apply_params(branch)
+                return
+            os.close(write_end)
+            self._running.append((name, pid, read_end))
+
+    def finish(self, result: dict = None, error: str = None) -> None:
+        """
+        Отправить результат ветки и завершить дочерний процесс.
+
+        :param result: dict, результат матча
+        :param error: str, текст исключения, если ветка не доиграла
+        :return: None (не возвращается)
+        """
+
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            with os.fdopen(self._pipe, 'wb') as f:
+                pickle.dump((result, error), f)
+        finally:
+            os._exit(0 if error is None else 1)
+
+    def _collect(self, child: tuple) -> None:
+        name, pid, read_end = child
+        with os.fdopen(read_end, 'rb') as f:
+            data = f.read()
+        os.waitpid(pid, 0)
+        if not data:
+            raise RuntimeError('Branch {} exited without a result'.format(name))
+        result, error = pickle.loads(data)
+        if error is not None:
+            raise RuntimeError('Branch {} failed:\n{}'.format(name, error))
+        self.results[name] = result
+
+    def collect(self) -> dict:
+        """
+        Дождаться всех веток.
+
+        :return: dict, {имя ветки: результат матча}
+        """
+
+        while self._running:
+            self._collect(self._running.pop(0))
+        return self.results
+
+
+def play_branches(teams: list, tick: int, branches: dict, workers: int = None, **match_kwargs) -> dict:
+    """
+    Сыграть матч до шага tick и доиграть его в каждой ветке.
+
+    :param teams: list, имена команд
+    :param tick: int, шаг контрольной точки
+    :param branches: dict, {имя ветки: параметры {'модуль.ИМЯ': значение} или функция от сцены}
+    :param workers: int, сколько веток играется одновременно
+    :param match_kwargs: параметры run_match (seed, max_steps, can_fight, ...), матч всегда без интерфейса
+    :return: dict, {имя ветки: результат матча}, исходный матч - ветка baseline
+    """
+
+    checkpoint = Checkpoint(tick, branches, workers=workers)
+    try:
+        result = run_match(teams, headless=True, checkpoint=checkpoint, **match_kwargs)
+    except Exception:
+        if checkpoint.branch is None:
+            raise
+        checkpoint.finish(error=traceback.format_exc())
+    if checkpoint.branch is not None:
+        checkpoint.finish(result)
+    results = checkpoint.collect()
+    if not checkpoint.forked:
+        raise RuntimeError('Match ended at step {} before the checkpoint at {}'.format(result['game_steps'], tick))
+    return dict(results, **{BASELINE: result})
+
+
+def parse_branch(spec: list) -> tuple:
+    """
+    Разобрать ветку из командной строки: имя и пары модуль.ИМЯ=значение (значение - литерал Python или строка).
+
+    :param spec: list, ['имя', 'модуль.ИМЯ=значение', ...]
+    :return: tuple, (имя, параметры)
+    """
+
+    name, params = spec[0], {}
+    for item in spec[1:]:
+        key, _, value = item.partition('=')
+        try:
+            params[key] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            params[key] = value
+    return name, params
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Fork a headless match at a tick and play out parameter branches')
+    parser.add_argument('teams', nargs='+', choices=available_teams())
+    parser.add_argument('--tick', type=int, required=True, help='step to fork the match at')
+    parser.add_argument('--branch', nargs='+', action='append', default=[], metavar='NAME [MODULE.NAME=VALUE]',
+                        help='branch name and team parameters to change')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--max-steps', type=int, default=None)
+    parser.add_argument('--can-fight', action='store_true')
+    parser.add_argument('--field', type=int, nargs=2, default=settings.FIELD_SIZE, metavar=('WIDTH', 'HEIGHT'))
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    branches = dict(parse_branch(spec) for spec in args.branch)
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = play_branches(args.teams, args.tick, branches, workers=args.workers, seed=args.seed,
+                                max_steps=args.max_steps, can_fight=args.can_fight, field=tuple(args.field))
+    for name in [BASELINE] + list(branches):
+        result = results[name]
+        print('{:<16} steps {:>6}  collected {}  dead {}'.format(name, result['game_steps'], result['collected'],
+                                                                 result.get('dead', {})))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import argparse
+
+from runner.match import run_match
+from runner.pacing import FramePacer
+from runner.params import load_profile
+from runner.scenarios import CATALOG_PATH, Catalog
+from runner.startup import StartupReport
+from runner.teams import available_teams, load_team
+
+
+def main(teams: list, can_fight: bool = False, field: tuple = None) -> dict:
+    """
+    Точка входа для скриптов game.py.
+
+    :param teams: list, команды по умолчанию
+    :param can_fight: bool, разрешено ли дронам стрелять
+    :param field: tuple, размер игрового поля
+    :return: dict, результаты игры
+    """
+
+    report = StartupReport()
+    parser = argparse.ArgumentParser(description='Run astrobox match')
+    parser.add_argument('teams', nargs='*', default=teams, help='team names, default: %(default)s')
+    parser.add_argument('--list-teams', action='store_true', help='print available teams and exit')
+    parser.add_argument('--headless', action='store_true', help='run without UI')
+    parser.add_argument('--startup-report', action='store_true', help='print import times and time to first tick')
+    parser.add_argument('--params', metavar='PATH', help='load parameter profile written by runner.tuner')
+    parser.add_argument('--scenario', help='scenario name from the catalog')
+    parser.add_argument('--catalog', default=CATALOG_PATH, help='scenario catalog, default: %(default)s')
+    parser.add_argument('--seed', type=int, help='random seed for the match')
+    parser.add_argument('--trace', metavar='PATH', help='write Chrome trace of drone decisions at match end')
+    parser.add_argument('--frame-skip', type=int, metavar='TICKS', help='game ticks per rendered frame')
+    parser.add_argument('--fps', type=float, help='render at this frame rate, ticks between frames run unthrottled')
+    parser.add_argument('--max-tps', type=float, help='limit simulation speed, ticks per second (with --frame-skip or --fps)')
+    parser.add_argument('--metrics-port', type=int, metavar='PORT',
+                        help='serve live match metrics on http://127.0.0.1:PORT/metrics (0 - any free port)')
+    args = parser.parse_args()
+
+    if args.list_teams:
+        print('\n'.join(available_teams()))
+        return {}
+
+    if args.params:
+        load_profile(args.params)
+    scenario = Catalog(args.catalog).get(args.scenario) if args.scenario else None
+    pacer = None
+    if args.frame_skip or args.fps:
+        pacer = FramePacer(ticks_per_frame=args.frame_skip, fps=args.fps, max_tps=args.max_tps)
+    tracer = None
+    if args.trace:
+        from runner.trace import Tracer
+
+        tracer = Tracer([load_team(name) for name in args.teams])
+        tracer.install()
+    metrics = server = None
+    if args.metrics_port is not None:
+        from runner.metrics import MatchMetrics, MetricsServer
+
+        metrics = MatchMetrics([load_team(name) for name in args.teams])
+        metrics.install()
+        server = MetricsServer(metrics, port=args.metrics_port)
+        server.start()
+        print('metrics: {}'.format(server.url))
+    try:
+        result = run_match(args.teams, field=field, can_fight=can_fight, headless=args.headless,
+                           report=report if args.startup_report else None, seed=args.seed, scenario=scenario,
+                           pacer=pacer, metrics=metrics)
+    finally:
+        # Обёртки снимаются в обратном порядке установки: метрики стоят поверх трассировки
+        if server is not None:
+            server.close()
+            metrics.uninstall()
+        if tracer is not None:
+            tracer.uninstall()
+            tracer.write(args.trace)
+    if args.startup_report:
+        print(report.format())
+    return result
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+import importlib
+import random
+
+from runner.pacing import FramePacer
+from runner.scenarios import Scenario
+from runner.startup import StartupReport
+from runner.teams import load_team, seed_team
+from yurikov_team import settings
+
+
+def run_match(teams: list, drones_amount: int = settings.DRONES_AMOUNT, field: tuple = None,
+              speed: int = settings.DRONES_SPEED, asteroids_count: int = settings.ASTEROIDS_AMOUNT,
+              can_fight: bool = False, headless: bool = False, report: StartupReport = None,
+              seed: int = None, max_steps: int = None, scenario: Scenario = None, on_step=None,
+              pacer: FramePacer = None, metrics=None, checkpoint=None) -> dict:
+    """
+    Запустить матч между выбранными командами.
+
+    Модули движка и команд импортируются только здесь и только для выбранных команд.
+
+    :param teams: list, имена команд (см. runner.teams.TEAMS)
+    :param drones_amount: int, количество дронов в каждой команде
+    :param field: tuple, размер игрового поля (ширина, высота), None - размер из темы
+    :param speed: int, скорость игры
+    :param asteroids_count: int, количество астероидов
+    :param can_fight: bool, разрешено ли дронам стрелять
+    :param headless: bool, запуск без интерфейса
+    :param report: StartupReport, отчёт о старте (необязательно)
+    :param seed: int, зерно генератора случайных чисел (расстановка астероидов и решения команд)
+    :param max_steps: int, остановить матч после заданного количества шагов
+    :param scenario: Scenario, расстановка из каталога сценариев (задаёт поле, астероиды и размер команд)
+    :param on_step: callable, вызывается без аргументов после каждого шага игры
+    :param pacer: FramePacer, пропуск кадров при отрисовке (без интерфейса кадры только считаются)
+    :param metrics: runner.metrics.MatchMetrics, метрики матча (обработчики команд уже обёрнуты install())
+    :param checkpoint: runner.checkpoint.Checkpoint, деление матча на ветки на заданном шаге
+    :return: dict, результаты игры
+    """
+
+    field_module = 'astrobox.space_field' if scenario is None else 'runner.scenario_field'
+    if report is not None:
+        space_field = report.import_module(field_module)
+    else:
+        space_field = importlib.import_module(field_module)
+    drone_classes = [load_team(name, report=report) for name in teams]
+    if seed is not None:
+        random.seed(seed)
+        for name in teams:
+            seed_team(name, seed)
+
+    scene_kwargs = dict(speed=speed, can_fight=can_fight, headless=headless)
+    if scenario is not None:
+        if len(teams) > scenario.teams:
+            raise ValueError('Scenario {} is for {} teams'.format(scenario.name, scenario.teams))
+        drones_amount = scenario.drones
+        scene = space_field.ScenarioField(scenario, **scene_kwargs)
+    else:
+        if field is not None:
+            scene_kwargs['field'] = field
+        scene = space_field.SpaceField(asteroids_count=asteroids_count, **scene_kwargs)
+    for drone_class in drone_classes:
+        for _ in range(drones_amount):
+            drone_class()
+
+    if on_step is not None:
+        step_game = scene.game_step
+
+        def game_step_with_callback():
+            step_game()
+            on_step()
+
+        scene.game_step = game_step_with_callback
+
+    if checkpoint is not None:
+        checkpoint.attach(scene)
+        step_checked = scene.game_step
+
+        def game_step_checked():
+            step_checked()
+            checkpoint.on_step()
+
+        scene.game_step = game_step_checked
+
+    if metrics is not None:
+        metrics.attach(scene)
+        step_measured = scene.game_step
+
+        def game_step_measured():
+            step_measured()
+            metrics.on_step()
+
+        scene.game_step = game_step_measured
+
+    if pacer is not None:
+        pacer.install(scene)
+        step_paced = scene.game_step
+
+        def game_step_paced():
+            step_paced()
+            pacer.on_step()
+
+        scene.game_step = game_step_paced
+
+    if report is not None:
+        native_game_step = scene.game_step
+
+        def game_step():
+            native_game_step()
+            report.mark_first_tick()
+            scene.game_step = native_game_step
+
+        scene.game_step = game_step
+
+    if max_steps is not None:
+        native_game_result = scene.get_game_result
+
+        def get_game_result():
+            if scene._step >= max_steps:
+                game_state = scene._get_game_state()
+                scene.print_game_statistics(stats=game_state)
+                return True, scene._make_game_result(game_state)
+            return native_game_result()
+
+        scene.get_game_result = get_game_result
+
+    return scene.go()
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+Метрики идущего матча по HTTP, только для localhost.
+
+Поток симуляции обновляет метрики без блокировок: номер шага и длительности обработчиков пишутся
+на месте (обработчик пишет в свой кольцевой буфер), а раз в interval секунд собирается новый снимок
+(скорость, элериум и живые дроны по командам), который публикуется одним присваиванием.
+Сервер в фоновом потоке только читает: копирует буферы и считает перцентили при запросе,
+так что без запросов симуляция его не замечает.
+
+    /metrics       - текстовый формат Prometheus
+    /metrics.json  - JSON
+
+Запуск:
+    python -m stage_04_soldiers.game --headless --metrics-port 9100
+    curl http://127.0.0.1:9100/metrics
+"""
+import json
+import threading
+import time
+from array import array
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from runner.bench import percentile
+from runner.patching import Patcher, team_callbacks
+
+# Сколько последних вызовов каждого обработчика хранится для перцентилей
+LATENCY_WINDOW = 1024
+PERCENTILES = (.5, .9, .99)
+LOCALHOST = ('127.0.0.1', 'localhost')
+
+
+class LatencyWindow:
+    """
+    Кольцевой буфер длительностей вызовов одного обработчика.
+
+    Пишет только поток симуляции, читатель копирует массив целиком (одна операция под GIL).
+
+    """
+
+    def __init__(self, size: int = LATENCY_WINDOW):
+        self._values = array('d', [0.0]) * size
+        self._next = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        i = self._next
+        self._values[i] = value
+        self._next = i + 1 if i + 1 < len(self._values) else 0
+        self.count += 1
+
+    def values(self) -> list:
+        # Счётчик читается до копии: в копии не меньше записанных значений
+        count = self.count
+        values = self._values[:]
+        return values[:min(count, len(values))].tolist()
+
+
+class MatchMetrics:
+    """
+    Метрики матча.
+
+    install() оборачивает обработчики on_* и game_step, объявленные в классах команд, attach() вызывается
+    из run_match со сценой, on_step() - после каждого шага игры.
+
+    """
+
+    def __init__(self, drone_classes: list, interval: float = 0.5, window: int = LATENCY_WINDOW,
+                 clock=time.perf_counter):
+        from astrobox.core import Drone
+
+        self._engine_class = Drone
+        self._drone_classes = drone_classes
+        self._interval = interval
+        self._window = window
+        self._clock = clock
+        self._patcher = Patcher()
+        self._scene = None
+        self._next_sample = 0.0
+        self._last = None
+        self.latency = {}
+        self.tick = 0
+        self.state = dict(tick=0, tps=0.0, teams={})
+
+    def install(self) -> None:
+        for cls, name in team_callbacks(self._drone_classes, self._engine_class):
+            self._patcher.patch(cls, name, self._timed, '{}.{}'.format(cls.__name__, name))
+
+    def uninstall(self) -> None:
+        self._patcher.restore()
+
+    def _timed(self, func, label):
+        window = self.latency[label] = LatencyWindow(self._window)
+        add, clock = window.add, self._clock
+
+        def timed(obj, *args, **kwargs):
+            begin = clock()
+            try:
+                return func(obj, *args, **kwargs)
+            finally:
+                add(clock() - begin)
+
+        return timed
+
+    def attach(self, scene) -> None:
+        self._scene = scene
+        now = self._clock()
+        self._last = (now, scene._step)
+        self._next_sample = now + self._interval
+
+    def on_step(self) -> None:
+        """
+        Вызывается после каждого шага игры.
+
+        :return: None
+        """
+
+        self.tick = self._scene._step
+        now = self._clock()
+        if now >= self._next_sample:
+            self._next_sample = now + self._interval
+            self._sample(now)
+
+    def _sample(self, now: float) -> None:
+        scene = self._scene
+        last_time, last_tick = self._last
+        self._last = (now, self.tick)
+        teams = {}
+        for team, drones in scene.teams.items():
+            teams[team] = dict(elerium=sum(drone.payload for drone in drones if drone.is_alive),
+                               alive=sum(1 for drone in drones if drone.is_alive))
+        for ship in scene.motherships:
+            if ship.team in teams and ship.is_alive:
+                teams[ship.team]['elerium'] += ship.payload
+        self.state = dict(tick=self.tick, tps=round((self.tick - last_tick) / (now - last_time), 2), teams=teams)
+
+    def snapshot(self) -> dict:
+        """
+        Текущие метрики (вызывается из потока сервера).
+
+        :return: dict, tick, tps, teams {команда: {elerium, alive}}, callbacks {обработчик: {count, p50_us, ...}}
+        """
+
+        state = self.state
+        callbacks = {}
+        for label, window in list(self.latency.items()):
+            values = window.values()
+            if not values:
+                continue
+            stats = dict(count=window.count)
+            for rate in PERCENTILES:
+                stats['p{}_us'.format(int(rate * 100))] = round(percentile(values, rate) * 1e6, 2)
+            callbacks[label] = stats
+        return dict(tick=self.tick, tps=state['tps'], teams=state['teams'], callbacks=callbacks)
+
+    def prometheus(self) -> str:
+        """
+        Метрики в текстовом формате Prometheus.
+
+        :return: str
+        """
+
+        snapshot = self.snapshot()
+        lines = ['# TYPE astrobox_tick gauge', 'astrobox_tick {}'.format(snapshot['tick']),
+                 '# TYPE astrobox_ticks_per_second gauge', 'astrobox_ticks_per_second {}'.format(snapshot['tps']),
+                 '# TYPE astrobox_elerium gauge']
+        lines += ['astrobox_elerium{{team="{}"}} {}'.format(team, values['elerium'])
+                  for team, values in sorted(snapshot['teams'].items())]
+        lines.append('# TYPE astrobox_alive_drones gauge')
+        lines += ['astrobox_alive_drones{{team="{}"}} {}'.format(team, values['alive'])
+                  for team, values in sorted(snapshot['teams'].items())]
+        lines.append('# TYPE astrobox_callback_latency_seconds summary')
+        for label, stats in sorted(snapshot['callbacks'].items()):
+            for rate in PERCENTILES:
+                lines.append('astrobox_callback_latency_seconds{{callback="{}",quantile="{}"}} {:.9g}'.format(
+                    label, rate, stats['p{}_us'.format(int(rate * 100))] / 1e6))
+            lines.append('astrobox_callback_latency_seconds_count{{callback="{}"}} {}'.format(label, stats['count']))
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsServer:
+    """
+    HTTP-сервер метрик в фоновом потоке.
+
+    """
+
+    def __init__(self, metrics: MatchMetrics, port: int = 0, host: str = '127.0.0.1'):
+        if host not in LOCALHOST:
+            raise ValueError('metrics are served on localhost only, got {}'.format(host))
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                if self.path == '/metrics':
+                    body, content_type = metrics.prometheus(), 'text/plain; version=0.0.4'
+                elif self.path == '/metrics.json':
+                    body, content_type = json.dumps(metrics.snapshot()), 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name='metrics', daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return 'http://{}:{}/metrics'.format(host, port)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
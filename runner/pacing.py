@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Пропуск кадров при просмотре матча.
+
+Движок отрисовывает кадр каждые speed шагов и после кадра досыпает до GAME_STEP_MIN_TIME.
+FramePacer берёт это на себя: логика команд по-прежнему выполняется каждый шаг, а кадр в интерфейс
+отправляется раз в ticks_per_frame шагов или, в адаптивном режиме, когда с прошлого кадра прошло 1 / fps секунд.
+Между кадрами симуляция идёт без пауз, max_tps ограничивает её скорость (шагов в секунду).
+"""
+import time
+
+
+class FramePacer:
+    """
+    Решает на каждом шаге, отправлять ли кадр в интерфейс.
+
+    scene.game_speed не меняется: движок учитывает его и в самой симуляции (торможение сбитых дронов,
+    анимации), и матч с пропуском кадров должен идти так же, как без него. Кадры, которые движок отправляет
+    сам, отбрасываются на трубе в интерфейс (scene.parent_conn), а нужные кадры отправляет on_step().
+    Шаг по одному из интерфейса (режим отладки) всегда отрисовывается.
+
+    """
+
+    def __init__(self, ticks_per_frame: int = None, fps: float = None, max_tps: float = None,
+                 clock=time.perf_counter, sleep=time.sleep):
+        if ticks_per_frame is None and fps is None:
+            raise ValueError('ticks_per_frame or fps is required')
+        if ticks_per_frame is not None and ticks_per_frame < 1:
+            raise ValueError('ticks_per_frame must be positive')
+        self.ticks_per_frame = ticks_per_frame
+        self.frame_time = 1.0 / fps if fps else 0.0
+        self.tick_time = 1.0 / max_tps if max_tps else 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._scene = None
+        self._objects_status = None
+        self._conn = None
+        self._send = None
+        self._one_step = False
+        self._last_frame_step = 0
+        self._next_frame = 0.0
+        self._next_tick = 0.0
+        self.frames = 0
+        self.ticks = 0
+
+    def install(self, scene) -> None:
+        """
+        Подключить к сцене до начала игры.
+
+        Движок строит состояние объектов для интерфейса раз в game_speed шагов, после подключения
+        он получает None и не отправляет его.
+
+        :param scene: сцена движка
+        :return: None
+        """
+
+        self._scene = scene
+        scene.time_sleep = 0.0
+        self._objects_status = scene.get_objects_status
+        scene.get_objects_status = lambda: None
+        now = self._clock()
+        self._next_frame = now
+        self._next_tick = now
+
+    def _connect(self, conn) -> None:
+        # The engine opens the pipe in scene.go(), after install()
+        self._conn = conn
+        self._send = conn.send
+        recv = conn.recv
+
+        def send(obj):
+            if obj is not None:
+                self._send(obj)
+
+        def recv_ui_state():
+            ui_state = recv()
+            if getattr(ui_state, 'one_step', False):
+                self._one_step = True
+            return ui_state
+
+        conn.send = send
+        conn.recv = recv_ui_state
+
+    def _wait(self, deadline: float) -> float:
+        now = self._clock()
+        if now < deadline:
+            self._sleep(deadline - now)
+            now = deadline
+        return now
+
+    def on_step(self) -> None:
+        """
+        Вызывается после каждого шага игры, до отправки кадра движком.
+
+        :return: None
+        """
+
+        scene = self._scene
+        step = scene._step
+        if scene.parent_conn is not None and scene.parent_conn is not self._conn:
+            self._connect(scene.parent_conn)
+        self.ticks += 1
+        if self.tick_time:
+            self._next_tick = max(self._next_tick + self.tick_time, self._clock() - self.tick_time)
+            now = self._wait(self._next_tick)
+        else:
+            now = self._clock()
+
+        if self.ticks_per_frame is not None:
+            render = step - self._last_frame_step >= self.ticks_per_frame
+            if render and self.frame_time:
+                now = self._wait(self._next_frame)
+        else:
+            render = now >= self._next_frame
+
+        if render or self._one_step:
+            self._one_step = False
+            self.frames += 1
+            self._last_frame_step = step
+            self._next_frame = now + self.frame_time
+            if self._send is not None:
+                self._send(self._objects_status())
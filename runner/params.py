@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+import importlib
+import json
+import random
+
+
+class Parameter:
+    """
+    Настраиваемый параметр команды - константа уровня модуля.
+
+    Команды читают константу при каждом обращении, поэтому установка атрибута модуля
+    меняет поведение без правки кода команды.
+
+    """
+
+    def __init__(self, team: str, module: str, name: str, low, high):
+        self.team = team
+        self.module = module
+        self.name = name
+        self.low = low
+        self.high = high
+
+    @property
+    def key(self) -> str:
+        return '{}.{}'.format(self.module, self.name)
+
+    @property
+    def default(self):
+        return getattr(importlib.import_module(self.module), self.name)
+
+    def sample(self, rnd: random.Random):
+        """
+        Получить случайное значение из диапазона параметра.
+
+        :param rnd: random.Random, генератор случайных чисел
+        :return: int or float, значение параметра
+        """
+
+        if isinstance(self.low, int) and isinstance(self.high, int):
+            return rnd.randint(self.low, self.high)
+        return rnd.uniform(self.low, self.high)
+
+
+PARAMETERS = [
+    Parameter('yurikov', 'yurikov_team.settings', 'RETREAT_HEALTH', .2, .7),
+    Parameter('yurikov', 'yurikov_team.settings', 'SYNC_STEPS_DUEL', 10, 200),
+    Parameter('yurikov', 'yurikov_team.settings', 'SYNC_STEPS_PER_TEAM', 25, 250),
+    Parameter('yurikov', 'yurikov_team.settings', 'TOUR_STOPS', 1, 4),
+    Parameter('reaper', 'stage_03_harvesters.utils.states', 'HARVEST_EARLY_STEPS', 0, 1000),
+    Parameter('reaper', 'stage_03_harvesters.utils.states', 'HARVEST_EARLY_FULLNESS', .5, .99),
+    Parameter('reaper', 'stage_03_harvesters.utils.states', 'HARVEST_LATE_FULLNESS', .75, .99),
+    Parameter('reaper', 'stage_03_harvesters.utils.states', 'HARVEST_TOUR_STOPS', 1, 4),
+    Parameter('devastator', 'stage_04_soldiers.devastator', 'LIMIT_HEALTH_MIN', .1, .5),
+    Parameter('devastator', 'stage_04_soldiers.devastator', 'LIMIT_HEALTH_MAX', .3, .8),
+    Parameter('devastator', 'stage_04_soldiers.devastator', 'ROLE_SWITCH_PAYLOAD', 200, 3000),
+    Parameter('devastator', 'stage_04_soldiers.devastator', 'TOUR_STOPS', 1, 4),
+]
+# DrillerDrone наследует состояния ReaperDrone
+PARAMETERS += [Parameter('driller', p.module, p.name, p.low, p.high) for p in PARAMETERS if p.team == 'reaper']
+
+
+def team_parameters(team: str) -> list:
+    """
+    Получить параметры команды.
+
+    :param team: str, имя команды (см. runner.teams.TEAMS)
+    :return: list, список объектов Parameter
+    """
+
+    return [p for p in PARAMETERS if p.team == team]
+
+
+def apply_params(params: dict) -> None:
+    """
+    Установить значения параметров.
+
+    :param params: dict, {'модуль.ИМЯ': значение}
+    :return: None
+    """
+
+    for key, value in params.items():
+        module_name, name = key.rsplit('.', 1)
+        module = importlib.import_module(module_name)
+        if not hasattr(module, name):
+            raise AttributeError('Module {} has no parameter {}'.format(module_name, name))
+        setattr(module, name, value)
+
+
+def save_profile(path: str, params: dict, **info) -> None:
+    """
+    Записать профиль параметров в JSON.
+
+    :param path: str, путь к файлу
+    :param params: dict, {'модуль.ИМЯ': значение}
+    :param info: дополнительные сведения (результат подбора, цель и т.п.)
+    :return: None
+    """
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(dict(info, params=params), f, indent=2, sort_keys=True)
+
+
+def load_profile(path: str) -> dict:
+    """
+    Прочитать профиль параметров и применить его.
+
+    :param path: str, путь к файлу
+    :return: dict, применённые параметры
+    """
+
+    with open(path, encoding='utf-8') as f:
+        params = json.load(f)['params']
+    apply_params(params)
+    return params
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Обёртки методов классов команд и движка на время матча (таймер решений, трассировка, метрики, запись решений).
+
+Несколько наборов обёрток могут стоять одновременно, каждый следующий оборачивает предыдущий.
+Снимать их нужно в обратном порядке: набор, снятый раньше стоящего поверх него, вернул бы
+свои обёртки при снятии верхнего, поэтому Patcher.restore() в таком случае - ошибка.
+"""
+
+_MISSING = object()
+
+
+def team_callbacks(drone_classes: list, engine_class: type) -> list:
+    """
+    Найти обработчики движка (on_* и game_step), объявленные в классах команд.
+
+    :param drone_classes: list, классы дронов команд
+    :param engine_class: type, класс дрона движка, его и базовые классы не трогаем
+    :return: list, пары (класс, имя метода) без повторов
+    """
+
+    found = []
+    for drone_class in drone_classes:
+        for cls in drone_class.__mro__:
+            if cls is engine_class:
+                break
+            for name, func in list(cls.__dict__.items()):
+                if (name.startswith('on_') or name == 'game_step') and callable(func) and (cls, name) not in found:
+                    found.append((cls, name))
+    return found
+
+
+class Patcher:
+    """
+    Набор обёрток методов классов.
+
+    """
+
+    def __init__(self):
+        self._patched = []
+
+    def is_patched(self, cls: type, name: str) -> bool:
+        return any(c is cls and n == name for c, n, _, _ in self._patched)
+
+    def patch(self, cls: type, name: str, wrap, *args) -> None:
+        """
+        Обернуть метод класса, метод, уже обёрнутый этим набором, пропускается.
+
+        :param cls: type, класс
+        :param name: str, имя метода (может быть унаследован, тогда обёртка ставится в сам класс)
+        :param wrap: callable, функция от исходного метода (и args), возвращающая обёртку
+        :param args: дополнительные аргументы wrap
+        :return: None
+        """
+
+        if self.is_patched(cls, name):
+            return
+        original = cls.__dict__.get(name, _MISSING)
+        wrapper = wrap(getattr(cls, name) if original is _MISSING else original, *args)
+        self._patched.append((cls, name, original, wrapper))
+        setattr(cls, name, wrapper)
+
+    def restore(self) -> None:
+        """
+        Вернуть исходные методы.
+
+        :return: None
+        """
+
+        for cls, name, _, wrapper in self._patched:
+            if cls.__dict__.get(name) is not wrapper:
+                raise RuntimeError('{}.{} is wrapped again on top, restore patches in reverse order of install'.format(
+                    cls.__name__, name))
+        for cls, name, original, _ in reversed(self._patched):
+            if original is _MISSING:
+                delattr(cls, name)
+            else:
+                setattr(cls, name, original)
+        self._patched = []
+
+    def __len__(self):
+        return len(self._patched)
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+from astrobox.core import Asteroid, MotherShip
+from astrobox.space_field import SpaceField
+from astrobox.theme import theme
+from robogame_engine.geometry import Point
+
+from runner.scenarios import Scenario
+
+
+class ScenarioField(SpaceField):
+    """
+    Игровое поле с расстановкой астероидов из сценария.
+
+    Базы и дроны расставляются так же, как в SpaceField.
+
+    """
+
+    def __init__(self, scenario: Scenario, **kwargs):
+        self.scenario = scenario
+        self._scenario_motherships = {}
+        kwargs['field'] = scenario.field
+        kwargs['asteroids_count'] = scenario.asteroids_count
+        kwargs['max_drones_at_team'] = max(scenario.drones, theme.MAX_DRONES_AT_TEAM)
+        super().__init__(**kwargs)
+
+    def _fill_space(self, asteroids_count, field_reduce_rate=1.5):
+        for x, y, payload in self.scenario.asteroids:
+            Asteroid(coord=Point(x, y), elerium=payload)
+
+        max_elerium = round(self.scenario.total_elerium, -2) + 100
+        if not theme.DRONES_CAN_FIGHT:
+            max_elerium = round(max_elerium * 1.5 / self.teams_count, -2)
+        max_elerium = max(max_elerium, 1000)
+
+        for i, team_name in enumerate(self.teams):
+            mothership = MotherShip(coord=self._get_team_pos(team_number=i), max_payload=max_elerium)
+            mothership.set_team(team_name)
+            self._scenario_motherships[team_name] = mothership
+
+        for drone in self.drones:
+            drone.coord = drone.mothership.coord.copy()
+
+    def get_mothership(self, team_name):
+        return self._scenario_motherships.get(team_name)
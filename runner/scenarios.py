@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Генератор воспроизводимых сценариев (расстановок) для матчей.
+
+Сценарий полностью задаётся спецификацией: зерно, размер поля, количество и распределение
+элериума астероидов, количество команд и дронов. В каталоге хранятся только спецификации
+и контрольная сумма расстановки, сама расстановка генерируется заново при загрузке.
+
+Запуск:
+    python -m runner.scenarios generate huge --seed 7 --field 12000 12000 --asteroids 5000 --drones 50
+    python -m runner.scenarios list
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+
+CATALOG_PATH = os.path.join(os.path.dirname(__file__), 'scenarios.json')
+DISTRIBUTIONS = ('uniform', 'exponential')
+
+# Размеры объектов движка (astrobox.core), чтобы не импортировать движок при генерации
+MOTHERSHIP_RADIUS = 90
+ASTEROID_RADIUS = 50
+
+
+class Scenario:
+    """
+    Сценарий матча: спецификация и сгенерированная по ней расстановка астероидов.
+
+    """
+
+    def __init__(self, name: str, seed: int, field: tuple = (1200, 1200), asteroids: int = 27,
+                 payload: tuple = ('uniform', 100, 200), teams: int = 4, drones: int = 5):
+        if payload[0] not in DISTRIBUTIONS:
+            raise ValueError('payload distribution must be one of {}'.format(DISTRIBUTIONS))
+        if not 1 <= teams <= 4:
+            raise ValueError('teams must be from 1 to 4')
+        self.name = name
+        self.seed = seed
+        self.field = tuple(field)
+        self.asteroids_count = asteroids
+        self.payload = tuple(payload)
+        self.teams = teams
+        self.drones = drones
+        self.asteroids = self._generate()
+
+    @property
+    def spec(self) -> dict:
+        return dict(seed=self.seed, field=list(self.field), asteroids=self.asteroids_count,
+                    payload=list(self.payload), teams=self.teams, drones=self.drones)
+
+    @property
+    def checksum(self) -> str:
+        layout = ';'.join('{:.1f},{:.1f},{}'.format(*a) for a in self.asteroids)
+        return hashlib.sha1(layout.encode()).hexdigest()[:12]
+
+    @property
+    def total_elerium(self) -> int:
+        return sum(a[2] for a in self.asteroids)
+
+    def _generate(self) -> list:
+        """
+        Расставить астероиды по ячейкам сетки со случайным смещением внутри ячейки,
+        не заходя в углы поля, где стоят базы.
+
+        :return: list, список (x, y, элериум)
+        """
+
+        rnd = random.Random(self.seed)
+        width, height = self.field
+        margin = MOTHERSHIP_RADIUS * 3
+        area_w, area_h = width - 2 * margin, height - 2 * margin
+        if area_w < ASTEROID_RADIUS or area_h < ASTEROID_RADIUS:
+            raise ValueError('Field {}x{} is too small'.format(width, height))
+
+        count = self.asteroids_count
+        cells_w = max(1, int(math.ceil(math.sqrt(area_w / area_h * count))))
+        cells_h = max(1, int(math.ceil(count / cells_w)))
+        cell_w, cell_h = area_w / cells_w, area_h / cells_h
+        cells = rnd.sample(range(cells_w * cells_h), count)
+
+        asteroids = []
+        for cell in cells:
+            x = margin + (cell % cells_w + rnd.uniform(.15, .85)) * cell_w
+            y = margin + (cell // cells_w + rnd.uniform(.15, .85)) * cell_h
+            asteroids.append((round(x, 1), round(y, 1), self._payload(rnd)))
+        return asteroids
+
+    def _payload(self, rnd: random.Random) -> int:
+        distribution, low, high = self.payload
+        if distribution == 'uniform':
+            return rnd.randint(low, high)
+        # exponential: большинство астероидов бедные, редкие - богатые
+        return min(high, low + int(rnd.expovariate(3.0 / (high - low))))
+
+
+class Catalog:
+    """
+    Каталог сценариев в JSON-файле: {имя: спецификация + контрольная сумма}.
+
+    """
+
+    def __init__(self, path: str = CATALOG_PATH):
+        self.path = path
+        self.specs = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.specs = json.load(f)
+
+    def names(self) -> list:
+        return sorted(self.specs)
+
+    def add(self, scenario: Scenario) -> None:
+        self.specs[scenario.name] = dict(scenario.spec, checksum=scenario.checksum)
+
+    def get(self, name: str) -> Scenario:
+        """
+        Сгенерировать сценарий по спецификации из каталога.
+
+        Если генератор изменился и расстановка не совпадает с сохранённой - ошибка,
+        иначе результаты разных версий нельзя сравнивать.
+
+        :param name: str, имя сценария
+        :return: Scenario, сценарий
+        """
+
+        if name not in self.specs:
+            raise KeyError('Unknown scenario {!r}, available: {}'.format(name, ', '.join(self.names())))
+        spec = dict(self.specs[name])
+        checksum = spec.pop('checksum', None)
+        scenario = Scenario(name, **spec)
+        if checksum is not None and checksum != scenario.checksum:
+            raise ValueError('Scenario {!r} layout changed: {} != {}'.format(name, scenario.checksum, checksum))
+        return scenario
+
+    def save(self) -> None:
+        # Одна строка на сценарий, чтобы каталог было удобно сравнивать между коммитами
+        lines = ['  {}: {}'.format(json.dumps(name), json.dumps(self.specs[name], sort_keys=True))
+                 for name in self.names()]
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('{\n' + ',\n'.join(lines) + '\n}\n')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Generate reproducible match scenarios')
+    parser.add_argument('--catalog', default=CATALOG_PATH)
+    commands = parser.add_subparsers(dest='command', required=True)
+    generate = commands.add_parser('generate')
+    generate.add_argument('name')
+    generate.add_argument('--seed', type=int, required=True)
+    generate.add_argument('--field', type=int, nargs=2, default=(1200, 1200), metavar=('WIDTH', 'HEIGHT'))
+    generate.add_argument('--asteroids', type=int, default=27)
+    generate.add_argument('--payload', choices=DISTRIBUTIONS, default='uniform')
+    generate.add_argument('--payload-range', type=int, nargs=2, default=(100, 200), metavar=('MIN', 'MAX'))
+    generate.add_argument('--teams', type=int, default=4)
+    generate.add_argument('--drones', type=int, default=5)
+    commands.add_parser('list')
+    args = parser.parse_args()
+
+    catalog = Catalog(args.catalog)
+    if args.command == 'generate':
+        scenario = Scenario(args.name, args.seed, field=args.field, asteroids=args.asteroids,
+                            payload=(args.payload,) + tuple(args.payload_range), teams=args.teams, drones=args.drones)
+        catalog.add(scenario)
+        catalog.save()
+    for name in catalog.names():
+        scenario = catalog.get(name)
+        print('{:<12} field {}x{}, {} asteroids ({} elerium), {} teams x {} drones'.format(
+            name, scenario.field[0], scenario.field[1], scenario.asteroids_count, scenario.total_elerium,
+            scenario.teams, scenario.drones))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+import importlib
+import time
+
+
+class StartupReport:
+    """
+    Отчёт о старте матча.
+
+    Собирает время импорта каждого модуля, загруженного через import_module(),
+    и время от создания отчёта до первого шага игры.
+
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.imports = []
+        self.first_tick = None
+
+    def import_module(self, name: str):
+        """
+        Импортировать модуль с замером времени.
+
+        Время вложенных импортов входит во время модуля, который импортирован первым.
+
+        :param name: str, полное имя модуля
+        :return: module, объект модуля
+        """
+
+        begin = time.perf_counter()
+        module = importlib.import_module(name)
+        self.imports.append((name, time.perf_counter() - begin))
+        return module
+
+    def mark_first_tick(self) -> None:
+        """
+        Отметить завершение первого шага игры (повторные вызовы игнорируются).
+
+        :return: None
+        """
+
+        if self.first_tick is None:
+            self.first_tick = time.perf_counter() - self.started
+
+    def as_dict(self) -> dict:
+        return {
+            'imports': dict(self.imports),
+            'imports_total': sum(sec for _, sec in self.imports),
+            'first_tick': self.first_tick,
+        }
+
+    def format(self) -> str:
+        lines = ['Startup report:', '-' * 35]
+        for name, sec in self.imports:
+            lines.append('{:<35}:{:>8.1f} ms'.format(name, sec * 1000))
+        if self.first_tick is not None:
+            lines.append('{:<35}:{:>8.1f} ms'.format('first tick', self.first_tick * 1000))
+        return '\n'.join(lines)
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+import copy
+import importlib
+import random
+import sys
+
+from runner.startup import StartupReport
+
+# Имя команды -> (модуль, класс дрона). Модуль импортируется только при выборе команды в матч
+TEAMS = {
+    'yurikov': ('yurikov_team.yurikov', 'YurikovDrone'),
+    'reaper': ('stage_03_harvesters.reaper', 'ReaperDrone'),
+    'driller': ('stage_03_harvesters.driller', 'DrillerDrone'),
+    'devastator': ('stage_04_soldiers.devastator', 'DevastatorDrone'),
+    'vader': ('stage_03_harvesters.vader', 'VaderDrone'),
+}
+
+# Имя команды -> модули с генератором случайных чисел RNG. Команды не используют модуль random напрямую,
+# а берут случайные числа из RNG своего модуля: это глобальный модуль random, пока run_match с зерном
+# не подставит поток матча (seed_team), так что зерно матча полностью задаёт решения команд.
+# Модули, общие для нескольких команд (stage_03_harvesters.utils у reaper и driller), держат ещё словарь
+# TEAM_RNG {имя команды в сцене: поток} и берут поток команды дрона, RNG у них остаётся запасным
+RANDOM_MODULES = {
+    'reaper': ('stage_03_harvesters.utils.states', 'stage_03_harvesters.utils.strategies'),
+    'driller': ('stage_03_harvesters.utils.states', 'stage_03_harvesters.utils.strategies'),
+    'devastator': ('stage_04_soldiers.devastator',),
+    'vader': ('stage_03_harvesters.vader',),
+    'yurikov': ('yurikov_team.rollouts',),
+}
+
+# Общие для команд кэши сцены в stage_03_harvesters.utils
+_SCENE_CACHES = (
+    ('stage_03_harvesters.utils.distances', 'DistanceMatrix._matrices'),
+    ('stage_03_harvesters.utils.geometry', 'StaticGeometry._tables'),
+)
+
+# Имя команды -> состояние команды в атрибутах классов и модулей, (модуль, 'Класс.атрибут' или 'атрибут').
+# Значения запоминаются при первом импорте команды и восстанавливаются reset_team() перед следующим матчем
+# в том же процессе
+TEAM_STATE = {
+    'yurikov': _SCENE_CACHES,
+    'reaper': _SCENE_CACHES + (
+        ('stage_03_harvesters.reaper', 'ReaperStrategy._data'),
+        ('stage_03_harvesters.reaper', 'ReaperStrategy._distance_max'),
+        ('stage_03_harvesters.reaper', 'ReaperStrategy._distance_limit'),
+        ('stage_03_harvesters.utils.strategies', 'StrategyHunting._teams_strategies'),
+        ('stage_03_harvesters.utils.registry', 'ObjectRegistry._registries'),
+        ('stage_03_harvesters.utils.states', 'TEAM_RNG'),
+        ('stage_03_harvesters.utils.strategies', 'TEAM_RNG'),
+    ),
+    'devastator': _SCENE_CACHES + (
+        ('stage_04_soldiers.devastator', 'DevastatorDrone.headquarters'),
+        ('stage_04_soldiers.devastator', 'Headquarters.roles'),
+        ('stage_04_soldiers.devastator', 'Headquarters.asteroids_for_basa'),
+    ),
+    'vader': (
+        ('stage_03_harvesters.vader', 'VaderDrone.my_team'),
+    ),
+}
+TEAM_STATE['driller'] = TEAM_STATE['reaper']
+
+# Имя команды -> функции, которые останавливают потоки команды перед сбросом состояния, (модуль, 'Класс.метод')
+TEAM_CLEANUP = {
+    'reaper': (('stage_03_harvesters.reaper', 'ReaperStrategy.close_planners'),),
+}
+TEAM_CLEANUP['driller'] = TEAM_CLEANUP['reaper']
+
+# (модуль, 'Класс.атрибут') -> значение атрибута до первого матча
+_PRISTINE = {}
+
+
+def register_team(name: str, module: str, class_name: str, random_modules: tuple = (), state: tuple = (),
+                  cleanup: tuple = ()) -> None:
+    """
+    Зарегистрировать команду.
+
+    :param name: str, имя команды для запуска
+    :param module: str, полное имя модуля с классом дрона
+    :param class_name: str, имя класса дрона
+    :param random_modules: tuple, модули команды с генератором случайных чисел RNG
+    :param state: tuple, атрибуты классов с состоянием команды, пары (модуль, 'Класс.атрибут')
+    :param cleanup: tuple, функции остановки потоков команды, пары (модуль, 'Класс.метод')
+    :return: None
+    """
+
+    TEAMS[name] = (module, class_name)
+    RANDOM_MODULES[name] = tuple(random_modules)
+    TEAM_STATE[name] = tuple(state)
+    TEAM_CLEANUP[name] = tuple(cleanup)
+
+
+def available_teams() -> list:
+    """
+    Получить имена зарегистрированных команд (без импорта модулей).
+
+    :return: list, отсортированный список имён
+    """
+
+    return sorted(TEAMS)
+
+
+def load_team(name: str, report: StartupReport = None) -> type:
+    """
+    Импортировать модуль команды и вернуть класс её дрона.
+
+    :param name: str, имя команды
+    :param report: StartupReport, отчёт для замера времени импорта (необязательно)
+    :return: type, класс дрона
+    """
+
+    if name not in TEAMS:
+        raise KeyError('Unknown team {!r}, available: {}'.format(name, ', '.join(available_teams())))
+    module_name, class_name = TEAMS[name]
+    if report is not None:
+        module = report.import_module(module_name)
+    else:
+        module = importlib.import_module(module_name)
+    for key in TEAM_STATE.get(name, ()):
+        if key not in _PRISTINE:
+            owner, attr = _resolve(*key)
+            _PRISTINE[key] = copy.copy(getattr(owner, attr))
+    return getattr(module, class_name)
+
+
+def _resolve(module_name: str, path: str) -> tuple:
+    owner = sys.modules[module_name]
+    *classes, attr = path.split('.')
+    for class_name in classes:
+        owner = getattr(owner, class_name)
+    return owner, attr
+
+
+def reset_team(name: str) -> None:
+    """
+    Вернуть состояние команды в атрибутах классов к значениям до первого матча.
+
+    Нужно, чтобы следующий матч в том же процессе играл так же, как в новом процессе.
+    Команды, которые ещё не импортировались, пропускаются.
+
+    :param name: str, имя команды
+    :return: None
+    """
+
+    for module_name, path in TEAM_CLEANUP.get(name, ()):
+        if module_name in sys.modules:
+            owner, attr = _resolve(module_name, path)
+            getattr(owner, attr)()
+    for key in TEAM_STATE.get(name, ()):
+        if key in _PRISTINE:
+            owner, attr = _resolve(*key)
+            setattr(owner, attr, copy.copy(_PRISTINE[key]))
+
+
+def seed_team(name: str, seed: int) -> None:
+    """
+    Заменить генераторы случайных чисел команды потоками матча.
+
+    Поток зависит только от зерна, имени модуля и, в общих модулях (TEAM_RNG), имени команды,
+    поэтому не зависит от состава и порядка команд.
+
+    :param name: str, имя команды
+    :param seed: int, зерно матча
+    :return: None
+    """
+
+    for module_name in RANDOM_MODULES.get(name, ()):
+        module = importlib.import_module(module_name)
+        streams = getattr(module, 'TEAM_RNG', None)
+        if streams is None:
+            module.RNG = random.Random('{}:{}'.format(seed, module_name))
+        else:
+            streams[TEAMS[name][1]] = random.Random('{}:{}:{}'.format(seed, module_name, name))
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from runner import bench
+
+
+class BenchTest(unittest.TestCase):
+
+    def test_summarize(self) -> None:
+        stats = bench.summarize([i / 1e6 for i in range(1, 101)])
+        self.assertEqual(stats['ticks'], 100)
+        self.assertAlmostEqual(stats['mean_us'], 50.5)
+        self.assertAlmostEqual(stats['p50_us'], 50)
+        self.assertAlmostEqual(stats['p95_us'], 95)
+        self.assertAlmostEqual(stats['p99_us'], 99)
+        self.assertAlmostEqual(stats['max_us'], 100)
+
+    def test_make_tasks(self) -> None:
+        teams = ['a', 'b', 'c']
+        tasks = bench.make_tasks(teams, [10, 20], [5], [2, 4], steps=100, seed=1, can_fight=True)
+        played = {(len(task[0]), name) for task in tasks for name in task[0]}
+        for name in teams:
+            self.assertIn((2, name), played)
+            self.assertIn((3, name), played)
+        self.assertEqual(len(tasks), 2 * 2 + 2)
+
+    def test_compare(self) -> None:
+        row = dict(team='a', asteroids=10, drones=5, teams=2, mean_us=100.0, p99_us=300.0)
+        baseline = [dict(row, mean_us=80.0, p99_us=290.0)]
+        regressions = bench.compare([row], baseline, threshold=.1, tail_threshold=.25)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn('mean_us', regressions[0])
+        self.assertEqual(bench.compare([row], baseline, threshold=.3, tail_threshold=.25), [])
+        self.assertEqual(bench.compare([dict(row, team='b')], baseline, threshold=.1, tail_threshold=.1), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+import contextlib
+import io
+import unittest
+
+from runner.checkpoint import BASELINE, parse_branch, play_branches
+from runner.warm import reset_state
+
+
+def fail(scene):
+    raise ValueError('branch {}'.format(scene._step))
+
+
+class CheckpointTest(unittest.TestCase):
+
+    def tearDown(self) -> None:
+        reset_state()
+
+    def play(self, branches: dict, tick: int = 20) -> dict:
+        reset_state()
+        with contextlib.redirect_stdout(io.StringIO()):
+            return play_branches(['vader', 'reaper'], tick, branches, seed=1, max_steps=60)
+
+    def test_branches(self) -> None:
+        steps = []
+        results = self.play({'same': {}, 'seen': lambda scene: steps.append(scene._step)})
+        self.assertEqual(set(results), {BASELINE, 'same', 'seen'})
+        # Ветка без изменений доигрывает матч так же, как исходный процесс
+        self.assertEqual(results['same']['collected'], results[BASELINE]['collected'])
+        self.assertEqual(results['seen']['game_steps'], 60)
+        # Функция ветки выполняется в дочернем процессе
+        self.assertEqual(steps, [])
+
+    def test_errors(self) -> None:
+        with self.assertRaisesRegex(RuntimeError, 'ValueError: branch 20'):
+            self.play({'broken': fail})
+        with self.assertRaisesRegex(RuntimeError, 'before the checkpoint'):
+            self.play({'late': {}}, tick=100)
+        with self.assertRaises(ValueError):
+            self.play({BASELINE: {}})
+
+    def test_parse_branch(self) -> None:
+        name, params = parse_branch(['brave', 'yurikov_team.settings.RETREAT_HEALTH=.2', 'a.B=text'])
+        self.assertEqual(name, 'brave')
+        self.assertEqual(params, {'yurikov_team.settings.RETREAT_HEALTH': .2, 'a.B': 'text'})
+
+
+if __name__ == '__main__':
+    unittest.main()
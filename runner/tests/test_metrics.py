@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+import json
+import unittest
+import urllib.error
+import urllib.request
+from types import SimpleNamespace
+
+from runner.metrics import LatencyWindow, MatchMetrics, MetricsServer
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += .001
+        return self.now
+
+
+class Drone:
+
+    def on_born(self):
+        return 'born'
+
+    def move_at(self, target):
+        return target
+
+
+def make_scene():
+    drones = [SimpleNamespace(payload=30, is_alive=True), SimpleNamespace(payload=70, is_alive=False)]
+    base = SimpleNamespace(team='A', payload=100, is_alive=True)
+    return SimpleNamespace(_step=0, teams={'A': drones}, motherships=[base])
+
+
+class LatencyWindowTest(unittest.TestCase):
+
+    def test_wraps(self) -> None:
+        window = LatencyWindow(size=3)
+        self.assertEqual(window.values(), [])
+        for value in range(5):
+            window.add(float(value))
+        self.assertEqual(window.count, 5)
+        self.assertEqual(sorted(window.values()), [2.0, 3.0, 4.0])
+
+
+class MatchMetricsTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.metrics = MatchMetrics([Drone], interval=.01, clock=Clock())
+
+    def tearDown(self) -> None:
+        self.metrics.uninstall()
+
+    def test_install(self) -> None:
+        original = Drone.__dict__['on_born']
+        self.metrics.install()
+        self.assertEqual(Drone().on_born(), 'born')
+        self.assertEqual(list(self.metrics.latency), ['Drone.on_born'])
+        self.assertEqual(self.metrics.latency['Drone.on_born'].count, 1)
+        self.metrics.uninstall()
+        self.assertIs(Drone.__dict__['on_born'], original)
+
+    def test_snapshot(self) -> None:
+        self.metrics.install()
+        drone = Drone()
+        for _ in range(3):
+            drone.on_born()
+        scene = make_scene()
+        self.metrics.attach(scene)
+        for step in range(1, 21):
+            scene._step = step
+            self.metrics.on_step()
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(snapshot['tick'], 20)
+        self.assertGreater(snapshot['tps'], 0)
+        # Элериум - в живых дронах и на базе, мёртвые не считаются
+        self.assertEqual(snapshot['teams'], {'A': dict(elerium=130, alive=1)})
+        stats = snapshot['callbacks']['Drone.on_born']
+        self.assertEqual(stats['count'], 3)
+        self.assertAlmostEqual(stats['p50_us'], 1000.0)
+
+        text = self.metrics.prometheus()
+        self.assertIn('astrobox_tick 20\n', text)
+        self.assertIn('astrobox_elerium{team="A"} 130\n', text)
+        self.assertIn('astrobox_callback_latency_seconds{callback="Drone.on_born",quantile="0.5"} 0.001\n', text)
+        self.assertIn('astrobox_callback_latency_seconds_count{callback="Drone.on_born"} 3\n', text)
+
+
+class MetricsServerTest(unittest.TestCase):
+
+    def test_serve(self) -> None:
+        metrics = MatchMetrics([])
+        metrics.attach(make_scene())
+        server = MetricsServer(metrics)
+        server.start()
+        try:
+            with urllib.request.urlopen(server.url, timeout=5) as response:
+                self.assertIn('astrobox_tick 0', response.read().decode('utf-8'))
+            with urllib.request.urlopen(server.url + '.json', timeout=5) as response:
+                self.assertEqual(json.loads(response.read().decode('utf-8'))['tick'], 0)
+            with self.assertRaises(urllib.error.HTTPError) as error:
+                urllib.request.urlopen(server.url.replace('/metrics', '/other'), timeout=5)
+            self.assertEqual(error.exception.code, 404)
+            error.exception.close()
+        finally:
+            server.close()
+
+    def test_localhost_only(self) -> None:
+        with self.assertRaises(ValueError):
+            MetricsServer(MatchMetrics([]), host='0.0.0.0')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+import contextlib
+import io
+import unittest
+from types import SimpleNamespace
+
+from runner.match import run_match
+from runner.pacing import FramePacer
+from runner.warm import reset_state
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept += seconds
+        self.now += seconds
+
+
+class FakeConn:
+
+    def __init__(self):
+        self.sent = []
+        self.ui_states = []
+
+    def send(self, obj):
+        self.sent.append(obj)
+
+    def poll(self, timeout):
+        return bool(self.ui_states)
+
+    def recv(self):
+        return self.ui_states.pop(0)
+
+
+class FramePacerTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.conn = FakeConn()
+        self.scene = SimpleNamespace(_step=0, game_speed=5, time_sleep=.015, parent_conn=None)
+        self.scene.get_objects_status = lambda: self.scene._step
+
+    def play(self, pacer, ticks, tick_time, ui_states=None):
+        ui_states = ui_states or {}
+        pacer.install(self.scene)
+        # The engine opens the pipe to the UI when the game starts
+        self.scene.parent_conn = self.conn
+        for _ in range(ticks):
+            self.conn.ui_states.extend(ui_states.get(self.scene._step + 1, []))
+            ui_state = None
+            while self.conn.poll(0):
+                ui_state = self.conn.recv()
+            self.scene._step += 1
+            self.clock.now += tick_time
+            pacer.on_step()
+            # The engine sends a frame when the step is divisible by game_speed or on a single step
+            if self.scene._step % self.scene.game_speed == 0 or (ui_state and ui_state.one_step):
+                self.conn.send(self.scene.get_objects_status())
+        self.assertEqual(self.scene.game_speed, 5)
+        return self.conn.sent
+
+    def test_frame_skip(self) -> None:
+        pacer = FramePacer(ticks_per_frame=4, clock=self.clock, sleep=self.clock.sleep)
+        self.assertEqual(self.play(pacer, 12, .001), [4, 8, 12])
+        self.assertEqual(self.scene.time_sleep, 0.0)
+        self.assertEqual(self.clock.slept, 0.0)
+
+    def test_adaptive(self) -> None:
+        # 10 ms ticks at 25 FPS: a frame every 4 ticks, no sleeping
+        pacer = FramePacer(fps=25, clock=self.clock, sleep=self.clock.sleep)
+        rendered = self.play(pacer, 20, .01)
+        self.assertEqual(len(rendered), 5)
+        self.assertEqual(self.clock.slept, 0.0)
+
+    def test_max_tps(self) -> None:
+        pacer = FramePacer(ticks_per_frame=10, max_tps=100, clock=self.clock, sleep=self.clock.sleep)
+        self.play(pacer, 100, .001)
+        self.assertAlmostEqual(self.clock.now, 1.0)
+
+    def test_one_step(self) -> None:
+        pacer = FramePacer(ticks_per_frame=4, clock=self.clock, sleep=self.clock.sleep)
+        rendered = self.play(pacer, 8, .001, ui_states={6: [SimpleNamespace(one_step=True)]})
+        self.assertEqual(rendered, [4, 6])
+
+    def test_arguments(self) -> None:
+        with self.assertRaises(ValueError):
+            FramePacer()
+        with self.assertRaises(ValueError):
+            FramePacer(ticks_per_frame=0)
+
+
+class PacedMatchTest(unittest.TestCase):
+
+    def tearDown(self) -> None:
+        reset_state()
+
+    def play(self, pacer: FramePacer = None) -> dict:
+        reset_state()
+        with contextlib.redirect_stdout(io.StringIO()):
+            return run_match(['devastator', 'reaper'], field=(1200, 1200), can_fight=True, headless=True, seed=3,
+                             max_steps=1000, pacer=pacer)
+
+    def test_same_result(self) -> None:
+        # Drones are shot down with this seed, and their wrecks slow down by scene.game_speed per tick
+        native = self.play()
+        pacer = FramePacer(ticks_per_frame=20)
+        paced = self.play(pacer)
+        self.assertEqual(pacer.frames, 50)
+        self.assertGreater(sum(native['dead'].values()), 0)
+        self.assertEqual(paced['collected'], native['collected'])
+        self.assertEqual(paced['dead'], native['dead'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+import os
+import random
+import tempfile
+import unittest
+
+from runner import params
+from runner.tuner import score_result
+from yurikov_team import settings
+
+
+class ParamsTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.saved = {p.key: p.default for p in params.team_parameters('yurikov')}
+
+    def tearDown(self) -> None:
+        params.apply_params(self.saved)
+
+    def test_sample(self) -> None:
+        rnd = random.Random(1)
+        for p in params.PARAMETERS:
+            for _ in range(20):
+                value = p.sample(rnd)
+                self.assertTrue(p.low <= value <= p.high)
+                self.assertIsInstance(value, type(p.default))
+
+    def test_profile(self) -> None:
+        profile = {'yurikov_team.settings.RETREAT_HEALTH': .55, 'yurikov_team.settings.SYNC_STEPS_DUEL': 70}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'profile.json')
+            params.save_profile(path, profile, score=1.0)
+            self.assertEqual(params.load_profile(path), profile)
+        self.assertEqual(settings.RETREAT_HEALTH, .55)
+        self.assertEqual(settings.SYNC_STEPS_DUEL, 70)
+
+    def test_unknown_param(self) -> None:
+        with self.assertRaises(AttributeError):
+            params.apply_params({'yurikov_team.settings.NO_SUCH_PARAM': 1})
+
+    def test_score_result(self) -> None:
+        result = {'collected': {'ReaperDrone': 700, 'DrillerDrone': 900}}
+        self.assertEqual(score_result(result, 'ReaperDrone', 'elerium'), 700.0)
+        self.assertEqual(score_result(result, 'ReaperDrone', 'win'), 0.0)
+        self.assertEqual(score_result(result, 'DrillerDrone', 'win'), 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
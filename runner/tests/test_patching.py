@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from runner.patching import Patcher, team_callbacks
+
+
+class Engine:
+
+    def on_born(self):
+        return 'engine'
+
+    def move_at(self, target):
+        return target
+
+
+class Team(Engine):
+
+    def on_born(self):
+        return 'born'
+
+    def game_step(self):
+        return 'step'
+
+    def helper(self):
+        return 'helper'
+
+
+class Squad(Team):
+
+    def on_born(self):
+        return 'squad'
+
+
+def tagged(func, tag):
+    def wrapper(obj, *args, **kwargs):
+        return tag, func(obj, *args, **kwargs)
+
+    return wrapper
+
+
+class PatcherTest(unittest.TestCase):
+
+    def test_team_callbacks(self) -> None:
+        self.assertEqual(team_callbacks([Squad, Team], Engine),
+                         [(Squad, 'on_born'), (Team, 'on_born'), (Team, 'game_step')])
+
+    def test_patch_and_restore(self) -> None:
+        original = Team.__dict__['on_born']
+        patcher = Patcher()
+        patcher.patch(Team, 'on_born', tagged, 'a')
+        patcher.patch(Team, 'on_born', tagged, 'b')
+        # Унаследованный метод оборачивается в самом классе и удаляется из него при снятии
+        patcher.patch(Team, 'move_at', tagged, 'c')
+        self.assertEqual(len(patcher), 2)
+        self.assertEqual(Team().on_born(), ('a', 'born'))
+        self.assertEqual(Team().move_at(1), ('c', 1))
+        patcher.restore()
+        self.assertIs(Team.__dict__['on_born'], original)
+        self.assertNotIn('move_at', Team.__dict__)
+        self.assertEqual(len(patcher), 0)
+
+    def test_nested(self) -> None:
+        original = Team.__dict__['game_step']
+        inner, outer = Patcher(), Patcher()
+        inner.patch(Team, 'game_step', tagged, 'inner')
+        outer.patch(Team, 'game_step', tagged, 'outer')
+        self.assertEqual(Team().game_step(), ('outer', ('inner', 'step')))
+        # Снятие не в обратном порядке вернуло бы обёртку inner при снятии outer
+        with self.assertRaises(RuntimeError):
+            inner.restore()
+        outer.restore()
+        inner.restore()
+        self.assertIs(Team.__dict__['game_step'], original)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+
+from runner.scenarios import Catalog, Scenario
+
+
+class ScenarioTest(unittest.TestCase):
+
+    def test_reproducible(self) -> None:
+        first = Scenario('a', seed=5, field=(3000, 2000), asteroids=300, payload=('exponential', 100, 900))
+        second = Scenario('b', seed=5, field=(3000, 2000), asteroids=300, payload=('exponential', 100, 900))
+        other = Scenario('c', seed=6, field=(3000, 2000), asteroids=300, payload=('exponential', 100, 900))
+        self.assertEqual(first.asteroids, second.asteroids)
+        self.assertEqual(first.checksum, second.checksum)
+        self.assertNotEqual(first.checksum, other.checksum)
+
+    def test_layout(self) -> None:
+        scenario = Scenario('a', seed=1, field=(1200, 1200), asteroids=27, payload=('uniform', 100, 200))
+        self.assertEqual(len(scenario.asteroids), 27)
+        self.assertEqual(len(set((x, y) for x, y, _ in scenario.asteroids)), 27)
+        for x, y, payload in scenario.asteroids:
+            self.assertTrue(270 <= x <= 930 and 270 <= y <= 930)
+            self.assertTrue(100 <= payload <= 200)
+
+    def test_catalog(self) -> None:
+        scenario = Scenario('big', seed=3, field=(5000, 5000), asteroids=1000, teams=2, drones=50)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'catalog.json')
+            catalog = Catalog(path)
+            catalog.add(scenario)
+            catalog.save()
+
+            loaded = Catalog(path)
+            self.assertEqual(loaded.names(), ['big'])
+            restored = loaded.get('big')
+            self.assertEqual(restored.asteroids, scenario.asteroids)
+            self.assertEqual((restored.teams, restored.drones), (2, 50))
+
+            loaded.specs['big']['checksum'] = 'broken'
+            with self.assertRaises(ValueError):
+                loaded.get('big')
+            with self.assertRaises(KeyError):
+                loaded.get('missing')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from runner.trace import BEGIN, END, TraceBuffer, Tracer
+
+
+class TraceTest(unittest.TestCase):
+
+    def test_ring_buffer(self) -> None:
+        buffer = TraceBuffer(3)
+        for ts in range(5):
+            buffer.append(ts, BEGIN, 0, 0, 1, ts)
+        self.assertEqual(buffer.size, 3)
+        self.assertEqual(buffer.dropped, 2)
+        self.assertEqual([e[0] for e in buffer.events()], [2, 3, 4])
+
+        buffer = TraceBuffer(3)
+        buffer.append(0, BEGIN, 0, 0, 1, 0)
+        self.assertEqual([e[0] for e in buffer.events()], [0])
+
+    def test_trace_events(self) -> None:
+        tracer = Tracer([], capacity=4, methods=[])
+        buffer = tracer.buffer
+        name, team = buffer.name_id('Drone.on_heartbeat'), buffer.team_id('team')
+        inner = buffer.name_id('Dijkstra.find_path')
+        buffer.append(1, BEGIN, name, team, 1, 1)
+        buffer.append(2, BEGIN, inner, team, 1, 1)
+        buffer.append(3, END, inner, team, 1, 1)
+        buffer.append(4, END, name, team, 1, 1)
+        buffer.append(5, BEGIN, name, team, 1, 2)
+        buffer.append(6, END, name, team, 1, 2)
+        events = tracer.trace_events()
+        self.assertEqual(events[0], dict(name='process_name', ph='M', pid=0, tid=0, args=dict(name='team')))
+        # Begins of the first events are overwritten, their ends are skipped
+        self.assertEqual([(e['ph'], e['ts']) for e in events[1:]], [('B', 5), ('E', 6)])
+        self.assertEqual(events[1]['args'], dict(tick=2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+import random
+import unittest
+from types import SimpleNamespace
+
+from runner import teams
+from runner.verify import first_divergence, normalize
+
+
+class VerifyTest(unittest.TestCase):
+
+    def test_normalize(self) -> None:
+        self.assertEqual(normalize(SimpleNamespace(id=3)), ('SimpleNamespace', 3))
+        self.assertEqual(normalize(SimpleNamespace(x=1, y=2.123456789)), (1.0, 2.123457))
+        self.assertEqual(normalize(90), 90)
+
+    def test_first_divergence(self) -> None:
+        self.assertIsNone(first_divergence([1, 2, 3], [1, 2, 3]))
+        self.assertEqual(first_divergence([1, 2, 3], [1, 5, 3]), 1)
+        self.assertEqual(first_divergence([1, 2, 3], [1, 2]), 2)
+
+    def test_seed_team(self) -> None:
+        from stage_04_soldiers import devastator
+
+        native = devastator.RNG
+        try:
+            teams.seed_team('devastator', 7)
+            first = [devastator.RNG.random() for _ in range(3)]
+            # The global stream does not affect the team stream
+            random.seed(1)
+            teams.seed_team('devastator', 7)
+            random.random()
+            self.assertEqual([devastator.RNG.random() for _ in range(3)], first)
+            teams.seed_team('devastator', 8)
+            self.assertNotEqual([devastator.RNG.random() for _ in range(3)], first)
+        finally:
+            devastator.RNG = native
+
+    def test_seed_shared_module(self) -> None:
+        from stage_03_harvesters.utils import states
+
+        native = dict(states.TEAM_RNG)
+        try:
+            teams.seed_team('reaper', 7)
+            alone = [states.TEAM_RNG['ReaperDrone'].random() for _ in range(3)]
+            # Each team of a shared module draws from its own stream, whoever else plays
+            teams.seed_team('reaper', 7)
+            teams.seed_team('driller', 7)
+            driller = [states.TEAM_RNG['DrillerDrone'].random() for _ in range(3)]
+            self.assertEqual([states.TEAM_RNG['ReaperDrone'].random() for _ in range(3)], alone)
+            self.assertNotEqual(driller, alone)
+            self.assertIs(states.RNG, random)
+        finally:
+            states.TEAM_RNG.clear()
+            states.TEAM_RNG.update(native)
+
+
+if __name__ == '__main__':
+    unittest.main()
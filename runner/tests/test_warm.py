@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+import unittest
+import weakref
+
+from runner import teams
+from runner.verify import record_match
+from runner.warm import LeakCheck, reset_state
+
+
+class Scene:
+    pass
+
+
+class WarmTest(unittest.TestCase):
+
+    def test_reset_team(self) -> None:
+        devastator = teams.load_team('devastator')
+        from stage_04_soldiers.devastator import Headquarters
+
+        devastator.headquarters = Headquarters()
+        Headquarters.roles['spy'] = 1
+        Headquarters.asteroids_for_basa.append(None)
+        teams.reset_team('devastator')
+        self.assertIsNone(devastator.headquarters)
+        self.assertEqual(Headquarters.roles, {})
+        self.assertEqual(Headquarters.asteroids_for_basa, [])
+
+    def test_matches_in_one_process(self) -> None:
+        # Второй матч после сброса играется так же, как первый
+        task = (['devastator', 'reaper'], 3, 60, True, (1200, 1200))
+        reset_state()
+        first = record_match(task)
+        self.assertIsNone(reset_state()())
+        second = record_match(task)
+        reset_state()
+        self.assertTrue(first)
+        self.assertEqual(first, second)
+
+    def test_leak_check(self) -> None:
+        memory = [100, 100, 150, 400]
+        check = LeakCheck(max_growth=200, warmup=2, memory=lambda: memory[check.matches - 1])
+        check.check(None)
+        check.check(None)
+        check.check(None)
+        self.assertEqual(check.growth, 50)
+        with self.assertRaises(RuntimeError):
+            check.check(None)
+
+        scene = Scene()
+        with self.assertRaises(RuntimeError):
+            LeakCheck().check(weakref.ref(scene))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+Трассировка решений дронов в формате Chrome trace-event (chrome://tracing, https://ui.perfetto.dev).
+
+Записываются начало и конец обработчиков движка (on_*, game_step) в классах команд и внутренних решений
+(см. TRACED_METHODS) с id дрона, командой и шагом игры. События копятся в кольцевом буфере
+фиксированного размера и записываются в JSON в конце матча, при переполнении теряются самые старые.
+
+Запуск:
+    python -m runner.trace reaper devastator --steps 2000 --can-fight --output trace.json
+"""
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import time
+from array import array
+
+from runner.match import run_match
+from runner.patching import Patcher, team_callbacks
+from runner.teams import available_teams, load_team
+from yurikov_team import settings
+
+# Внутренние решения команд: (модуль, класс, метод)
+TRACED_METHODS = [
+    ('yurikov_team.states', 'DroneState', 'handle_action'),
+    ('yurikov_team.states', 'CombatState', 'handle_action'),
+    ('stage_03_harvesters.utils.dijkstra', 'Dijkstra', 'find_path'),
+    ('stage_04_soldiers.devastator', 'Headquarters', 'get_actions'),
+]
+
+BEGIN = 0
+END = 1
+PHASES = ('B', 'E')
+
+
+class TraceBuffer:
+    """
+    Кольцевой буфер событий.
+
+    Поля событий хранятся в заранее выделенных массивах, имена и команды - индексами в таблицах,
+    поэтому запись события не создаёт объектов.
+
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.size = 0
+        self.dropped = 0
+        self._next = 0
+        self._ts = array('d', [0.0]) * capacity
+        self._phase = array('b', [0]) * capacity
+        self._name = array('i', [0]) * capacity
+        self._team = array('i', [0]) * capacity
+        self._drone = array('i', [0]) * capacity
+        self._tick = array('i', [0]) * capacity
+        self.names = []
+        self.teams = []
+        self._name_ids = {}
+        self._team_ids = {}
+
+    def name_id(self, name: str) -> int:
+        if name not in self._name_ids:
+            self._name_ids[name] = len(self.names)
+            self.names.append(name)
+        return self._name_ids[name]
+
+    def team_id(self, team: str) -> int:
+        if team not in self._team_ids:
+            self._team_ids[team] = len(self.teams)
+            self.teams.append(team)
+        return self._team_ids[team]
+
+    def append(self, ts: float, phase: int, name: int, team: int, drone: int, tick: int) -> None:
+        i = self._next
+        self._ts[i] = ts
+        self._phase[i] = phase
+        self._name[i] = name
+        self._team[i] = team
+        self._drone[i] = drone
+        self._tick[i] = tick
+        self._next = i + 1 if i + 1 < self.capacity else 0
+        if self.size < self.capacity:
+            self.size += 1
+        else:
+            self.dropped += 1
+
+    def events(self):
+        """
+        События от старых к новым.
+
+        :return: generator, (ts, фаза, индекс имени, индекс команды, id дрона, шаг)
+        """
+
+        start = self._next - self.size if self.size < self.capacity else self._next
+        for k in range(self.size):
+            i = (start + k) % self.capacity
+            yield self._ts[i], self._phase[i], self._name[i], self._team[i], self._drone[i], self._tick[i]
+
+
+class Tracer:
+    """
+    Трассировщик решений команд.
+
+    """
+
+    def __init__(self, drone_classes: list, capacity: int = 1000000, methods: list = None):
+        from astrobox.core import Drone
+
+        self._engine_class = Drone
+        self._drone_classes = drone_classes
+        self._methods = TRACED_METHODS if methods is None else methods
+        self._patcher = Patcher()
+        self._origin = time.perf_counter()
+        self.buffer = TraceBuffer(capacity)
+
+    def install(self) -> None:
+        for cls, name in team_callbacks(self._drone_classes, self._engine_class):
+            self._patcher.patch(cls, name, self._traced, '{}.{}'.format(cls.__name__, name))
+        for module_name, class_name, name in self._methods:
+            try:
+                cls = getattr(importlib.import_module(module_name), class_name)
+            except ImportError:
+                continue
+            if name in cls.__dict__:
+                self._patcher.patch(cls, name, self._traced, '{}.{}'.format(class_name, name))
+
+    def uninstall(self) -> None:
+        self._patcher.restore()
+
+    def _traced(self, func, label):
+        buffer, origin, clock, owner = self.buffer, self._origin, time.perf_counter, self.owner
+        name_id = buffer.name_id(label)
+
+        def traced(obj, *args, **kwargs):
+            drone = owner(obj, args)
+            if drone is None:
+                return func(obj, *args, **kwargs)
+            team, drone_id, tick = buffer.team_id(drone.team or type(drone).__name__), drone.id, drone.scene._step
+            buffer.append((clock() - origin) * 1e6, BEGIN, name_id, team, drone_id, tick)
+            try:
+                return func(obj, *args, **kwargs)
+            finally:
+                buffer.append((clock() - origin) * 1e6, END, name_id, team, drone_id, tick)
+
+        return traced
+
+    def owner(self, obj, args):
+        """
+        Найти дрона, принимающего решение.
+
+        :param obj: дрон, состояние (drone), поисковик пути (unit) или штаб (дрон первым аргументом)
+        :param args: tuple, аргументы вызова
+        :return: дрон или None
+        """
+
+        for candidate in (obj, getattr(obj, 'drone', None), getattr(obj, 'unit', None), getattr(obj, '_unit', None),
+                          args[0] if args else None):
+            if isinstance(candidate, self._engine_class):
+                return candidate
+        return None
+
+    def trace_events(self) -> list:
+        """
+        События в формате Chrome trace-event.
+
+        Концы событий, начало которых вытеснено из буфера, пропускаются.
+
+        :return: list, события: pid - команда, tid - id дрона
+        """
+
+        buffer = self.buffer
+        events = [dict(name='process_name', ph='M', pid=pid, tid=0, args=dict(name=team))
+                  for pid, team in enumerate(buffer.teams)]
+        open_events = {}
+        for ts, phase, name, team, drone, tick in buffer.events():
+            key = (team, drone)
+            if phase == BEGIN:
+                open_events[key] = open_events.get(key, 0) + 1
+                events.append(dict(name=buffer.names[name], ph=PHASES[phase], ts=round(ts, 3), pid=team, tid=drone,
+                                   args=dict(tick=tick)))
+            elif open_events.get(key):
+                open_events[key] -= 1
+                events.append(dict(name=buffer.names[name], ph=PHASES[phase], ts=round(ts, 3), pid=team, tid=drone))
+        return events
+
+    def write(self, path: str) -> None:
+        with open(path, 'w') as f:
+            json.dump(dict(traceEvents=self.trace_events(), displayTimeUnit='ms',
+                           otherData=dict(dropped=self.buffer.dropped, capacity=self.buffer.capacity)), f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write a Chrome trace of drone decisions')
+    parser.add_argument('teams', nargs='+', choices=available_teams())
+    parser.add_argument('--steps', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--can-fight', action='store_true')
+    parser.add_argument('--field', type=int, nargs=2, default=settings.FIELD_SIZE, metavar=('WIDTH', 'HEIGHT'))
+    parser.add_argument('--capacity', type=int, default=1000000, help='ring buffer size, events')
+    parser.add_argument('--output', default='trace.json')
+    args = parser.parse_args()
+
+    tracer = Tracer([load_team(name) for name in args.teams], capacity=args.capacity)
+    tracer.install()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_match(args.teams, field=tuple(args.field), can_fight=args.can_fight, headless=True, seed=args.seed,
+                      max_steps=args.steps)
+    finally:
+        tracer.uninstall()
+    tracer.write(args.output)
+    print('{} events written to {}, {} dropped'.format(tracer.buffer.size, args.output, tracer.buffer.dropped))
+
+
+if __name__ == '__main__':
+    main()
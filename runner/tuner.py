@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Подбор параметров команды.
+
+Запуск:
+    python -m runner.tuner reaper --opponents driller devastator --method halving --configs 27 \
+        --seeds 1 2 3 --max-steps 6000 --workers 4 --output reaper_profile.json
+
+Каждый матч играется без интерфейса в отдельном процессе с фиксированным зерном,
+все конфигурации проверяются на одних и тех же зёрнах.
+"""
+import argparse
+import contextlib
+import io
+import multiprocessing
+import random
+import statistics
+
+from runner.match import run_match
+from runner.params import apply_params, save_profile, team_parameters
+from runner.scenarios import CATALOG_PATH, Catalog
+from runner.teams import available_teams, load_team
+
+OBJECTIVES = ('elerium', 'win')
+
+
+def score_result(result: dict, team_name: str, objective: str) -> float:
+    """
+    Оценить результат матча для команды.
+
+    :param result: dict, результат SpaceField.go()
+    :param team_name: str, имя команды в сцене (имя класса дрона)
+    :param objective: str, 'elerium' - собранный элериум, 'win' - 1.0 за первое место
+    :return: float, оценка
+    """
+
+    collected = result['collected']
+    if objective == 'elerium':
+        return float(collected[team_name])
+    best = max(collected.values())
+    return 1.0 if collected[team_name] == best else 0.0
+
+
+def play(task: tuple) -> float:
+    """
+    Сыграть один матч в процессе-исполнителе.
+
+    :param task: tuple, (команда, соперники, параметры, зерно, шагов, стрельба, цель, сценарий)
+    :return: float, оценка матча
+    """
+
+    team, opponents, params, seed, max_steps, can_fight, objective, scenario = task
+    apply_params(params)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = run_match([team] + list(opponents), can_fight=can_fight, headless=True,
+                           seed=seed, max_steps=max_steps, scenario=scenario)
+    return score_result(result, load_team(team).__name__, objective)
+
+
+class Tuner:
+    """
+    Поиск параметров команды, дающих лучшую среднюю оценку на наборе зёрен.
+
+    """
+
+    def __init__(self, team: str, opponents: list, seeds: list, workers: int = None,
+                 can_fight: bool = False, objective: str = 'elerium', rnd_seed: int = 0, scenario=None):
+        if objective not in OBJECTIVES:
+            raise ValueError('objective must be one of {}'.format(OBJECTIVES))
+        self.team = team
+        self.opponents = list(opponents)
+        self.seeds = list(seeds)
+        self.workers = workers or multiprocessing.cpu_count()
+        self.can_fight = can_fight
+        self.objective = objective
+        self.scenario = scenario
+        self.space = team_parameters(team)
+        self.rnd = random.Random(rnd_seed)
+        if not self.space:
+            raise ValueError('Team {} has no tunable parameters'.format(team))
+
+    def sample_configs(self, amount: int) -> list:
+        """
+        Получить конфигурации для проверки. Первая конфигурация - текущие значения параметров.
+
+        :param amount: int, количество конфигураций
+        :return: list, список словарей {'модуль.ИМЯ': значение}
+        """
+
+        configs = [{p.key: p.default for p in self.space}]
+        while len(configs) < amount:
+            configs.append({p.key: p.sample(self.rnd) for p in self.space})
+        return configs
+
+    def evaluate(self, configs: list, max_steps: int) -> list:
+        """
+        Сыграть все конфигурации на всех зёрнах.
+
+        :param configs: list, конфигурации
+        :param max_steps: int, длина матча в шагах
+        :return: list, пары (средняя оценка, конфигурация), лучшие первыми
+        """
+
+        tasks = [(self.team, self.opponents, config, seed, max_steps, self.can_fight, self.objective, self.scenario)
+                 for config in configs for seed in self.seeds]
+        # Состояние сцены и команд хранится в атрибутах классов, поэтому каждый матч - в новом процессе
+        with multiprocessing.Pool(processes=self.workers, maxtasksperchild=1) as pool:
+            scores = pool.map(play, tasks, chunksize=1)
+        size = len(self.seeds)
+        results = [(statistics.mean(scores[i * size:(i + 1) * size]), config) for i, config in enumerate(configs)]
+        results.sort(key=lambda r: r[0], reverse=True)
+        return results
+
+    def random_search(self, amount: int, max_steps: int) -> list:
+        return self.evaluate(self.sample_configs(amount), max_steps)
+
+    def successive_halving(self, amount: int, min_steps: int, max_steps: int, eta: int = 3) -> list:
+        """
+        Successive halving: все конфигурации играют короткие матчи, в следующий раунд
+        проходит 1/eta лучших, а длина матча увеличивается в eta раз.
+
+        :param amount: int, количество конфигураций
+        :param min_steps: int, длина матча в первом раунде
+        :param max_steps: int, максимальная длина матча
+        :param eta: int, коэффициент отсева
+        :return: list, результаты последнего раунда, лучшие первыми
+        """
+
+        configs = self.sample_configs(amount)
+        steps = min_steps
+        while True:
+            results = self.evaluate(configs, steps)
+            if len(results) <= 1 or steps >= max_steps:
+                return results
+            configs = [config for _, config in results[:max(1, len(results) // eta)]]
+            steps = min(max_steps, steps * eta)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Tune team parameters on headless matches')
+    parser.add_argument('team', choices=available_teams())
+    parser.add_argument('--opponents', nargs='*', default=[], choices=available_teams())
+    parser.add_argument('--method', choices=('random', 'halving'), default='halving')
+    parser.add_argument('--configs', type=int, default=27)
+    parser.add_argument('--seeds', type=int, nargs='+', default=[1, 2, 3])
+    parser.add_argument('--min-steps', type=int, default=1000)
+    parser.add_argument('--max-steps', type=int, default=9000)
+    parser.add_argument('--eta', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--can-fight', action='store_true')
+    parser.add_argument('--objective', choices=OBJECTIVES, default='elerium')
+    parser.add_argument('--rnd-seed', type=int, default=0, help='seed for parameter sampling')
+    parser.add_argument('--scenario', help='scenario name from the catalog')
+    parser.add_argument('--catalog', default=CATALOG_PATH)
+    parser.add_argument('--output', default='profile.json')
+    args = parser.parse_args()
+
+    scenario = Catalog(args.catalog).get(args.scenario) if args.scenario else None
+    tuner = Tuner(args.team, args.opponents, args.seeds, workers=args.workers, can_fight=args.can_fight,
+                  objective=args.objective, rnd_seed=args.rnd_seed, scenario=scenario)
+    if args.method == 'random':
+        results = tuner.random_search(args.configs, args.max_steps)
+    else:
+        results = tuner.successive_halving(args.configs, args.min_steps, args.max_steps, eta=args.eta)
+
+    for score, config in results[:5]:
+        print('{:>10.2f}  {}'.format(score, config))
+    best_score, best_config = results[0]
+    save_profile(args.output, best_config, team=args.team, opponents=args.opponents, seeds=args.seeds,
+                 objective=args.objective, score=best_score)
+    print('Profile written to {}'.format(args.output))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Проверка воспроизводимости матча.
+
+Матч с одним и тем же зерном играется несколько раз, каждый раз в отдельном процессе
+(с --warm - подряд в одном тёплом процессе, так проверяется сброс состояния команд между матчами).
+Записываются решения дронов (команды движения, поворота, загрузки, выгрузки и выстрелы),
+при первом расхождении печатается место расхождения и код выхода 1.
+
+Запуск:
+    python -m runner.verify reaper devastator --seed 3 --steps 500 --can-fight
+"""
+import argparse
+import contextlib
+import io
+import multiprocessing
+import sys
+
+from runner.match import run_match
+from runner.patching import Patcher
+from runner.teams import available_teams
+from runner.warm import WarmPool
+from yurikov_team import settings
+
+# Команды дрона, которые считаются решениями
+DRONE_COMMANDS = ('move_at', 'turn_to', 'load_from', 'unload_to', 'stop')
+
+
+def normalize(value):
+    """
+    Привести аргумент команды к сравнимому между процессами виду.
+
+    :param value: объект сцены, точка или число
+    :return: tuple or value, (имя класса, id) для объектов сцены, координаты для точек
+    """
+
+    if hasattr(value, 'id'):
+        return type(value).__name__, value.id
+    if hasattr(value, 'x') and hasattr(value, 'y'):
+        return round(float(value.x), 6), round(float(value.y), 6)
+    if isinstance(value, float):
+        return round(value, 6)
+    return value
+
+
+class DecisionRecorder:
+    """
+    Запись решений дронов: (шаг, класс дрона, id дрона, команда, аргументы).
+
+    """
+
+    def __init__(self):
+        self.decisions = []
+        self._patcher = Patcher()
+
+    def install(self) -> None:
+        from astrobox.core import Drone
+        from astrobox.guns import Gun
+
+        for name in DRONE_COMMANDS:
+            self._patcher.patch(Drone, name, self._recorded, name, lambda drone: drone)
+        self._patcher.patch(Gun, 'shot', self._recorded, 'shot', lambda gun: gun.owner)
+
+    def uninstall(self) -> None:
+        self._patcher.restore()
+
+    def _recorded(self, native, name, get_drone):
+        decisions = self.decisions
+
+        def recorded(obj, *args, **kwargs):
+            drone = get_drone(obj)
+            decisions.append((drone.scene._step, type(drone).__name__, drone.id, name,
+                              tuple(normalize(a) for a in args),
+                              tuple(sorted((k, normalize(v)) for k, v in kwargs.items()))))
+            return native(obj, *args, **kwargs)
+
+        return recorded
+
+
+def record_match(task: tuple) -> list:
+    """
+    Сыграть матч с записью решений (в процессе-исполнителе).
+
+    :param task: tuple, (команды, зерно, шагов, стрельба, размер поля)
+    :return: list, решения в порядке принятия
+    """
+
+    teams, seed, steps, can_fight, field = task
+    recorder = DecisionRecorder()
+    recorder.install()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_match(teams, field=field, headless=True, seed=seed, max_steps=steps, can_fight=can_fight)
+    finally:
+        recorder.uninstall()
+    return recorder.decisions
+
+
+def first_divergence(a: list, b: list):
+    """
+    Найти первое расхождение двух записей.
+
+    :param a: list, решения первого матча
+    :param b: list, решения второго матча
+    :return: int or None, индекс первого отличающегося решения, None - записи совпадают
+    """
+
+    for i, (x, y) in enumerate(zip(a, b)):
+        if x != y:
+            return i
+    if len(a) != len(b):
+        return min(len(a), len(b))
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check that a match seed fully determines team decisions')
+    parser.add_argument('teams', nargs='+', choices=available_teams())
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--steps', type=int, default=500)
+    parser.add_argument('--runs', type=int, default=2)
+    parser.add_argument('--can-fight', action='store_true')
+    parser.add_argument('--field', type=int, nargs=2, default=settings.FIELD_SIZE, metavar=('WIDTH', 'HEIGHT'))
+    parser.add_argument('--warm', action='store_true', help='play all runs in one warm process (checks state reset)')
+    args = parser.parse_args()
+
+    task = (args.teams, args.seed, args.steps, args.can_fight, tuple(args.field))
+    if args.warm:
+        with WarmPool(args.teams) as pool:
+            runs = pool.map(record_match, [task] * args.runs)
+    else:
+        with multiprocessing.Pool(processes=1, maxtasksperchild=1) as pool:
+            runs = pool.map(record_match, [task] * args.runs, chunksize=1)
+
+    reference = runs[0]
+    for run, decisions in enumerate(runs[1:], start=2):
+        idx = first_divergence(reference, decisions)
+        if idx is not None:
+            print('seed {}: run {} diverged at decision {} of {}'.format(args.seed, run, idx, len(reference)))
+            print('  run 1: {}'.format(reference[idx] if idx < len(reference) else '<end>'))
+            print('  run {}: {}'.format(run, decisions[idx] if idx < len(decisions) else '<end>'))
+            sys.exit(1)
+    print('seed {}: {} runs identical, {} decisions'.format(args.seed, args.runs, len(reference)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Тёплые процессы-исполнители: движок и модули команд импортируются один раз, дальше процесс
+играет матч за матчем.
+
+После каждого матча состояние движка и команд в атрибутах классов сбрасывается
+(runner.teams.TEAM_STATE), так что следующий матч играется так же, как в новом процессе.
+Проверка утечек: сцена прошлого матча должна освободиться после сброса, а память процесса
+не должна расти от матча к матчу больше чем на max_growth.
+
+    with WarmPool(['reaper', 'devastator'], processes=2) as pool:
+        results = pool.map(record_match, tasks)
+
+Запуск (сравнение с новым процессом на каждый матч):
+    python -m runner.verify reaper devastator --seed 3 --runs 4 --warm
+    python -m runner.bench --warm
+"""
+import gc
+import multiprocessing
+import resource
+import sys
+import weakref
+
+from runner.teams import TEAMS, load_team, reset_team
+
+# Допустимый рост памяти процесса за все матчи после разогрева, байт
+MAX_GROWTH = 32 * 2 ** 20
+# Матчей на разогрев: первые матчи заполняют кэши модулей (тема, шрифты, байткод)
+WARMUP_MATCHES = 2
+
+
+def memory_usage() -> int:
+    """
+    Резидентная память процесса.
+
+    :return: int, байт (где нет /proc - пиковая память процесса)
+    """
+
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def reset_engine():
+    """
+    Сбросить состояние движка в атрибутах классов: команды сцены, счётчик id объектов,
+    ссылку объектов на сцену и значения темы (размер поля, стрельба).
+
+    :return: weakref or None, ссылка на сцену прошлого матча
+    """
+
+    from robogame_engine.objects import GameObject
+    from robogame_engine.scene import Scene
+    from robogame_engine.theme import theme
+
+    scene = GameObject._GameObject__scene
+    Scene._Scene__teams.clear()
+    GameObject._GameObject__objects_count = 0
+    GameObject.link_to_scene(scene=None, container=None)
+    # Модуль темы задаётся при импорте astrobox, остальное - значения, прочитанные или заданные за матч
+    for name in list(theme.__dict__):
+        if name not in ('mod_path', 'module'):
+            del theme.__dict__[name]
+    return weakref.ref(scene) if scene is not None else None
+
+
+def reset_state():
+    """
+    Сбросить состояние движка и всех команд после матча.
+
+    :return: weakref or None, ссылка на сцену прошлого матча (после сброса должна быть пустой)
+    """
+
+    scene = reset_engine()
+    for name in TEAMS:
+        reset_team(name)
+    gc.collect()
+    return scene
+
+
+class LeakCheck:
+    """
+    Проверка утечек между матчами одного процесса.
+
+    """
+
+    def __init__(self, max_growth: int = MAX_GROWTH, warmup: int = WARMUP_MATCHES, memory=memory_usage):
+        self._max_growth = max_growth
+        self._warmup = warmup
+        self._memory = memory
+        self.matches = 0
+        self.baseline = None
+        self.growth = 0
+
+    def check(self, scene) -> None:
+        """
+        Проверить процесс после сброса состояния.
+
+        :param scene: weakref or None, ссылка на сцену прошлого матча
+        :return: None
+        """
+
+        if scene is not None and scene() is not None:
+            referrers = [type(obj).__name__ for obj in gc.get_referrers(scene())]
+            raise RuntimeError('Scene of match {} is still referenced after reset by {}'.format(
+                self.matches + 1, ', '.join(sorted(set(referrers)))))
+        self.matches += 1
+        memory = self._memory()
+        if self.matches == self._warmup:
+            self.baseline = memory
+        elif self.baseline is not None:
+            self.growth = memory - self.baseline
+            if self.growth > self._max_growth:
+                raise RuntimeError('Memory grew by {:.1f} MB in {} matches after warmup'.format(
+                    self.growth / 2 ** 20, self.matches - self._warmup))
+
+
+_leaks = None
+
+
+def _init_worker(teams: list, max_growth: int) -> None:
+    global _leaks
+    for name in teams:
+        load_team(name)
+    _leaks = LeakCheck(max_growth=max_growth)
+
+
+def _run_task(job: tuple):
+    func, task = job
+    try:
+        return func(task)
+    finally:
+        _leaks.check(reset_state())
+
+
+class WarmPool:
+    """
+    Пул процессов, которые играют матч за матчем.
+
+    Функция задачи - как для multiprocessing.Pool (функция модуля, один аргумент),
+    она должна сама запускать матч, например runner.verify.record_match или runner.bench.bench_match.
+    teams - команды, которые импортируются при старте процесса (None - все).
+
+    """
+
+    def __init__(self, teams: list = None, processes: int = 1, max_growth: int = MAX_GROWTH):
+        teams = sorted(TEAMS) if teams is None else list(teams)
+        self._pool = multiprocessing.Pool(processes=processes, initializer=_init_worker,
+                                          initargs=(teams, max_growth))
+
+    def map(self, func, tasks: list) -> list:
+        """
+        Выполнить задачи по одной в тёплых процессах.
+
+        :param func: callable, функция задачи
+        :param tasks: list, аргументы задач
+        :return: list, результаты в порядке задач
+        """
+
+        return self._pool.map(_run_task, [(func, task) for task in tasks], chunksize=1)
+
+    def close(self) -> None:
+        self._pool.close()
+        self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if exc_info[0] is None:
+            self.close()
+        else:
+            self._pool.terminate()
+            self._pool.join()
@@ -1,5 +1,5 @@
 from .reaper import ReaperStrategy, ReaperDrone
-from robogame_engine.theme import theme
+from .utils.distances import DistanceMatrix
 
 
 class DrillerStrategy(ReaperStrategy):
@@ -8,10 +8,9 @@ class DrillerStrategy(ReaperStrategy):
         for u in units:
             if u == self.unit.mothership:
                 continue
-            if u in self.data._targets.values():
+            if self.data._targets.is_claimed(u):
                 continue
-            if sum([theme.DRONE_CARGO_PAYLOAD for t in self.data._targets if
-                    self.data._targets[t] == u]) < u.cargo.payload:
+            if not self.data._targets.is_oversubscribed(u):
                 return u
 
     def get_harvest_target(self):
@@ -19,7 +18,8 @@ class DrillerStrategy(ReaperStrategy):
         units = self.unit.pathfind.points
         if not units:
             return None
-        units.sort(key=lambda u: u.distance_to(self.unit))
+        distance = DistanceMatrix.for_turn(self.unit).distance
+        units.sort(key=lambda u: distance(self.unit, u))
 
         u = self.distribute_harvest_sources(units)
         return u
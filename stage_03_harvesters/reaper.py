@@ -1,26 +1,53 @@
 # -*- coding: utf-8 -*-
 
+import atexit
 import math
+from functools import partial
 from operator import mul
 
-from robogame_engine.geometry import Point
 from robogame_engine.theme import theme
 
+from .utils.background import BackgroundPlanner
 from .utils.dijkstra import Dijkstra
+from .utils.distances import DistanceMatrix
+from .utils.geometry import StaticGeometry
+from .utils.paths import GraphVersion, PathCache
 from .utils.states import DroneStateIdle
 from .utils.strategies import Strategy, DroneUnitWithStrategies
+from .utils.targets import TargetIndex
+from .utils.threats import ThreatDetector
+from .utils.tours import TourPlanner
+from .utils.worldstate import WorldState
 
 
 class ReaperStrategy(Strategy):
     _distance_max = None
     _distance_limit = None
+    # Pathfinder mode, see utils.dijkstra.MODES
+    _pathfind_mode = 'classic'
 
     # Data contains information for team. It useful when
     # have more than one drone with that strategy
     class Data:
         def __init__(self):
-            self._targets = {}
+            self._targets = TargetIndex()
+            self._threats = ThreatDetector()
+            self._graph = GraphVersion()
+            self._unload_paths = PathCache(self._graph)
+            self._harvest_tree = None
+            self._harvest_source = None
+            self._harvest_version = None
+            self._planner = None
+            self._world = None
             self._drones = []
+            self._positions = {}
+
+        def add_drone(self, drone):
+            self._positions[drone] = len(self._drones)
+            self._drones.append(drone)
+
+        def position(self, drone):
+            return self._positions[drone]
 
     _data = {}
 
@@ -32,6 +59,7 @@ class ReaperStrategy(Strategy):
 
     def __init__(self, *args, **kwargs):
         self._stepnum = 0
+        self._tour = []
         super(ReaperStrategy, self).__init__(*args, **kwargs)
         if ReaperStrategy._distance_max is None:
             ReaperStrategy._distance_max = math.sqrt(
@@ -39,63 +67,103 @@ class ReaperStrategy(Strategy):
         if ReaperStrategy._distance_limit is None:
             ReaperStrategy._distance_limit = 0.25 * ReaperStrategy._distance_max
 
-        self.data._drones.append(self.unit)
+        self.data.add_drone(self.unit)
 
         # PathFinder
         if self.unit.pathfind is None:
-            self.unit.pathfind = Dijkstra(self.unit)
+            self.unit.pathfind = Dijkstra(self.unit, mode=self._pathfind_mode)
         if self.unit.pathfind_unload is None:
-            self.unit.pathfind_unload = Dijkstra(self.unit)
+            self.unit.pathfind_unload = Dijkstra(self.unit, mode=self._pathfind_mode)
         self.data._enemy_drones = [d for d in self.unit.scene.drones if d.team != self.unit.team]
 
+    @property
+    def threats(self):
+        # Enemy headings are shared by the team and refreshed once per game step
+        threats = self.data._threats
+        scene = self.unit.scene
+        if threats.step != scene._step:
+            sources = scene.asteroids + scene.motherships + [d for d in scene.drones if not d.is_alive]
+            threats.update(scene._step, self.data._enemy_drones, sources)
+        return threats
+
+    def sync_graph(self):
+        # Found paths are shared by the team while payload and liveness of the path nodes stay the same.
+        # Alive units can only be a node as own mothership, their cargo does not change the weights
+        graph = self.data._graph
+        scene = self.unit.scene
+        if graph.step != scene._step:
+            state = {a: a.cargo.payload for a in scene.asteroids}
+            for u in scene.motherships + scene.drones:
+                state[u] = u.cargo.payload if not u.is_alive else None
+            graph.sync(scene._step, state)
+        return graph
+
+    def harvest_tree(self):
+        # Shortest paths from the mothership to every harvest source. The tree is built by the first drone
+        # asking after the graph changed, the others only extract their paths from it
+        data = self.data
+        version = self.sync_graph().version
+        if data._harvest_version != version:
+            pathfind = Dijkstra(self.unit, mode='exact')
+            pathfind.update_units(func=lambda u: not u.cargo.is_empty)
+            pathfind.calc_weights(func=self.weight_harvest_func)
+            tree = pathfind.shortest_path_tree(self.unit.mothership)
+            if tree is None:
+                return None
+            units = [u for u in tree.points if u != self.unit.mothership]
+            data._harvest_tree = tree
+            distance = StaticGeometry.for_scene(self.unit.scene).distance
+            data._harvest_source = min(units, key=lambda u: distance(u, self.unit.mothership)) if units else None
+            data._harvest_version = version
+        return data._harvest_tree
+
+    def find_unload_path(self, source, target):
+        self.unit.pathfind_unload.calc_weights(func=self.weight_unload_func)
+        return self.unit.pathfind_unload.find_path(source, target, as_objects=True)  # , info="unld")
+
     def weight_harvest_func(self, a, b):
-        dist = a.distance_to(b)
         distlim = self._distance_limit
         if b.cargo.fullness == 0.0 or b.__class__ == self.unit.mothership.__class__:
             return float("inf")
-        amdist = a.distance_to(self.unit.mothership)
-        bmdist = b.distance_to(self.unit.mothership)
-        abdist = a.distance_to(b)
-        k = float(self._distance_max)
+        dist = StaticGeometry.for_scene(self.unit.scene).distance(a, b)
         coef = [1.0 / distlim, 1.0]
         values = [dist, 1.0 - b.cargo.fullness]
         return sum(map(mul, coef, values))
 
     def get_harvest_source(self):
-        center_of_scene = Point(theme.FIELD_WIDTH / 2, theme.FIELD_HEIGHT / 2)
-        units = self.unit.pathfind.points
-        units.sort(key=lambda u: u.distance_to(self.unit.mothership))
-        units = [u for u in units if u != self.unit.mothership]
-        return units[0] if units else None
+        # The closest to the mothership source, found once per tree
+        if self.harvest_tree() is None:
+            return None
+        return self.data._harvest_source
 
     def distribute_harvest_sources(self, units):
         # Distribute enought amount of units to harvest a source
         for u in units:
             if u == self.unit.mothership:
                 continue
-            if sum([theme.DRONE_CARGO_PAYLOAD for t in self.data._targets if
-                    self.data._targets[t] == u]) < u.cargo.payload:
+            if not self.data._targets.is_oversubscribed(u):
                 return u
         return None
 
     def get_harvest_target(self):
-        self.unit.pathfind.update_units(func=lambda u: not u.cargo.is_empty)
+        tree = self.harvest_tree()
+        if tree is None:
+            return None
 
-        didx = self.data._drones.index(self.unit)
+        didx = self.data.position(self.unit)
         if didx < 3:
-            center_of_scene = self.unit.mothership.coord.copy()
-            units = [p for p in self.unit.pathfind.points if p != self.unit.mothership]
+            units = [p for p in tree.points if p != self.unit.mothership]
             if not units:
                 return None
-            units.sort(key=lambda u: u.distance_to(self.unit))
+            distance = DistanceMatrix.for_turn(self.unit).distance
+            units.sort(key=lambda u: distance(self.unit, u))
             return units[didx] if len(units) - 1 >= didx else units[0]
 
-        self.unit.pathfind.calc_weights(func=self.weight_harvest_func)
         fat_source = self.get_harvest_source()
         if not fat_source:
             return None
 
-        path = self.unit.pathfind.find_path(self.unit.mothership, fat_source, as_objects=True)
+        path = tree.path_to(fat_source)
         if path is None:
             return None
 
@@ -103,23 +171,115 @@ class ReaperStrategy(Strategy):
         if u:
             return u
 
-        pos = self.data._drones.index(self.unit)
+        pos = self.data.position(self.unit)
         sz = len(path)
         idx = min(sz, (pos % (sz - 1)) + 1 if sz > 1 else 0)
         return path[idx]
 
+    def tour_snapshot(self, first, stops):
+        # Immutable input of the tour planner, units are only keys for it
+        tree = self.harvest_tree()
+        if tree is None:
+            return None
+        targets = self.data._targets
+        mothership = self.unit.mothership
+        sources = tuple((u, u.coord.x, u.coord.y, u.cargo.payload - targets.reserved(u))
+                        for u in tree.points if u != mothership and not u.cargo.is_empty)
+        return ((self.unit.coord.x, self.unit.coord.y), (mothership.coord.x, mothership.coord.y),
+                sources, self.unit.cargo.free_space, first, stops)
+
+    @staticmethod
+    def plan_tour_snapshot(start, base, sources, capacity, first, stops):
+        # Further stops after the team target, picked to fill the cargo on the way back to the mothership
+        return TourPlanner(max_stops=stops).plan(start, base, sources, capacity, first=first)[1:]
+
+    def plan_tour(self, first, stops):
+        snapshot = self.tour_snapshot(first, stops)
+        return self.plan_tour_snapshot(*snapshot) if snapshot else []
+
+    def world_snapshot(self, first, stops):
+        # Input of the background planner: rows of the team world state instead of values,
+        # the planner reads coordinates and payloads on its side. Reserved amounts stay team bookkeeping
+        tree = self.harvest_tree()
+        if tree is None:
+            return None
+        world = self.data._world
+        targets = self.data._targets
+        mothership = self.unit.mothership
+        sources = tuple((u, world.row(u), targets.reserved(u))
+                        for u in tree.points if u != mothership and not u.cargo.is_empty)
+        return (world.row(self.unit), world.row(mothership), sources, self.unit.cargo.free_space, first, stops)
+
+    @staticmethod
+    def plan_tour_world(world, drone, base, sources, capacity, first, stops):
+        # A consistent copy of the world state, a torn read after all retries leaves the drone without a tour
+        state = world.read(('x', 'y', 'payload'))
+        if state is None:
+            return None
+        _, values = state
+        x, y, payload = values['x'], values['y'], values['payload']
+        sources = tuple((u, x[row], y[row], payload[row] - reserved) for u, row, reserved in sources)
+        return ReaperStrategy.plan_tour_snapshot((x[drone], y[drone]), (x[base], y[base]), sources, capacity,
+                                                 first, stops)
+
+    @property
+    def planner(self):
+        # Team planner thread, tours planned there are picked up on the next stop.
+        # A leg of a tour (flight and loading) takes about 100 steps.
+        # The world state it reads is updated by the team once per game step
+        data = self.data
+        if data._planner is None:
+            scene = self.unit.scene
+            data._world = WorldState(capacity=len(scene.asteroids) + len(scene.motherships) + len(scene.drones))
+            data._world.sync(scene)
+            data._planner = BackgroundPlanner(partial(self.plan_tour_world, data._world), max_age=200)
+        return data._planner
+
+    @classmethod
+    def close_planners(cls):
+        # Planner threads are stopped before the world state segments they read are released
+        BackgroundPlanner.close_all()
+        WorldState.close_all()
+
+    def next_harvest_target(self, stops=1, background=False):
+        # Continue the planned tour while there is something in the cargo, otherwise start a new one.
+        # With a single stop per tour it is the team target
+        if background and self.data._planner is not None:
+            # A stop emptied since the snapshot makes the whole tour stale, an unloaded drone starts a new one
+            tour = self.planner.take(self.unit, self.unit.scene._step,
+                                     lambda plan: not self.unit.cargo.is_empty and
+                                     not any(u.cargo.is_empty for u in plan))
+            if tour is not None:
+                self._tour = tour
+        while self._tour and not self.unit.cargo.is_empty:
+            target = self._tour.pop(0)
+            if not target.cargo.is_empty:
+                return target
+        self._tour = []
+        target = self.get_harvest_target()
+        if target is not None and stops > 1:
+            if background:
+                planner = self.planner
+                snapshot = self.world_snapshot(target, stops)
+                if snapshot:
+                    planner.submit(self.unit, self.unit.scene._step, *snapshot)
+            else:
+                self._tour = self.plan_tour(target, stops)
+        return target
+
     def weight_unload_func(self, a, b):
         if a == self.unit.mothership or b == self.unit.mothership:
             return 0.0
-        dist = a.distance_to(b)
-        adist = self.unit.mothership.distance_to(a)
-        bdist = self.unit.mothership.distance_to(b)
+        distance = StaticGeometry.for_scene(self.unit.scene).distance
+        dist = distance(a, b)
+        adist = distance(self.unit.mothership, a)
+        bdist = distance(self.unit.mothership, b)
         coef = [bdist / adist, 1.0]
         values = [dist, 1.0 - b.cargo.fullness]
         return sum(map(mul, coef, values))
 
     def get_unload_target(self):
-        if self.data._drones.index(self.unit) < 2:
+        if self.data.position(self.unit) < 2:
             return self.unit.mothership
         if len([a for a in self.unit.scene.asteroids if a.cargo.payload > 0]) == 0:
             return self.unit.mothership
@@ -127,14 +287,12 @@ class ReaperStrategy(Strategy):
         self.unit.pathfind_unload.update_units(func=lambda u: u.cargo.fullness < 1.0)
 
         uclosest = self.unit.closest_in_path
-        self.unit.pathfind_unload.calc_weights(func=self.weight_unload_func)
-
-        path_unload = self.unit.pathfind_unload.find_path(uclosest, self.unit.mothership,
-                                                          as_objects=True)  # , info="unld")
+        self.sync_graph()
+        path_unload = self.data._unload_paths.get(uclosest, self.unit.mothership, self.find_unload_path)
         if path_unload is None:
             return None
 
-        pos = self.data._drones.index(self.unit)
+        pos = self.data.position(self.unit)
         sz = len(path_unload)
         # Возврат, проекция бинарного поиска в отношении path-finding
         idx = min(len(path_unload) - 1, int(len(path_unload) / 2) + 1) if sz > 1 else 0
@@ -151,16 +309,22 @@ class ReaperStrategy(Strategy):
     def game_step(self, *args, **kwargs):
         self._stepnum = self._stepnum + 1
         super(ReaperStrategy, self).game_step(*args, **kwargs)
+        if self.data._world is not None:
+            self.data._world.sync(self.unit.scene)
 
         newState = self.fsm_state.make_transition()
         if newState != self.fsm_state.__class__:
-            self.data._targets[self.unit.id] = None
+            self.data._targets.release(self.unit)
             self.unit.set_fsm_state(newState(self))
 
         if self.unit.fsm_state:
             self.unit.fsm_state.game_step()
 
 
+# Shared memory of the world states is released before the process exits
+atexit.register(ReaperStrategy.close_planners)
+
+
 class ReaperDrone(DroneUnitWithStrategies):
     _strategy_class = ReaperStrategy
     _logging = False
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+import threading
+import unittest
+
+from stage_03_harvesters.utils.background import BackgroundPlanner
+
+
+class BackgroundPlannerTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.release = threading.Event()
+        self.release.set()
+        self.planned = []
+        self.planner = BackgroundPlanner(self.plan, max_age=10)
+
+    def tearDown(self) -> None:
+        self.release.set()
+        self.planner.close()
+
+    def plan(self, value):
+        self.release.wait()
+        if value is None:
+            raise ValueError(value)
+        self.planned.append(value)
+        return [value]
+
+    def test_later_step(self) -> None:
+        self.planner.submit('a', 1, 5)
+        self.assertTrue(self.planner.wait(5))
+        self.assertEqual(self.planner.take('a', 4), [5])
+        self.assertIsNone(self.planner.take('a', 5))
+        self.assertEqual(self.planner.stats['applied'], 1)
+        self.assertEqual(self.planner.stats['mean_age'], 3)
+
+    def test_submit_does_not_wait(self) -> None:
+        self.release.clear()
+        self.planner.submit('a', 1, 5)
+        self.assertIsNone(self.planner.take('a', 1))
+        # Only the latest snapshot of a key is planned
+        self.planner.submit('b', 1, 6)
+        self.planner.submit('b', 2, 7)
+        self.release.set()
+        self.assertTrue(self.planner.wait(5))
+        self.assertNotIn(6, self.planned)
+        self.assertEqual(self.planner.take('b', 2), [7])
+
+    def test_stale(self) -> None:
+        self.planner.submit('a', 1, 5)
+        self.planner.submit('b', 1, 6)
+        self.planner.submit('c', 1, None)
+        self.assertTrue(self.planner.wait(5))
+        self.assertIsNone(self.planner.take('a', 12))
+        self.assertIsNone(self.planner.take('b', 2, is_valid=lambda plan: 6 not in plan))
+        self.assertIsNone(self.planner.take('c', 2))
+        self.assertEqual(self.planner.stats['discarded'], 3)
+        self.assertEqual(self.planner.stats['failed'], 1)
+        self.assertEqual(self.planner.stats['applied'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
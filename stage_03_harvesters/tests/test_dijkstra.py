@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+import random
+import unittest
+from unittest.mock import Mock
+
+from robogame_engine.geometry import Point
+
+from stage_03_harvesters.utils.dijkstra import Dijkstra
+
+
+class Node(Point):
+
+    def __init__(self, x, y, fullness):
+        super(Node, self).__init__(x, y)
+        self.fullness = fullness
+
+
+def weight_func(a, b):
+    # Like ReaperStrategy.weight_harvest_func, but long jumps cost more so detours can be shorter
+    if b.fullness == 0.0:
+        return float('inf')
+    dist = a.distance_to(b) / 500.0
+    return dist * (1.0 + dist) + (1.0 - b.fullness)
+
+
+def linear_weight_func(a, b):
+    # Same shape as ReaperStrategy.weight_harvest_func
+    return a.distance_to(b) / 500.0 + (1.0 - b.fullness)
+
+
+class DijkstraTest(unittest.TestCase):
+
+    def make(self, mode, points, func=weight_func):
+        unit = Mock()
+        unit.is_alive = True
+        pathfind = Dijkstra(unit, points=points, mode=mode)
+        pathfind.calc_weights(func=func, heuristic_scale=1.0 / 500.0)
+        return pathfind
+
+    @staticmethod
+    def cost(pathfind, path):
+        return sum(weight_func(a, b) for a, b in zip(path, path[1:]))
+
+    def test_astar_matches_exact(self) -> None:
+        rnd = random.Random(1)
+        for _ in range(20):
+            points = [Node(rnd.uniform(0, 3000), rnd.uniform(0, 3000), rnd.choice([0.0, rnd.random()]))
+                      for _ in range(60)]
+            exact = self.make('exact', points)
+            astar = self.make('astar', points)
+            for target in rnd.sample(points[1:], 5):
+                expected = exact.find_path(points[0], target, as_objects=True)
+                result = astar.find_path(points[0], target, as_objects=True)
+                if target.fullness == 0.0:
+                    self.assertIsNone(expected)
+                    self.assertIsNone(result)
+                    continue
+                self.assertEqual(result, expected)
+                self.assertLessEqual(astar.expanded, exact.expanded)
+
+    def test_exact_is_optimal(self) -> None:
+        # Going through the full middle node is cheaper than the direct jump: 2 * 2.0 + 0.5 < 6.0 + 0.5
+        points = [Node(0, 0, 1.0), Node(500, 0, 1.0), Node(1000, 0, 0.5), Node(500, 900, 0.5)]
+        pathfind = self.make('exact', points)
+        self.assertEqual(pathfind.find_path(points[0], points[2]), [0, 1, 2])
+        self.assertAlmostEqual(self.cost(pathfind, pathfind.find_path(points[0], points[2], as_objects=True)), 4.5)
+
+    def test_astar_expands_fraction(self) -> None:
+        rnd = random.Random(2)
+        points = [Node(rnd.uniform(0, 12000), rnd.uniform(0, 12000), rnd.random()) for _ in range(400)]
+        exact = self.make('exact', points, linear_weight_func)
+        astar = self.make('astar', points, linear_weight_func)
+        target = max(points[1:], key=lambda p: p.distance_to(points[0]))
+        self.assertEqual(astar.find_path(points[0], target), exact.find_path(points[0], target))
+        self.assertLess(astar.expanded * 4, exact.expanded)
+
+    def test_shortest_path_tree(self) -> None:
+        rnd = random.Random(3)
+        points = [Node(rnd.uniform(0, 3000), rnd.uniform(0, 3000), rnd.choice([0.0, rnd.random()]))
+                  for _ in range(60)]
+        exact = self.make('exact', points)
+        tree = exact.shortest_path_tree(points[0])
+        for target in rnd.sample(points, 30):
+            expected = exact.find_path(points[0], target, as_objects=True)
+            self.assertEqual(tree.path_to(target), expected)
+        self.assertIsNone(tree.path_to(Node(0, 0, 1.0)))
+
+    def test_unknown_mode(self) -> None:
+        with self.assertRaises(ValueError):
+            Dijkstra(Mock(), mode='bfs')
+
+
+if __name__ == '__main__':
+    unittest.main()
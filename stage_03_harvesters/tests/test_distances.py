@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+import random
+import unittest
+
+from robogame_engine.geometry import Point
+
+from stage_03_harvesters.utils.distances import DistanceMatrix
+
+
+class Body:
+
+    def __init__(self, x, y):
+        self.coord = Point(x, y)
+
+
+class Scene:
+
+    def __init__(self, asteroids, motherships, drones):
+        self.asteroids, self.motherships, self.drones = asteroids, motherships, drones
+        self._step = 1
+
+
+class DistanceMatrixTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        rng = random.Random(5)
+        self.asteroids = [Body(rng.uniform(0, 1200), rng.uniform(0, 1200)) for _ in range(10)]
+        self.mothership = Body(90.0, 90.0)
+        self.drones = [Body(rng.uniform(0, 1200), rng.uniform(0, 1200)) for _ in range(4)]
+        self.scene = Scene(self.asteroids, [self.mothership], self.drones)
+        self.matrix = DistanceMatrix(self.scene)
+
+    def test_same_as_distance_to(self) -> None:
+        drone = self.drones[0]
+        self.matrix.turn(drone)
+        objects = self.asteroids + [self.mothership] + self.drones
+        for a in objects:
+            for b in objects:
+                self.assertEqual(self.matrix.distance(a, b), a.coord.distance_to(b.coord))
+        self.assertEqual(self.matrix.row(drone), [drone.coord.distance_to(b.coord) for b in objects])
+        # Точки и чужие объекты считаются напрямую
+        point = Point(3.5, 7.25)
+        self.assertEqual(self.matrix.distance(drone, point), drone.coord.distance_to(point))
+        self.assertEqual(self.matrix.distance(point, drone), point.distance_to(drone.coord))
+        projectile = Body(10.0, 20.0)
+        self.assertEqual(self.matrix.distance(drone, projectile), drone.coord.distance_to(projectile.coord))
+
+    def test_rows_live_for_one_turn(self) -> None:
+        drone, asteroid = self.drones[0], self.asteroids[0]
+        self.matrix.turn(drone)
+        before = self.matrix.distance(drone, asteroid)
+
+        # Пока ход того же дрона на том же месте, ответы не пересчитываются
+        self.drones[1].coord = Point(0.0, 0.0)
+        self.matrix.turn(drone)
+        self.assertEqual(self.matrix.distance(self.drones[1], asteroid), asteroid.coord.distance_to(Point(0.0, 0.0)))
+        self.assertEqual(self.matrix.distance(drone, asteroid), before)
+
+        # Дрон сдвинулся - это уже другой ход
+        drone.coord = Point(drone.coord.x + 5.0, drone.coord.y)
+        self.matrix.turn(drone)
+        self.assertEqual(self.matrix.distance(drone, asteroid), drone.coord.distance_to(asteroid.coord))
+
+        self.scene._step = 2
+        self.drones[1].coord = Point(600.0, 600.0)
+        self.matrix.turn(drone)
+        self.assertEqual(self.matrix.distance(self.drones[1], asteroid), asteroid.coord.distance_to(Point(600, 600)))
+
+    def test_order_and_nearest(self) -> None:
+        drone = self.drones[0]
+        self.matrix.turn(drone)
+        twin = Body(drone.coord.x, drone.coord.y + 300.0)
+        other = Body(drone.coord.x + 300.0, drone.coord.y)
+        self.asteroids.extend([twin, other])
+        expected = sorted(self.asteroids, key=lambda a: drone.coord.distance_to(a.coord))
+        self.assertEqual(self.matrix.order(drone, self.asteroids), expected)
+        # Объекты, родившиеся позже, попадают в матрицу при первом запросе, при равных расстояниях - первый
+        self.assertIs(self.matrix.nearest(drone, [twin, other]), twin)
+        self.assertIs(self.matrix.nearest(drone, [other, twin]), other)
+        self.assertIsNone(self.matrix.nearest(drone, []))
+        self.assertIn(twin, self.matrix.objects)
+
+    def test_for_scene(self) -> None:
+        matrix = DistanceMatrix.for_scene(self.scene)
+        try:
+            self.assertIs(DistanceMatrix.for_scene(self.scene), matrix)
+            self.drones[0].scene = self.scene
+            self.assertIs(DistanceMatrix.for_turn(self.drones[0]), matrix)
+        finally:
+            DistanceMatrix._matrices.pop(self.scene, None)
+
+
+if __name__ == '__main__':
+    unittest.main()
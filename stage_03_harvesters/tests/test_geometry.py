@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+import random
+import unittest
+
+from robogame_engine.geometry import Point
+
+from stage_03_harvesters.utils.geometry import StaticGeometry
+
+
+class Body:
+
+    def __init__(self, x, y):
+        self.coord = Point(x, y)
+
+
+class Scene:
+
+    def __init__(self, asteroids, motherships):
+        self.asteroids, self.motherships = asteroids, motherships
+
+
+class StaticGeometryTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        rng = random.Random(7)
+        self.asteroids = [Body(rng.uniform(0, 1200), rng.uniform(0, 1200)) for _ in range(15)]
+        self.motherships = [Body(90.0, 90.0), Body(1110.0, 1110.0)]
+        self.scene = Scene(self.asteroids, self.motherships)
+        self.geometry = StaticGeometry(self.scene)
+
+    def test_same_as_distance_to(self) -> None:
+        objects = self.asteroids + self.motherships
+        for a in objects:
+            for b in objects:
+                self.assertEqual(self.geometry.distance(a, b), a.coord.distance_to(b.coord))
+        # Дроны и точки считаются напрямую
+        drone, point = Body(500.0, 600.0), Point(3.5, 7.25)
+        asteroid, base = self.asteroids[0], self.motherships[0]
+        self.assertEqual(self.geometry.distance(drone, asteroid), drone.coord.distance_to(asteroid.coord))
+        self.assertEqual(self.geometry.distance(base, point), base.coord.distance_to(point))
+
+    def test_neighbours(self) -> None:
+        base = self.motherships[0]
+        twin = Body(base.coord.x, base.coord.y + 50.0)
+        other = Body(base.coord.x + 50.0, base.coord.y)
+        self.asteroids.extend([twin, other])
+        # Астероид, появившийся после построения таблицы, добавляется при первом запросе о нём
+        self.assertEqual(self.geometry.distance(other, base), 50.0)
+        neighbours = self.geometry.neighbours(base)
+        self.assertEqual(list(neighbours), sorted(self.asteroids, key=lambda a: base.coord.distance_to(a.coord)))
+        # При равных расстояниях - порядок сцены
+        self.assertEqual(neighbours.index(twin) + 1, neighbours.index(other))
+        self.assertIs(self.geometry.neighbours(base), neighbours)
+
+    def test_for_scene(self) -> None:
+        geometry = StaticGeometry.for_scene(self.scene)
+        try:
+            self.assertIs(StaticGeometry.for_scene(self.scene), geometry)
+        finally:
+            StaticGeometry._tables.pop(self.scene, None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from stage_03_harvesters.utils.paths import GraphVersion, PathCache
+
+
+class PathCacheTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.graph = GraphVersion()
+        self.cache = PathCache(self.graph, size=2)
+        self.calls = []
+
+    def find(self, source, target):
+        self.calls.append((source, target))
+        return [source, target]
+
+    def test_shared_in_step(self) -> None:
+        self.graph.sync(1, {'a': 100})
+        self.assertEqual(self.cache.get('m', 'a', self.find), ['m', 'a'])
+        self.assertEqual(self.cache.get('m', 'a', self.find), ['m', 'a'])
+        self.assertEqual(self.calls, [('m', 'a')])
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_version(self) -> None:
+        self.graph.sync(1, {'a': 100})
+        version = self.graph.version
+        self.cache.get('m', 'a', self.find)
+
+        # Nothing changed - the path is still valid on the next step
+        self.graph.sync(2, {'a': 100})
+        self.assertEqual(self.graph.version, version)
+        self.cache.get('m', 'a', self.find)
+        self.assertEqual(len(self.calls), 1)
+
+        # The state is compared once per step
+        self.graph.sync(2, {'a': 50})
+        self.assertEqual(self.graph.version, version)
+
+        self.graph.sync(3, {'a': 50})
+        self.assertEqual(self.graph.version, version + 1)
+        self.cache.get('m', 'a', self.find)
+        self.assertEqual(len(self.calls), 2)
+
+    def test_lru(self) -> None:
+        self.graph.sync(1, {})
+        self.cache.get('m', 'a', self.find)
+        self.cache.get('m', 'b', self.find)
+        self.cache.get('m', 'a', self.find)
+        self.cache.get('m', 'c', self.find)
+        self.assertEqual(len(self.cache), 2)
+        self.cache.get('m', 'a', self.find)
+        self.cache.get('m', 'b', self.find)
+        self.assertEqual(self.calls, [('m', 'a'), ('m', 'b'), ('m', 'c'), ('m', 'b')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+import unittest
+from unittest.mock import Mock
+
+from astrobox.core import Asteroid, Drone, MotherShip
+
+from stage_03_harvesters.utils.registry import ObjectRegistry
+
+
+def make(cls, payload=100, is_alive=True):
+    obj = Mock(spec=cls)
+    obj.cargo.payload = payload
+    obj.is_alive = is_alive
+    return obj
+
+
+class Scene:
+
+    def __init__(self, objects):
+        self.objects = objects
+        self._step = 1
+
+
+class ObjectRegistryTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.asteroids = [make(Asteroid), make(Asteroid, payload=0), make(Asteroid)]
+        self.drones = [make(Drone), make(Drone, payload=0, is_alive=False)]
+        self.motherships = [make(MotherShip), make(MotherShip, is_alive=False)]
+        self.scene = Scene(self.asteroids + self.drones + self.motherships + [Mock()])
+        self.registry = ObjectRegistry(self.scene)
+
+    def test_sorted_at_birth(self) -> None:
+        # Астероиды хранятся все, даже пустые, а мёртвые дроны остаются в запасах и без груза
+        self.assertEqual(list(self.registry.asteroids), self.asteroids)
+        self.assertEqual(list(self.registry.dead_drones), [self.drones[1]])
+        self.assertEqual(list(self.registry.dead_motherships), [self.motherships[1]])
+
+    def test_sync_once_per_step(self) -> None:
+        list(self.registry.asteroids)
+        self.asteroids[0].cargo.payload = 0
+        self.drones[0].is_alive = False
+        self.drones[0].cargo.payload = 0
+        self.motherships[0].is_alive = False
+        # До следующего шага игры изменения не видны
+        self.assertEqual(list(self.registry.dead_drones), [self.drones[1]])
+
+        self.scene._step = 2
+        self.assertEqual(list(self.registry.dead_drones), [self.drones[1], self.drones[0]])
+        self.assertEqual(list(self.registry.dead_motherships), [self.motherships[1], self.motherships[0]])
+        # Опустевший астероид остаётся: дрон может выгрузить в него элериум
+        self.assertEqual(list(self.registry.asteroids), self.asteroids)
+
+    def test_register(self) -> None:
+        drone = make(Drone)
+        self.registry.register(drone)
+        self.registry.register(drone)
+        drone.is_alive = False
+        self.scene._step = 2
+        self.assertEqual(list(self.registry.dead_drones), [self.drones[1], drone])
+
+    def test_for_scene(self) -> None:
+        registry = ObjectRegistry.for_scene(self.scene)
+        try:
+            self.assertIs(ObjectRegistry.for_scene(self.scene), registry)
+        finally:
+            ObjectRegistry._registries.pop(self.scene, None)
+
+
+if __name__ == '__main__':
+    unittest.main()
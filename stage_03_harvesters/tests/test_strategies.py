@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+import unittest
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from astrobox.core import Asteroid, Drone, MotherShip
+
+from stage_03_harvesters.utils.strategies import Strategy, StrategyHarvesting, StrategyScheduler, StrategySequence
+
+
+class StepStrategy(Strategy):
+    def __init__(self, steps=1, **kwargs):
+        super(StepStrategy, self).__init__(**kwargs)
+        self.steps = steps
+        self.done = 0
+
+    @property
+    def is_finished(self):
+        return self.done >= self.steps
+
+    def game_step(self):
+        self.done += 1
+
+
+class StrategySchedulerTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.scheduler = StrategyScheduler()
+
+    def test_priority(self) -> None:
+        low = StepStrategy(id="low", group="a")
+        high = StepStrategy(id="high", group="b", priority=5)
+        same = StepStrategy(id="same", group="c")
+        for s in (low, high, same):
+            self.scheduler.append(s)
+        self.assertIs(self.scheduler.current, high)
+
+        self.scheduler.game_step()
+        self.assertEqual(high.done, 1)
+        # Завершённая стратегия снимается и в том же шаге выполняется следующая по порядку
+        self.scheduler.game_step()
+        self.assertEqual((low.done, same.done), (1, 0))
+        self.assertEqual(len(self.scheduler), 2)
+        self.scheduler.game_step()
+        self.assertEqual((low.done, same.done), (1, 1))
+        self.scheduler.game_step()
+        self.assertIsNone(self.scheduler.current)
+        self.assertEqual(len(self.scheduler), 0)
+
+    def test_group_unique(self) -> None:
+        first = StepStrategy(id="first", group="approach")
+        second = StepStrategy(id="second", group="approach")
+        unique = StepStrategy(id="unique", group="approach", is_group_unique=True)
+        other = StepStrategy(id="other", group="cargo")
+        for s in (first, second, other, unique):
+            self.scheduler.append(s)
+        self.assertEqual(len(self.scheduler), 2)
+        self.assertIs(self.scheduler.current, other)
+        self.scheduler.remove(other)
+        self.assertIs(self.scheduler.current, unique)
+
+    def test_timings(self) -> None:
+        self.scheduler.append(StepStrategy(steps=3, id="work"))
+        for _ in range(5):
+            self.scheduler.game_step()
+        timing = self.scheduler.timings["work"]
+        self.assertEqual(timing.steps, 3)
+        self.assertGreaterEqual(timing.worst, timing.mean)
+
+    def test_clear(self) -> None:
+        self.scheduler.append(StepStrategy(group="a", is_group_unique=True))
+        self.scheduler.clear()
+        self.assertIsNone(self.scheduler.current)
+        self.scheduler.append(StepStrategy(group="a", is_group_unique=True))
+        self.assertEqual(len(self.scheduler), 1)
+
+
+class StrategySequenceTest(unittest.TestCase):
+
+    def test_advance(self) -> None:
+        parts = [StepStrategy(steps=2), StepStrategy(steps=1), StepStrategy(steps=1)]
+        sequence = StrategySequence(*parts)
+        steps = 0
+        while not sequence.is_finished:
+            sequence.game_step()
+            steps += 1
+        self.assertEqual([p.done for p in parts], [2, 1, 1])
+        self.assertEqual(steps, 5)
+
+
+def stock(cls, payload, distance):
+    obj = Mock(spec=cls)
+    obj.cargo.payload = payload
+    obj.distance_to.return_value = distance
+    return obj
+
+
+class StrategyHarvestingTest(unittest.TestCase):
+
+    def test_nearest_elerium_stock(self) -> None:
+        asteroid = stock(Asteroid, 0, 10)
+        dead_drone = stock(Drone, 50, 30)
+        dead_mothership = stock(MotherShip, 100, 5)
+        unit = SimpleNamespace(elerium_stock=None, teammates=[],
+                               elerium_stocks=[asteroid, dead_drone, dead_mothership])
+        strategy = StrategyHarvesting(unit=unit)
+        # Мёртвые базы не выбираются, пустой астероид пропускается
+        self.assertIs(strategy.get_nearest_elerium_stock(), dead_drone)
+        # Астероид, в который выгрузили элериум, снова выбирается
+        asteroid.cargo.payload = 20
+        self.assertIs(strategy.get_nearest_elerium_stock(), asteroid)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+import unittest
+from unittest.mock import Mock
+
+from stage_03_harvesters.utils.targets import TargetIndex
+
+
+class TargetIndexTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.index = TargetIndex()
+        self.source = Mock()
+        self.source.cargo.payload = 150
+        self.drones = [Mock() for _ in range(3)]
+
+    def test_assign(self) -> None:
+        self.index.assign(self.drones[0], self.source, 100)
+        self.assertIs(self.index.target_of(self.drones[0]), self.source)
+        self.assertEqual(self.index.drones_of(self.source), {self.drones[0]})
+        self.assertEqual(self.index.reserved(self.source), 100)
+        self.assertTrue(self.index.is_claimed(self.source))
+        self.assertFalse(self.index.is_oversubscribed(self.source))
+
+        self.index.assign(self.drones[1], self.source, 100)
+        self.assertEqual(self.index.reserved(self.source), 200)
+        self.assertTrue(self.index.is_oversubscribed(self.source))
+
+    def test_reassign(self) -> None:
+        other = Mock()
+        self.index.assign(self.drones[0], self.source, 100)
+        self.index.assign(self.drones[0], other, 40)
+        self.assertFalse(self.index.is_claimed(self.source))
+        self.assertEqual(self.index.reserved(self.source), 0)
+        self.assertEqual(self.index.reserved(other), 40)
+        self.assertEqual(len(self.index), 1)
+
+    def test_release(self) -> None:
+        for drone in self.drones:
+            self.index.assign(drone, self.source, 50)
+        self.assertTrue(self.index.is_oversubscribed(self.source))
+
+        self.index.release(self.drones[0])
+        self.assertIsNone(self.index.target_of(self.drones[0]))
+        self.assertEqual(self.index.reserved(self.source), 100)
+        self.assertFalse(self.index.is_oversubscribed(self.source))
+
+        # Повторное освобождение ничего не ломает
+        self.index.release(self.drones[0])
+        self.index.release(self.drones[1])
+        self.index.release(self.drones[2])
+        self.assertFalse(self.index.is_claimed(self.source))
+        self.assertEqual(self.index.drones_of(self.source), frozenset())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+import math
+import random
+import unittest
+
+from robogame_engine.geometry import Point
+
+from stage_03_harvesters.utils.threatmap import ThreatMap
+
+
+class Unit:
+
+    def __init__(self, x, y, have_gun=True, is_alive=True):
+        self.coord = Point(x, y)
+        self.have_gun = have_gun
+        self.is_alive = is_alive
+
+    @property
+    def x(self):
+        return self.coord.x
+
+    @property
+    def y(self):
+        return self.coord.y
+
+    def distance_to(self, other):
+        return self.coord.distance_to(other.coord)
+
+
+class ThreatMapTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.map = ThreatMap((1000, 1000), reach=150.0, cell=50.0)
+        self.base = Unit(100, 100)
+
+    def test_danger_at_point(self) -> None:
+        enemies = [Unit(200, 100), Unit(210, 100), Unit(220, 100, have_gun=False)]
+        self.map.update(1, enemies)
+        # Оба вооружённых врага достают до базы, безоружный не считается
+        self.assertEqual(self.map.danger_near(self.base), 2.0)
+        self.assertEqual(self.map.danger_at(900, 900), 0.0)
+
+        enemies[0].coord = Point(800, 800)
+        enemies[1].is_alive = False
+        self.map.update(2, enemies)
+        self.assertEqual(self.map.danger_near(self.base), 0.0)
+        self.assertEqual(self.map.danger_at(800, 800), 1.0)
+        self.assertEqual(len(self.map), 2)
+
+    def test_incremental_matches_rebuild(self) -> None:
+        rng = random.Random(3)
+        enemies = [Unit(rng.uniform(0, 1000), rng.uniform(0, 1000), have_gun=rng.random() < 0.8) for _ in range(12)]
+        for step in range(300):
+            for enemy in enemies:
+                enemy.coord = Point(min(max(enemy.x + rng.uniform(-30, 30), 0), 999),
+                                    min(max(enemy.y + rng.uniform(-30, 30), 0), 999))
+                if rng.random() < 0.003:
+                    enemy.is_alive = False
+            self.map.update(step, enemies)
+            if step % 7:
+                continue
+            fresh = ThreatMap((1000, 1000), reach=150.0, cell=50.0)
+            fresh.update(step, enemies)
+            for x in range(0, 1000, 50):
+                for y in range(0, 1000, 50):
+                    self.assertEqual(self.map.danger_at(x, y), fresh.danger_at(x, y))
+                    exact = sum(1 for e in enemies if e.is_alive and e.have_gun and math.hypot(e.x - x, e.y - y) <= 150)
+                    self.assertGreaterEqual(self.map.danger_at(x, y), exact)
+
+    def test_within_and_nearest(self) -> None:
+        far = Unit(400, 100)
+        near = Unit(160, 100)
+        twin = Unit(100, 160)
+        dead = Unit(110, 100, is_alive=False)
+        unarmed = Unit(120, 100, have_gun=False)
+        self.map.update(1, [far, near, twin, dead, unarmed])
+        self.assertEqual(self.map.within(self.base, 100), [near, twin])
+        self.assertEqual(self.map.within(self.base, 1000), [near, twin, far])
+        # Безоружный ближе всех, при равных расстояниях - первый в списке
+        self.assertIs(self.map.nearest(self.base), unarmed)
+        unarmed.is_alive = False
+        self.assertIs(self.map.nearest(self.base), near)
+
+    def test_update_once_per_step(self) -> None:
+        enemies = [Unit(200, 100)]
+        self.map.update(1, enemies)
+        enemies[0].coord = Point(900, 900)
+        self.map.update(1, enemies)
+        self.assertEqual(self.map.danger_near(self.base), 1.0)
+
+        # Новый список врагов на том же шаге обновляет карту
+        self.map.update(1, list(enemies))
+        self.assertEqual(self.map.danger_near(self.base), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
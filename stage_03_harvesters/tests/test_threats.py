@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import unittest
+from unittest.mock import Mock
+
+from stage_03_harvesters.utils.threats import ThreatDetector
+
+
+def make_unit(x, y, direction=0.0, is_alive=True):
+    unit = Mock()
+    unit.x, unit.y = x, y
+    unit.direction = direction
+    unit.is_alive = is_alive
+    return unit
+
+
+class ThreatDetectorTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.detector = ThreatDetector(distance=40.0, angle=1.0)
+        self.source = make_unit(100, 100)
+        self.far_source = make_unit(500, 500)
+
+    def test_heading_in_degrees(self) -> None:
+        # Враг слева от источника и смотрит прямо на него
+        enemy = make_unit(70, 100, direction=0.0)
+        self.detector.update(1, [enemy], [self.source, self.far_source])
+        self.assertEqual(self.detector.heading(enemy), 0.0)
+        self.assertEqual(self.detector.approaching(enemy), {self.source})
+        self.assertTrue(self.detector.is_targeted(self.source))
+        self.assertFalse(self.detector.is_targeted(self.far_source))
+
+        # Отклонение в полградуса - всё ещё летит к источнику
+        enemy = make_unit(100, 70, direction=90.5)
+        self.detector.update(2, [enemy], [self.source])
+        self.assertTrue(self.detector.is_targeted(self.source))
+
+        # Отклонение в 5 градусов - уже нет
+        enemy = make_unit(100, 70, direction=95.0)
+        self.detector.update(3, [enemy], [self.source])
+        self.assertFalse(self.detector.is_targeted(self.source))
+
+    def test_angle_wraps_around(self) -> None:
+        enemy = make_unit(130, 100.2, direction=180.0)
+        self.detector.update(1, [enemy], [self.source])
+        self.assertTrue(self.detector.is_targeted(self.source))
+
+        enemy = make_unit(70, 100.2, direction=359.9)
+        self.detector.update(2, [enemy], [self.source])
+        self.assertTrue(self.detector.is_targeted(self.source))
+
+    def test_distance_and_liveness(self) -> None:
+        far_enemy = make_unit(20, 100, direction=0.0)
+        dead_enemy = make_unit(70, 100, direction=0.0, is_alive=False)
+        self.detector.update(1, [far_enemy, dead_enemy], [self.source])
+        self.assertFalse(self.detector.is_targeted(self.source))
+        self.assertIsNone(self.detector.heading(dead_enemy))
+
+    def test_update_once_per_step(self) -> None:
+        enemy = make_unit(70, 100, direction=0.0)
+        self.detector.update(1, [enemy], [self.source])
+        enemy.direction = 180.0
+        self.detector.update(1, [enemy], [self.source])
+        self.assertTrue(self.detector.is_targeted(self.source))
+        self.detector.update(2, [enemy], [self.source])
+        self.assertFalse(self.detector.is_targeted(self.source))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+import itertools
+import random
+import unittest
+
+from stage_03_harvesters.utils.tours import TourPlanner
+
+
+class TourPlannerTest(unittest.TestCase):
+
+    def test_fills_cargo_on_the_way(self) -> None:
+        # Two half-full sources on the way beat the full one far away
+        sources = [('far', 0, 1000, 100), ('a', 300, 0, 50), ('b', 600, 0, 50)]
+        planner = TourPlanner(max_stops=3)
+        self.assertEqual(planner.plan((0, 0), (900, 0), sources, 100), ['a', 'b'])
+        self.assertEqual(TourPlanner(max_stops=1).plan((0, 0), (900, 0), sources, 100), ['a'])
+
+    def test_first_stop(self) -> None:
+        sources = [('far', 0, 1000, 100), ('a', 300, 0, 50), ('b', 600, 0, 50)]
+        plan = TourPlanner(max_stops=3).plan((0, 0), (900, 0), sources, 100, first='far')
+        self.assertEqual(plan[0], 'far')
+        self.assertEqual(len(plan), 1)
+
+    def test_no_useless_stops(self) -> None:
+        sources = [('a', 300, 0, 100), ('b', 600, 0, 100), ('empty', 400, 0, 0)]
+        plan = TourPlanner(max_stops=3).plan((0, 0), (900, 0), sources, 100)
+        self.assertEqual(len(plan), 1)
+        self.assertEqual(TourPlanner().plan((0, 0), (900, 0), sources, 0), [])
+        self.assertEqual(TourPlanner().plan((0, 0), (900, 0), [], 100), [])
+
+    def test_close_to_best(self) -> None:
+        rnd = random.Random(1)
+        planner = TourPlanner(max_stops=3, time_budget=1.0)
+        for _ in range(20):
+            sources = [(i, rnd.uniform(0, 1200), rnd.uniform(0, 1200), rnd.randint(0, 100)) for i in range(10)]
+            by_key = {s[0]: s for s in sources}
+            start, base, capacity = (rnd.uniform(0, 1200), rnd.uniform(0, 1200)), (90, 90), 100
+            best = max(planner.score(start, base, capacity, list(tour))
+                       for n in range(1, 4) for tour in itertools.permutations(sources, n))
+            plan = planner.plan(start, base, sources, capacity)
+            score = planner.score(start, base, capacity, [by_key[k] for k in plan])
+            self.assertGreaterEqual(score, best * 0.9)
+
+    def test_time_budget(self) -> None:
+        # The budget bounds the improvement, a tour is still returned
+        rnd = random.Random(2)
+        sources = [(i, rnd.uniform(0, 1200), rnd.uniform(0, 1200), rnd.randint(1, 100)) for i in range(200)]
+        plan = TourPlanner(max_stops=4, time_budget=0.0).plan((0, 0), (90, 90), sources, 100)
+        self.assertEqual(len(plan), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+import multiprocessing
+import unittest
+from types import SimpleNamespace
+
+from stage_03_harvesters.reaper import ReaperStrategy
+from stage_03_harvesters.utils.worldstate import MAX_TEAMS, WorldState
+
+
+class Body:
+
+    def __init__(self, x, y, payload, team=None, is_alive=True):
+        self.coord = SimpleNamespace(x=x, y=y)
+        self.direction = 90.0
+        self.payload = payload
+        self.meter_2 = 1.0
+        self.is_alive = is_alive
+        self.team = team
+
+
+def read_in_worker(name, queue):
+    with WorldState(name=name) as world:
+        step, values = world.read(('x', 'payload', 'team'))
+        queue.put((step, values, world.capacity, world.teams))
+
+
+class WorldStateTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.asteroid = Body(10, 20, 100, is_alive=False)
+        self.mothership = Body(90, 90, 0, team='a')
+        self.drone = Body(100, 100, 50, team='a')
+        self.enemy = Body(1100, 1100, 0, team='b')
+        self.scene = SimpleNamespace(_step=1, asteroids=[self.asteroid], motherships=[self.mothership],
+                                     drones=[self.drone, self.enemy])
+        self.world = WorldState(capacity=8)
+
+    def tearDown(self) -> None:
+        self.world.close()
+
+    def test_sync(self) -> None:
+        self.world.sync(self.scene)
+        self.assertEqual(len(self.world), 4)
+        self.assertEqual(self.world.seq, 2)
+        step, values = self.world.read()
+        self.assertEqual(step, 1)
+        self.assertEqual(values['x'], [10, 90, 100, 1100])
+        self.assertEqual(values['is_alive'], [0, 1, 1, 1])
+        self.assertEqual(values['kind'], [0, 1, 2, 2])
+        self.assertEqual([self.world.teams[int(t)] for t in values['team']], [None, 'a', 'a', 'b'])
+        self.assertEqual(self.world.row(self.drone), 2)
+
+        # Once per step, in place
+        self.drone.payload = 100
+        self.world.sync(self.scene)
+        self.assertEqual(self.world.column('payload')[2], 50)
+        self.scene._step = 2
+        self.world.sync(self.scene)
+        self.assertEqual(self.world.column('payload')[2], 100)
+        self.assertEqual(self.world.seq, 4)
+
+    def test_torn_read(self) -> None:
+        self.world.sync(self.scene)
+        self.world._header[0] += 1
+        self.assertIsNone(self.world.read(retries=3))
+
+    def test_capacity(self) -> None:
+        self.scene.asteroids = [Body(i, i, 1) for i in range(8)]
+        with self.assertRaises(ValueError):
+            self.world.sync(self.scene)
+
+    def test_worker_process(self) -> None:
+        self.world.sync(self.scene)
+        queue = multiprocessing.Queue()
+        worker = multiprocessing.Process(target=read_in_worker, args=(self.world.name, queue))
+        worker.start()
+        step, values, capacity, teams = queue.get(timeout=30)
+        worker.join()
+        self.assertEqual((step, capacity), (1, 8))
+        self.assertEqual(values['payload'], [100, 0, 50, 0])
+        self.assertEqual(values['team'], [0, 1, 1, 2])
+        # Team ids are decoded by the table in the segment
+        self.assertEqual(teams, [None, 'a', 'b'])
+
+    def test_teams(self) -> None:
+        self.scene.asteroids = []
+        self.scene.drones = [Body(i, i, 0, team='team{}'.format(i)) for i in range(MAX_TEAMS - 1)]
+        self.world.sync(self.scene)
+        self.assertEqual(self.world.teams, [None, 'a'] + ['team{}'.format(i) for i in range(MAX_TEAMS - 1)])
+        with self.assertRaises(ValueError):
+            self.world.team_id('team{}'.format(MAX_TEAMS))
+        self.assertEqual(self.world.team_id('team0'), 2)
+
+    def test_tour_planner(self) -> None:
+        # The background tour planner reads the same values as the snapshot of the main process
+        rich = Body(300, 300, 200)
+        self.scene.asteroids.append(rich)
+        self.world.sync(self.scene)
+        sources = ((self.asteroid, 0, 20), (rich, 1, 50))
+        plan = ReaperStrategy.plan_tour_world(self.world, 3, 2, sources, 150, rich, 3)
+        expected = ReaperStrategy.plan_tour_snapshot((100, 100), (90, 90), ((self.asteroid, 10, 20, 80),
+                                                                            (rich, 300, 300, 150)), 150, rich, 3)
+        self.assertEqual(plan, expected)
+        self.world._header[0] += 1
+        self.assertIsNone(ReaperStrategy.plan_tour_world(self.world, 3, 2, sources, 150, rich, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
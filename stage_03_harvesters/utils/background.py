@@ -0,0 +1,108 @@
+import threading
+import weakref
+from collections import OrderedDict
+
+
+class BackgroundPlanner:
+    # Runs plan(*snapshot) in a worker thread, so the game loop never waits for planning.
+    # Snapshots must be immutable (tuples of numbers and opaque keys), only the latest request
+    # of every key is planned. The result is picked up on a later step, a result older than max_age
+    # steps or rejected by the caller's check is discarded. Age of applied plans is the staleness metric
+    _instances = weakref.WeakSet()
+
+    @classmethod
+    def close_all(cls):
+        # Stop the threads of every planner, when the process plays the next match
+        for planner in list(cls._instances):
+            planner.close()
+
+    def __init__(self, plan, max_age=50):
+        self._plan = plan
+        self._max_age = max_age
+        self._pending = OrderedDict()
+        self._results = {}
+        self._cond = threading.Condition()
+        self._thread = None
+        self._busy = False
+        self._closed = False
+        self.applied = 0
+        self.discarded = 0
+        self.failed = 0
+        self._age_total = 0
+        self._age_max = 0
+        BackgroundPlanner._instances.add(self)
+
+    def submit(self, key, step, *snapshot):
+        with self._cond:
+            if self._closed:
+                return
+            self._pending[key] = (step, snapshot)
+            self._pending.move_to_end(key)
+            self._results.pop(key, None)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='background-planner', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def take(self, key, step, is_valid=None):
+        with self._cond:
+            result = self._results.pop(key, None)
+        if result is None:
+            return None
+        plan_step, plan = result
+        age = step - plan_step
+        if plan is None or age > self._max_age or (is_valid is not None and not is_valid(plan)):
+            self.discarded += 1
+            return None
+        self.applied += 1
+        self._age_total += age
+        self._age_max = max(self._age_max, age)
+        return plan
+
+    def is_pending(self, key):
+        with self._cond:
+            return key in self._pending
+
+    @property
+    def stats(self):
+        return {
+            'applied': self.applied,
+            'discarded': self.discarded,
+            'failed': self.failed,
+            'mean_age': self._age_total / self.applied if self.applied else 0.0,
+            'max_age': self._age_max,
+        }
+
+    def wait(self, timeout=None):
+        # Block until every submitted snapshot is planned, for tests and shutdown only
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._pending.clear()
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if self._closed:
+                    return
+                key, (step, snapshot) = self._pending.popitem(last=False)
+                self._busy = True
+            try:
+                plan, failed = self._plan(*snapshot), False
+            except Exception:
+                plan, failed = None, True
+            with self._cond:
+                self.failed += failed
+                # A newer snapshot of the same key makes this plan useless
+                if key not in self._pending:
+                    self._results[key] = (step, plan)
+                self._busy = False
+                self._cond.notify_all()
@@ -1,11 +1,42 @@
+import heapq
+import math
 import sys
 
+from .distances import DistanceMatrix
+from .geometry import StaticGeometry
+
+# classic - the original search with the mean weight cutoff over a precomputed weight matrix
+# exact - plain Dijkstra, weights are computed on demand for expanded nodes only
+# astar - A* with Euclidean heuristic, same paths as exact
+MODES = ('classic', 'exact', 'astar')
+
 
 class Dijkstra:
-    def __init__(self, unit, points=None):
+    def __init__(self, unit, points=None, mode='classic'):
+        if mode not in MODES:
+            raise ValueError('mode must be one of {}'.format(MODES))
         self._unit = unit
+        self._mode = mode
         self._points = points if points else []
-        self._weights = [[0.0 for _ in range(len(self._points))] for _ in range(len(self._points))]
+        self._weights = self._empty_weights(len(self._points))
+        self._weight_func = self.weight_default_func
+        self._heuristic_scale = 1.0
+        self._expanded = 0
+
+    @property
+    def mode(self):
+        return self._mode
+
+    @property
+    def expanded(self):
+        # Nodes expanded by the last exact/astar search
+        return self._expanded
+
+    def _empty_weights(self, size):
+        if self._mode != 'classic':
+            # On demand weights, see weight()
+            return {}
+        return [[0.0 for _ in range(size)] for _ in range(size)]
 
     @staticmethod
     def maxint():
@@ -22,10 +53,11 @@ class Dijkstra:
     def _get_closest(self):
         if not self._unit.is_alive:
             return
+        distance = DistanceMatrix.for_turn(self._unit).distance
         uclosest = self._points[0]
-        dclosest = self._points[0].distance_to(self._unit)
+        dclosest = distance(self._unit, self._points[0])
         for u in self._points:
-            chkdist = self._unit.distance_to(u)
+            chkdist = distance(self._unit, u)
             if chkdist < dclosest:
                 dclosest = chkdist
                 uclosest = u
@@ -39,22 +71,29 @@ class Dijkstra:
         units = units + [m for m in self._unit.scene.motherships if
                          not m.is_alive and m.team != self._unit.team and func(m)]
         units = units + [d for d in self._unit.scene.drones if not d.is_alive and func(d)]
-        weights = [[0.0 for _ in range(len(units))] for _ in range(len(units))]
-
-        self._weights, self._points = weights, units
+        self._weights, self._points = self._empty_weights(len(units)), units
         self._unit._path_closest = self._get_closest()
 
     def to_objects(self, indexes):
         return [self._points[n] for n in indexes]
 
     def weight_default_func(self, a, b):
-        return float(a.distance_to(b))
+        return float(StaticGeometry.for_scene(self._unit.scene).distance(a, b))
 
-    def calc_weights(self, func=None):
+    def calc_weights(self, func=None, heuristic_scale=None):
+        # heuristic_scale is a lower bound of weight(a, b) / distance(a, b) for func, it makes
+        # the astar heuristic admissible. Unknown bound for a custom func means no heuristic (exact search)
         if not self._unit.is_alive:
             return
         if func is None:
             func = self.weight_default_func
+            if heuristic_scale is None:
+                heuristic_scale = 1.0
+        if self._mode != 'classic':
+            self._weights = {}
+            self._weight_func = func
+            self._heuristic_scale = heuristic_scale or 0.0
+            return
         dump = []
         for f, a in enumerate(self._points):
             def map_func(t, b):
@@ -86,6 +125,11 @@ class Dijkstra:
                 return self.to_objects([fi, ])
             else:
                 return [fi, ]
+        if self._mode != 'classic':
+            path = self._search(fi, fo, self._heuristic_scale if self._mode == 'astar' else 0.0)
+            if path is None or not as_objects:
+                return path
+            return self.to_objects(path)
 
         visited = []
         unvisited = [k for k, _ in enumerate(self._points)]
@@ -152,3 +196,105 @@ class Dijkstra:
             return self.to_objects(path)
         else:
             return path
+
+    def weight(self, f, t):
+        if self._mode == 'classic':
+            return self._weights[f][t]
+        if f == t:
+            return 0.0
+        key = (f, t)
+        w = self._weights.get(key)
+        if w is None:
+            w = self._weights[key] = float(self._weight_func(self._points[f], self._points[t]))
+        return w
+
+    def shortest_path_tree(self, pt_from):
+        # Exact shortest paths from pt_from to every point, see PathTree
+        if not self._unit.is_alive:
+            return
+        return PathTree(self._points, self._points.index(pt_from), self.weight)
+
+    def _search(self, fi, fo, scale):
+        # A* with Euclidean heuristic, scale == 0 turns it into Dijkstra
+        points = self._points
+        tx, ty = points[fo].x, points[fo].y
+
+        def heuristic(n):
+            return scale * math.hypot(points[n].x - tx, points[n].y - ty)
+
+        prev = {}
+        self._expanded = 0
+        for node in settle(self.weight, len(points), fi, prev, heuristic if scale else None):
+            if node == fo:
+                return unwind(prev, fo)
+            self._expanded += 1
+        return None
+
+
+def settle(weight, size, root, prev, heuristic=None):
+    # Generator of nodes of the complete graph in the order they are settled, prev gets
+    # the predecessor links. Heap entries are ordered by (estimate, cost, index) to keep the search deterministic
+    inf = float("inf")
+    cost = {root: 0.0}
+    prev[root] = -1
+    closed = set()
+    heap = [(heuristic(root) if heuristic else 0.0, 0.0, root)]
+    while heap:
+        _, g, node = heapq.heappop(heap)
+        if node in closed:
+            continue
+        closed.add(node)
+        yield node
+        for nb in range(size):
+            if nb == node or nb in closed:
+                continue
+            w = weight(node, nb)
+            if w == inf:
+                continue
+            ng = g + w
+            if ng < cost.get(nb, inf):
+                cost[nb] = ng
+                prev[nb] = node
+                heapq.heappush(heap, (ng + heuristic(nb) if heuristic else ng, ng, nb))
+
+
+def unwind(prev, node):
+    # Path from the search root to node by the predecessor links
+    path = []
+    while node > -1:
+        path.append(node)
+        node = prev[node]
+    path.reverse()
+    return path
+
+
+class PathTree:
+    # Shortest path tree from the root. It grows lazily: the search stops as soon as the asked point
+    # is settled and resumes on the next request, a path to a settled point is extracted in O(path length)
+    def __init__(self, points, root, weight):
+        self._points = list(points)
+        self._index = {p: n for n, p in enumerate(self._points)}
+        self._prev = {}
+        self._settled = set()
+        self._search = settle(weight, len(self._points), root, self._prev)
+
+    @property
+    def points(self):
+        return self._points
+
+    def _settle(self, n):
+        while n not in self._settled:
+            node = next(self._search, None)
+            if node is None:
+                return False
+            self._settled.add(node)
+        return True
+
+    def path_to(self, point, as_objects=True):
+        n = self._index.get(point)
+        if n is None or not self._settle(n):
+            return None
+        path = unwind(self._prev, n)
+        if not as_objects:
+            return path
+        return [self._points[i] for i in path]
@@ -0,0 +1,103 @@
+import math
+
+
+class DistanceMatrix:
+    # Distances between the asteroids, motherships and drones of the scene, shared by all the teams.
+    # The engine moves the objects one by one during a game step, and team code runs in the turn of one drone
+    # (its events and commands), when nothing moves. So the matrix is valid for one turn: the rows are filled
+    # lazily, cell by cell, and dropped when the turn changes (next step, another drone, or the drone moved).
+    # Distances are computed exactly like Point.distance_to, the answers are the same to the last bit.
+    # Points and objects that are not in the matrix (projectiles) are measured directly
+    _matrices = {}
+
+    @classmethod
+    def for_scene(cls, scene):
+        if scene not in cls._matrices:
+            cls._matrices[scene] = DistanceMatrix(scene)
+        return cls._matrices[scene]
+
+    @classmethod
+    def for_turn(cls, drone):
+        return cls.for_scene(drone.scene).turn(drone)
+
+    def __init__(self, scene):
+        self._scene = scene
+        self._objects = []
+        self._index = {}
+        self._rows = {}
+        self._foreign = set()
+        self._turn = None
+        self._register()
+
+    def _register(self):
+        scene = self._scene
+        for objects in (scene.asteroids, scene.motherships, scene.drones):
+            for obj in objects:
+                if obj not in self._index:
+                    self._index[obj] = len(self._objects)
+                    self._objects.append(obj)
+        self._rows.clear()
+
+    def _known(self, obj):
+        # An object born after the matrix is registered on the first query, others are remembered as foreign
+        if obj in self._foreign or not hasattr(obj, 'coord'):
+            return False
+        self._register()
+        if obj in self._index:
+            return True
+        self._foreign.add(obj)
+        return False
+
+    @property
+    def objects(self):
+        return list(self._objects)
+
+    def turn(self, drone):
+        coord = drone.coord
+        turn = (self._scene._step, drone, coord.x, coord.y)
+        if turn != self._turn:
+            self._turn = turn
+            self._rows.clear()
+        return self
+
+    def _row(self, obj):
+        row = self._rows.get(obj)
+        if row is None:
+            if obj not in self._index and not self._known(obj):
+                return None
+            row = self._rows[obj] = [None] * len(self._objects)
+        return row
+
+    def distance(self, a, b):
+        row = self._row(a)
+        j = self._index.get(b)
+        if j is None and row is not None and self._known(b):
+            row = self._row(a)
+            j = self._index[b]
+        if row is None or j is None:
+            a, b = getattr(a, 'coord', a), getattr(b, 'coord', b)
+            return math.sqrt((a.x - b.x) ** 2 + (a.y - b.y) ** 2)
+        value = row[j]
+        if value is None:
+            ac, bc = a.coord, b.coord
+            value = row[j] = math.sqrt((ac.x - bc.x) ** 2 + (ac.y - bc.y) ** 2)
+        return value
+
+    def row(self, obj):
+        # Distances from obj to every object of the matrix, in the order of objects
+        distance = self.distance
+        return [distance(obj, other) for other in self._objects]
+
+    def order(self, obj, objects):
+        # Objects sorted by distance from obj, equal distances keep their order
+        distance = self.distance
+        return sorted(objects, key=lambda other: distance(obj, other))
+
+    def nearest(self, obj, objects):
+        distance = self.distance
+        best, best_distance = None, None
+        for other in objects:
+            value = distance(obj, other)
+            if best is None or value < best_distance:
+                best, best_distance = other, value
+        return best
@@ -0,0 +1,63 @@
+import math
+
+
+class StaticGeometry:
+    # Distances between the objects that never move, asteroids and motherships, shared by all the teams.
+    # The table is built once per match on the first request (the drones ask at birth), an object born later
+    # rebuilds it on the first query. Other objects are measured directly. All the distances are computed
+    # like Point.distance_to, the answers are the same to the last bit.
+    # Neighbours of an object are the asteroids sorted by distance from it, equal distances keep the scene order
+    _tables = {}
+
+    @classmethod
+    def for_scene(cls, scene):
+        if scene not in cls._tables:
+            cls._tables[scene] = StaticGeometry(scene)
+        return cls._tables[scene]
+
+    def __init__(self, scene):
+        self._scene = scene
+        self._foreign = set()
+        self._build()
+
+    def _build(self):
+        scene = self._scene
+        self._asteroids = list(scene.asteroids)
+        self._objects = self._asteroids + list(scene.motherships)
+        self._index = {obj: i for i, obj in enumerate(self._objects)}
+        self._size = len(self._objects)
+        coords = [(obj.coord.x, obj.coord.y) for obj in self._objects]
+        self._table = [math.sqrt((ax - bx) ** 2 + (ay - by) ** 2) for ax, ay in coords for bx, by in coords]
+        self._neighbours = {}
+
+    def _known(self, obj):
+        if obj in self._foreign or not hasattr(obj, 'coord'):
+            return False
+        self._build()
+        if obj in self._index:
+            return True
+        self._foreign.add(obj)
+        return False
+
+    @property
+    def objects(self):
+        return list(self._objects)
+
+    def distance(self, a, b):
+        index = self._index
+        i, j = index.get(a), index.get(b)
+        if i is None or j is None:
+            if (i is None and self._known(a)) or (j is None and self._known(b)):
+                return self.distance(a, b)
+            a, b = getattr(a, 'coord', a), getattr(b, 'coord', b)
+            return math.sqrt((a.x - b.x) ** 2 + (a.y - b.y) ** 2)
+        return self._table[i * self._size + j]
+
+    def neighbours(self, obj):
+        neighbours = self._neighbours.get(obj)
+        if neighbours is None:
+            distance = self.distance
+            neighbours = tuple(sorted(self._asteroids, key=lambda asteroid: distance(obj, asteroid)))
+            if obj in self._index:
+                self._neighbours[obj] = neighbours
+        return neighbours
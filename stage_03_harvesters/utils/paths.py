@@ -0,0 +1,55 @@
+from collections import OrderedDict
+
+
+class GraphVersion:
+    # Version of the pathfinding graph. It is bumped only when the state of some node (payload, liveness)
+    # changed, the state is compared once per game step
+    def __init__(self):
+        self._step = None
+        self._state = None
+        self._version = 0
+
+    @property
+    def step(self):
+        return self._step
+
+    @property
+    def version(self):
+        return self._version
+
+    def sync(self, step, state):
+        if step == self._step:
+            return
+        self._step = step
+        if state != self._state:
+            self._state = state
+            self._version += 1
+
+
+class PathCache:
+    # LRU cache of found paths keyed by (source, target, graph version),
+    # teammates asking the same question in the same game step share one search
+    def __init__(self, graph, size=128):
+        self._graph = graph
+        self._size = size
+        self._paths = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._paths)
+
+    def get(self, source, target, find):
+        key = (source, target, self._graph.version)
+        if key in self._paths:
+            self._paths.move_to_end(key)
+            self.hits += 1
+            return self._paths[key]
+        self.misses += 1
+        path = self._paths[key] = find(source, target)
+        if len(self._paths) > self._size:
+            self._paths.popitem(last=False)
+        return path
+
+    def clear(self):
+        self._paths.clear()
@@ -0,0 +1,67 @@
+from astrobox.core import Asteroid, Drone, MotherShip
+
+
+class ObjectRegistry:
+    # Objects of the scene sorted by kind once at birth. Alive units are checked once per game step
+    # and moved to the dead collections. Asteroids are all kept: an empty one can be refilled by an unloading
+    # drone, so callers filter them by payload.
+    # Dicts are used as ordered sets to keep iteration order stable between runs
+    _registries = {}
+
+    @classmethod
+    def for_scene(cls, scene):
+        if scene not in cls._registries:
+            cls._registries[scene] = ObjectRegistry(scene)
+        return cls._registries[scene]
+
+    def __init__(self, scene):
+        self._scene = scene
+        self._step = None
+        self._known = set()
+        self._asteroids = {}
+        self._drones = {}
+        self._motherships = {}
+        self._dead_drones = {}
+        self._dead_motherships = {}
+        for obj in scene.objects:
+            self.register(obj)
+
+    def register(self, obj):
+        if obj in self._known:
+            return
+        if isinstance(obj, Asteroid):
+            self._asteroids[obj] = None
+        elif isinstance(obj, Drone):
+            (self._drones if obj.is_alive else self._dead_drones)[obj] = None
+        elif isinstance(obj, MotherShip):
+            (self._motherships if obj.is_alive else self._dead_motherships)[obj] = None
+        else:
+            return
+        self._known.add(obj)
+
+    def sync(self):
+        step = self._scene._step
+        if step == self._step:
+            return
+        self._step = step
+        for d in [d for d in self._drones if not d.is_alive]:
+            del self._drones[d]
+            self._dead_drones[d] = None
+        for m in [m for m in self._motherships if not m.is_alive]:
+            del self._motherships[m]
+            self._dead_motherships[m] = None
+
+    @property
+    def asteroids(self):
+        self.sync()
+        return self._asteroids.keys()
+
+    @property
+    def dead_drones(self):
+        self.sync()
+        return self._dead_drones.keys()
+
+    @property
+    def dead_motherships(self):
+        self.sync()
+        return self._dead_motherships.keys()
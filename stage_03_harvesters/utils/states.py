@@ -6,14 +6,32 @@ from astrobox.cargo import CargoTransition
 from robogame_engine.geometry import Point, Vector
 from robogame_engine.theme import theme
 
+# Fullness to stop harvesting at the beginning of the game and after it
+HARVEST_EARLY_STEPS = 250
+HARVEST_EARLY_FULLNESS = 0.75
+HARVEST_LATE_FULLNESS = 0.99
+# Sources visited per harvest trip, 1 returns to unload after every source
+HARVEST_TOUR_STOPS = 1
+# Plan tours in the team planner thread, the drone picks the tour up on a later step
+HARVEST_TOUR_BACKGROUND = False
+
+RNG = random
+TEAM_RNG = {}
+
 
 def get_point_on_way_to(unit, target, at_distance=None):
+    # The point at_distance short of the target on the straight way from the unit.
+    # Computed on plain floats, only the resulting Point is allocated
     if at_distance is None:
         at_distance = theme.CARGO_TRANSITION_DISTANCE * 0.9
-    va = Vector.from_points(unit.coord, target.coord)
-    vb = Vector.from_direction(va.direction, at_distance)
-    vb.rotate(180.0)
-    return Point(unit.x + va.x + vb.x, unit.y + va.y + vb.y)
+    x, y = unit.coord.x, unit.coord.y
+    dx, dy = float(target.coord.x - x), float(target.coord.y - y)
+    distance = math.sqrt(dx * dx + dy * dy)
+    if distance == 0:
+        # Same as the engine: a zero vector points at 90 degrees
+        return Point(x, y - at_distance)
+    k = 1.0 - at_distance / distance
+    return Point(x + dx * k, y + dy * k)
 
 
 class DroneState(object):
@@ -67,7 +85,7 @@ class DroneStateIdle(DroneState):
         #         and self.unit.distance_to(self.unit.mothership) > theme.MOTHERSHIP_HEALING_DISTANCE:
         #     return DroneStateRunout
         has_sources, sources = self.sources()
-        k = 0.75 if self.strategy._stepnum < 250 else 0.99
+        k = HARVEST_EARLY_FULLNESS if self.strategy._stepnum < HARVEST_EARLY_STEPS else HARVEST_LATE_FULLNESS
         if self.unit.cargo.fullness < k:
             if has_sources:
                 return DroneStateHarvest
@@ -88,12 +106,7 @@ class DroneStateUnload(DroneState):
     def has_any_enemy_going_harvest(self):
         if not self._target_point:
             return False
-        enemy_drones = [d for d in self.unit.scene.drones if d.team != self.unit.team and d.is_alive and
-                        d.distance_to(self._target) < theme.CARGO_TRANSITION_DISTANCE * 4.0 and
-                        math.fabs(d.direction - Vector.from_points(
-                            d.coord, self._target.coord.copy()
-                        ).direction) < (math.pi / 180.0)]  # 1 degree
-        return len(enemy_drones) > 0
+        return self.strategy.threats.is_targeted(self._target)
 
     def make_transition(self):
         # if self.unit.health < 0.6 and self.unit.distance_to(self.unit.mothership) > theme.MOTHERSHIP_HEALING_DISTANCE:
@@ -116,7 +129,7 @@ class DroneStateUnload(DroneState):
             self._target = target
             self._target_point = get_point_on_way_to(self.unit, target, theme.CARGO_TRANSITION_DISTANCE * 0.9)
             self._target_cargo = target.cargo
-            self.strategy.data._targets[self.unit.id] = self._target_point
+            self.strategy.data._targets.release(self.unit)
             self.unit.move_at(self._target_point)
         if self._transition:
             self._transition.game_step()
@@ -138,16 +151,6 @@ class DroneStateHarvest(DroneState):
     def make_transition(self):
         if self.unit.cargo.is_full:
             return DroneStateUnload
-        if self._target:
-            hglob = [self.strategy.data._drones[t] for t in self.strategy.data._targets
-                     if self.strategy.data._targets[t] == self._target]
-            if len(hglob) > 1:
-                hglob.sort(key=lambda u: u.fullness)
-                reqsz = self._target_cargo.payload
-                for n, h in enumerate(hglob):
-                    reqsz = reqsz - self.unit.cargo.free_space
-                    if reqsz < 0:
-                        return DroneStateIdle
         if self._target_cargo and self._target_cargo.fullness == 0.0:
             return DroneStateIdle
         if self._transition and self._transition.is_finished:
@@ -162,7 +165,6 @@ class DroneStateHarvest(DroneState):
 
     def game_step(self):
         super(DroneStateHarvest, self).game_step()
-        # TODO: harvest any possible targets on the way to self._target
         if self._transition:
             self._transition.game_step()
             target = self.strategy.get_unload_target()
@@ -171,12 +173,12 @@ class DroneStateHarvest(DroneState):
             else:
                 self.unit.turn_to(self.unit.mothership)
         if self._target is None:
-            target = self.strategy.get_harvest_target()
+            target = self.strategy.next_harvest_target(HARVEST_TOUR_STOPS, HARVEST_TOUR_BACKGROUND)
             if target is not None:
                 self._target = get_point_on_way_to(self.unit, target, theme.CARGO_TRANSITION_DISTANCE * 0.9)
                 self._target_cargo = target.cargo
                 self.unit.move_at(self._target.copy())
-                self.strategy.data._targets[self.unit.id] = target
+                self.strategy.data._targets.assign(self.unit, target, self.unit.cargo.free_space)
             elif self._transition is not None:
                 return
         if self._transition is None and self._target and int(self.unit.distance_to(self._target)) <= 1:
@@ -202,7 +204,7 @@ class DroneStateRunout(DroneState):
         super(DroneStateRunout, self).__init__(strategy)
         self._target = None
         self._directions = [-25, 25]
-        random.shuffle(self._directions)
+        TEAM_RNG.get(self.unit.team, RNG).shuffle(self._directions)
 
     def make_transition(self):
         # if self.unit.health > 0.75:
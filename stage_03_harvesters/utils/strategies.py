@@ -1,19 +1,28 @@
 # -*- coding: utf-8 -*-
 
+import heapq
 import random
+import time
 
 from robogame_engine.theme import theme
 
 from astrobox.cargo import CargoTransition
-from astrobox.core import Drone, Unit, MotherShip
+from astrobox.core import Drone, MotherShip
+
+from .distances import DistanceMatrix
+from .registry import ObjectRegistry
+
+RNG = random
+TEAM_RNG = {}
 
 
 class Strategy(object):
-    def __init__(self, unit=None, id=None, group=None, is_group_unique=False):
+    def __init__(self, unit=None, id=None, group=None, is_group_unique=False, priority=0):
         self.__unit = unit
         self.__id = id
         self.__group = group
         self.__group_unique = is_group_unique
+        self.__priority = priority
 
     @property
     def unit(self):
@@ -31,6 +40,10 @@ class Strategy(object):
     def is_group_unique(self):
         return self.__group_unique
 
+    @property
+    def priority(self):
+        return self.__priority
+
     def reset(self):
         pass
 
@@ -112,22 +125,22 @@ class StrategySequence(Strategy):
     def __init__(self, *strategies, **kwargs):
         super(StrategySequence, self).__init__(**kwargs)
         self.__strategies = strategies
+        self.__cursor = 0
         self.__current_strategy = self.__strategies[0]
 
     def _next_strategy(self):
         if self.__current_strategy is None:
             return False
-        strategy_id = self.__strategies.index(self.__current_strategy)
-        if strategy_id < 0 or strategy_id + 1 >= len(self.__strategies):
+        self.__cursor += 1
+        if self.__cursor >= len(self.__strategies):
             self.__current_strategy = None
             return False
-        self.__current_strategy = self.__strategies[strategy_id + 1]
+        self.__current_strategy = self.__strategies[self.__cursor]
         return True
 
     def __str__(self):
         strout = "{} {} {}(".format(self.__class__.__name__, self.unit.__class__.__name__, self.unit)
-        for s in self.__strategies:
-            strout += ("{}" if self.__strategies.index(s) == 0 else ", {}").format(str(s))
+        strout += ", ".join(str(s) for s in self.__strategies)
         return strout + ")"
 
     @property
@@ -178,7 +191,7 @@ class StrategyHarvesting(Strategy):
         assert hasattr(unit, 'elerium_stock')
 
     def anyAsteroid(self):
-        return random.choice(self.unit.scene.asteroids)
+        return TEAM_RNG.get(self.unit.team, RNG).choice(self.unit.scene.asteroids)
 
     def reset(self):
         self.__substrategy = None
@@ -190,8 +203,9 @@ class StrategyHarvesting(Strategy):
         return ""
 
     def get_nearest_elerium_stock(self):
-        elerium_stocks = [asteriod for asteriod in self.unit.scene.asteroids if asteriod.cargo.payload > 0]
-        elerium_stocks += [drone for drone in self.unit.scene.drones if not drone.is_alive and drone.cargo.payload > 0]
+        # Мёртвые базы тоже в запасах, но собираем только с астероидов и мёртвых дронов
+        elerium_stocks = [stock for stock in self.unit.elerium_stocks
+                          if stock.cargo.payload > 0 and not isinstance(stock, MotherShip)]
         for drone in self.unit.teammates:
             if drone.elerium_stock is not None and \
                     not drone.cargo.is_full and \
@@ -259,11 +273,7 @@ class StrategyHunting(Strategy):
         for mate in self._hunters:
             if hunter != mate and mate.victim is not None and mate.victim in enemies:
                 enemies.remove(mate.victim)
-        victim = None
-        for enemy in enemies:
-            if victim is None or hunter.distance_to(enemy) < hunter.distance_to(victim):
-                victim = enemy
-        return victim
+        return DistanceMatrix.for_turn(hunter).nearest(hunter, enemies)
 
     def game_step(self, hunter):
         if not hasattr(hunter, 'substrategy') or hunter.substrategy is None:
@@ -294,18 +304,19 @@ class StrategyHunting(Strategy):
 
         # Выберем ближашего свободного союзника
         victim = None
+        distance = DistanceMatrix.for_turn(hunter).distance
         while True:
             victim = self.get_victim(hunter)
             if victim is None:
                 break
-            victim_distance = victim.distance_to(hunter)
+            victim_distance = distance(victim, hunter)
             closertm = [mate for mate in hunter.teammates if
-                        mate.victim is None and mate.distance_to(victim) < victim_distance]
+                        mate.victim is None and distance(mate, victim) < victim_distance]
             closertm = [mate for mate in closertm if mate._next_victim is None and not mate.is_unloading]
             if not closertm:
                 # нет никого свобожного ближе
                 break
-            closertm = sorted(closertm, key=lambda x: x.distance_to(victim))
+            closertm = sorted(closertm, key=lambda x: distance(x, victim))
             closertm[0]._next_victim = victim
             victim = None
         is_new_victim = victim is not None and hunter.victim != victim
@@ -375,43 +386,124 @@ class StrategyDestroyer(Strategy):
             self.__done = True
 
 
+class StrategyTiming(object):
+    def __init__(self):
+        self.steps = 0
+        self.total = 0.0
+        self.worst = 0.0
+
+    @property
+    def mean(self):
+        return self.total / self.steps if self.steps else 0.0
+
+    def add(self, elapsed):
+        self.steps += 1
+        self.total += elapsed
+        if elapsed > self.worst:
+            self.worst = elapsed
+
+
+class StrategyScheduler(object):
+    # Strategies with higher priority go first, equal priorities keep the order of appending.
+    # Removed strategies stay in the heap marked as dead and are dropped when they reach the top
+    def __init__(self):
+        self.__queue = []
+        self.__entries = {}
+        self.__groups = {}
+        self.__order = 0
+        self.__timings = {}
+
+    def __len__(self):
+        return len(self.__entries)
+
+    @property
+    def timings(self):
+        return self.__timings
+
+    @property
+    def current(self):
+        while self.__queue and self.__queue[0][2] is None:
+            heapq.heappop(self.__queue)
+        return self.__queue[0][2] if self.__queue else None
+
+    def append(self, strategy):
+        if strategy.is_group_unique:
+            for s in list(self.__groups.get(strategy.group, ())):
+                self.remove(s)
+        entry = [-strategy.priority, self.__order, strategy]
+        self.__order += 1
+        self.__entries[strategy] = entry
+        self.__groups.setdefault(strategy.group, []).append(strategy)
+        heapq.heappush(self.__queue, entry)
+
+    def remove(self, strategy):
+        entry = self.__entries.pop(strategy, None)
+        if entry is None:
+            return
+        entry[2] = None
+        group = self.__groups[strategy.group]
+        group.remove(strategy)
+        if not group:
+            del self.__groups[strategy.group]
+
+    def clear(self):
+        self.__queue = []
+        self.__entries = {}
+        self.__groups = {}
+
+    def game_step(self):
+        while True:
+            strategy = self.current
+            if strategy is None:
+                return
+            if strategy.is_finished:
+                self.remove(strategy)
+                continue
+            started = time.perf_counter()
+            strategy.game_step()
+            key = strategy.id if strategy.id is not None else strategy.__class__.__name__
+            if key not in self.__timings:
+                self.__timings[key] = StrategyTiming()
+            self.__timings[key].add(time.perf_counter() - started)
+            return
+
+
 class DroneUnitWithStrategies(Drone):
 
     def __init__(self, *args, **kwargs):
         super(DroneUnitWithStrategies, self).__init__(**kwargs)
-        self.__strategies = []
+        self.__strategies = StrategyScheduler()
 
     @property
     def current_strategy(self):
-        return self.__strategies[0] if not self.is_strategy_finished() else None
+        return self.__strategies.current
+
+    @property
+    def strategy_timings(self):
+        return self.__strategies.timings
 
     def append_strategy(self, strategy):
-        if strategy.is_group_unique:
-            for s in self.__strategies:
-                if s.group == strategy.group:
-                    self.__strategies.remove(s)
         self.__strategies.append(strategy)
 
     def clear_strategies(self):
-        self.__strategies = []
+        self.__strategies.clear()
 
     def is_strategy_finished(self):
         return len(self.__strategies) == 0
 
     def game_step(self):
         self.native_game_step()
-        for s in self.__strategies:
-            if s.is_finished:
-                self.__strategies.remove(s)
-                continue
-            s.game_step()
-            break
+        self.__strategies.game_step()
+
+    def on_born(self):
+        super(DroneUnitWithStrategies, self).on_born()
+        ObjectRegistry.for_scene(self.scene).register(self)
 
     # @brief elerium_stocks возвращает все объекты мира из которых можно добывать ресурсы
     @property
     def elerium_stocks(self):
-        return [es for es in self.scene.get_objects_by_type(Unit) if hasattr(es, 'cargo') and
-                (not es.is_alive if issubclass(es.__class__, tuple([DroneUnitWithStrategies, MotherShip])) else True)]
+        registry = ObjectRegistry.for_scene(self.scene)
+        return list(registry.asteroids) + list(registry.dead_drones) + list(registry.dead_motherships)
 
     # Позволяет обращаться к чистому обработчику из стратегий
     def native_game_step(self):
@@ -0,0 +1,56 @@
+class TargetIndex:
+    # Bidirectional drone <-> source index with reserved cargo accounting.
+    # Every drone holds at most one claim, a claim reserves part of the source payload
+    def __init__(self):
+        self._by_drone = {}
+        self._by_target = {}
+        self._claims = {}
+        self._reserved = {}
+
+    def assign(self, drone, target, amount=0):
+        self.release(drone)
+        if target is None:
+            return
+        self._by_drone[drone] = target
+        self._by_target.setdefault(target, set()).add(drone)
+        self._claims[drone] = amount
+        self._reserved[target] = self._reserved.get(target, 0) + amount
+
+    def release(self, drone):
+        target = self._by_drone.pop(drone, None)
+        if target is None:
+            return
+        amount = self._claims.pop(drone, 0)
+        drones = self._by_target[target]
+        drones.discard(drone)
+        if drones:
+            self._reserved[target] -= amount
+        else:
+            del self._by_target[target]
+            del self._reserved[target]
+
+    def clear(self):
+        self._by_drone.clear()
+        self._by_target.clear()
+        self._claims.clear()
+        self._reserved.clear()
+
+    def target_of(self, drone):
+        return self._by_drone.get(drone)
+
+    def drones_of(self, target):
+        return self._by_target.get(target, frozenset())
+
+    def is_claimed(self, target):
+        return target in self._by_target
+
+    def reserved(self, target):
+        return self._reserved.get(target, 0)
+
+    def is_oversubscribed(self, target, payload=None):
+        if payload is None:
+            payload = target.cargo.payload
+        return self._reserved.get(target, 0) >= payload
+
+    def __len__(self):
+        return len(self._by_drone)
@@ -0,0 +1,145 @@
+import math
+from array import array
+
+from robogame_engine.theme import theme
+
+
+def firepower(drone):
+    return 1.0 if drone.have_gun else 0.0
+
+
+class ThreatMap:
+    # Coarse grid over the field: every cell holds the summed weight (firepower by default) of the enemies
+    # that may reach it, i.e. the enemies within `reach` of some point of the cell.
+    # The update is once per game step and only notes the enemies that changed their cell, appeared or died.
+    # The grid follows on the next danger lookup: the old footprints of those enemies are subtracted
+    # and the new ones added, so a map nobody asks about danger costs nothing but the cell bookkeeping.
+    # Lookups are a single cell read, distance queries go over the living enemies only,
+    # in the order they were given on the update.
+    # Enemies keep moving and dying during the step after the update: footprints get `slack` (one step of
+    # the fastest enemy) and the queries check liveness and measure distances at the moment of the call.
+    # A scene built without a field size (scene.field is None) plays on the field of the theme
+    def __init__(self, field, reach, cell=100.0, weight=firepower, slack=10.0):
+        if field is None:
+            field = (theme.FIELD_WIDTH, theme.FIELD_HEIGHT)
+        self._cell = float(cell)
+        self._reach = float(reach)
+        self._weight = weight
+        self._nx = max(1, int(math.ceil(field[0] / self._cell)))
+        self._ny = max(1, int(math.ceil(field[1] / self._cell)))
+        self._danger = array('d', [0.0]) * (self._nx * self._ny)
+        # Cell offsets whose closest points are within reach (plus the slack) of the cell
+        limit = self._reach + slack
+        k = int(math.ceil(limit / self._cell)) + 1
+        self._footprint = [(dx, dy) for dx in range(-k, k + 1) for dy in range(-k, k + 1)
+                           if math.hypot(max(0, abs(dx) - 1), max(0, abs(dy) - 1)) * self._cell <= limit]
+        # enemy -> [cell, weight, cell of the footprint in the grid or None]
+        self._tracked = {}
+        self._dirty = set()
+        self._enemies = []
+        self._step = None
+        self._source = None
+
+    @property
+    def step(self):
+        return self._step
+
+    @property
+    def enemies(self):
+        return list(self._enemies)
+
+    def __len__(self):
+        return sum(1 for enemy in self._enemies if enemy.is_alive)
+
+    def cell_of(self, x, y):
+        ix = min(max(int(x // self._cell), 0), self._nx - 1)
+        iy = min(max(int(y // self._cell), 0), self._ny - 1)
+        return ix, iy
+
+    def _spread(self, cell, weight):
+        if not weight:
+            return
+        cx, cy = cell
+        nx, ny, danger = self._nx, self._ny, self._danger
+        for dx, dy in self._footprint:
+            ix, iy = cx + dx, cy + dy
+            if 0 <= ix < nx and 0 <= iy < ny:
+                danger[iy * nx + ix] += weight
+
+    def update(self, step, enemies):
+        # Teammates calling it on the same step with the same enemies list share the update
+        if step == self._step and enemies is self._source:
+            return
+        self._step, self._source = step, enemies
+        tracked, dirty, alive = self._tracked, self._dirty, []
+        size, nx, ny = self._cell, self._nx - 1, self._ny - 1
+        for enemy in enemies:
+            if not enemy.is_alive:
+                continue
+            alive.append(enemy)
+            coord = enemy.coord
+            cell = (min(max(int(coord.x // size), 0), nx), min(max(int(coord.y // size), 0), ny))
+            state = tracked.get(enemy)
+            if state is None:
+                tracked[enemy] = [cell, self._weight(enemy), None]
+                dirty.add(enemy)
+            elif state[0] != cell:
+                state[0] = cell
+                dirty.add(enemy)
+        if len(alive) != len(tracked):
+            living = set(alive)
+            for enemy in [enemy for enemy in tracked if enemy not in living]:
+                state = tracked.pop(enemy)
+                dirty.discard(enemy)
+                if state[2] is not None:
+                    self._spread(state[2], -state[1])
+        self._enemies = alive
+
+    def _refresh(self):
+        tracked = self._tracked
+        for enemy in self._dirty:
+            state = tracked[enemy]
+            if state[2] is not None:
+                self._spread(state[2], -state[1])
+            self._spread(state[0], state[1])
+            state[2] = state[0]
+        self._dirty.clear()
+
+    def danger_at(self, x, y):
+        # Upper bound: all the enemies within reach of the point are counted, plus some up to a cell further.
+        # Zero means nobody can reach the point
+        if self._dirty:
+            self._refresh()
+        ix, iy = self.cell_of(x, y)
+        return self._danger[iy * self._nx + ix]
+
+    def danger_near(self, obj):
+        return self.danger_at(obj.x, obj.y)
+
+    def within(self, origin, radius, distance=None):
+        # Enemies with nonzero weight closer than radius to the origin, nearest first.
+        # Within reach an empty cell answers without looking at the enemies.
+        # distance(a, b) replaces a.distance_to(b), e.g. DistanceMatrix.distance
+        if radius <= self._reach and not self.danger_at(origin.x, origin.y):
+            return []
+        if distance is None:
+            distance = type(origin).distance_to
+        tracked = self._tracked
+        found = [(enemy, distance(origin, enemy)) for enemy in self._enemies
+                 if tracked[enemy][1] and enemy.is_alive]
+        found = [item for item in found if item[1] < radius]
+        found.sort(key=lambda item: item[1])
+        return [enemy for enemy, _ in found]
+
+    def nearest(self, origin, distance=None):
+        # Nearest living enemy, the first given on ties
+        if distance is None:
+            distance = type(origin).distance_to
+        best, best_distance = None, None
+        for enemy in self._enemies:
+            if not enemy.is_alive:
+                continue
+            value = distance(origin, enemy)
+            if best is None or value < best_distance:
+                best, best_distance = enemy, value
+        return best
@@ -0,0 +1,65 @@
+import math
+
+from robogame_engine.geometry import get_arctan
+from robogame_engine.theme import theme
+
+
+class ThreatDetector:
+    # Per tick snapshot of enemy drones: heading (degrees) and the set of sources each one is approaching.
+    # Sources are bucketed into a grid with cell size equal to the detection distance,
+    # so every enemy checks only the 3x3 cells around itself
+    def __init__(self, distance=None, angle=1.0):
+        if distance is None:
+            distance = theme.CARGO_TRANSITION_DISTANCE * 4.0
+        self._distance = float(distance)
+        self._angle = float(angle)
+        self._step = None
+        self._headings = {}
+        self._approaching = {}
+        self._targeted = set()
+
+    @property
+    def step(self):
+        return self._step
+
+    def update(self, step, enemies, sources):
+        if step == self._step:
+            return
+        self._step = step
+        self._headings.clear()
+        self._approaching.clear()
+        self._targeted.clear()
+
+        cell = self._distance
+        grid = {}
+        for s in sources:
+            grid.setdefault((int(s.x // cell), int(s.y // cell)), []).append(s)
+
+        for d in enemies:
+            if not d.is_alive:
+                continue
+            x, y, heading = d.x, d.y, d.direction
+            self._headings[d] = heading
+            approaching = set()
+            cx, cy = int(x // cell), int(y // cell)
+            for ix in (cx - 1, cx, cx + 1):
+                for iy in (cy - 1, cy, cy + 1):
+                    for s in grid.get((ix, iy), ()):
+                        dx, dy = s.x - x, s.y - y
+                        if math.hypot(dx, dy) >= self._distance:
+                            continue
+                        delta = (heading - get_arctan(dy, dx) + 180.0) % 360.0 - 180.0
+                        if math.fabs(delta) < self._angle:
+                            approaching.add(s)
+            if approaching:
+                self._approaching[d] = frozenset(approaching)
+                self._targeted.update(approaching)
+
+    def heading(self, enemy):
+        return self._headings.get(enemy)
+
+    def approaching(self, enemy):
+        return self._approaching.get(enemy, frozenset())
+
+    def is_targeted(self, target):
+        return target in self._targeted
@@ -0,0 +1,86 @@
+import math
+import time
+
+
+class TourPlanner:
+    # Plans a short multi-stop route start -> sources -> base that fills the cargo before returning.
+    # The score of a tour is elerium collected per distance travelled (plus a fixed cost per stop).
+    # Local search (insert, drop, replace a stop, 2-opt) runs from the best single-stop tours
+    # while the time budget lasts.
+    # Sources are (key, x, y, payload) tuples, the plan is the list of keys in visiting order
+    def __init__(self, max_stops=3, candidates=12, starts=3, stop_cost=0.0, time_budget=0.002):
+        self._max_stops = max_stops
+        self._candidates = candidates
+        self._starts = starts
+        self._stop_cost = stop_cost
+        self._time_budget = time_budget
+
+    def score(self, start, base, capacity, tour):
+        collected, length = 0, 0.0
+        x, y = start
+        for _, sx, sy, payload in tour:
+            length += math.hypot(sx - x, sy - y) + self._stop_cost
+            collected += min(payload, capacity - collected)
+            x, y = sx, sy
+        length += math.hypot(base[0] - x, base[1] - y)
+        return collected / length if length > 0 else float(collected)
+
+    def _neighbours(self, tour, candidates, lock):
+        # Insert an unused source, drop, replace a stop or reverse a segment (2-opt)
+        unused = [c for c in candidates if c not in tour]
+        if len(tour) < self._max_stops:
+            for c in unused:
+                for pos in range(lock, len(tour) + 1):
+                    yield tour[:pos] + [c] + tour[pos:]
+        for i in range(lock, len(tour)):
+            if len(tour) > 1:
+                yield tour[:i] + tour[i + 1:]
+            for c in unused:
+                yield tour[:i] + [c] + tour[i + 1:]
+            for j in range(i + 1, len(tour)):
+                yield tour[:i] + tour[i:j + 1][::-1] + tour[j + 1:]
+
+    def _improve(self, start, base, capacity, tour, candidates, lock, deadline):
+        best = self.score(start, base, capacity, tour)
+        improved = True
+        while improved and time.perf_counter() < deadline:
+            improved = False
+            for variant in self._neighbours(tour, candidates, lock):
+                value = self.score(start, base, capacity, variant)
+                if value > best:
+                    best, tour, improved = value, variant, True
+                    break
+        return best, tour
+
+    def plan(self, start, base, sources, capacity, first=None):
+        deadline = time.perf_counter() + self._time_budget
+        sources = [s for s in sources if s[3] > 0 or s[0] == first]
+        if capacity <= 0 or not sources:
+            return []
+
+        def single(s):
+            return self.score(start, base, capacity, [s])
+
+        fixed = [s for s in sources if s[0] == first][:1]
+        candidates = sorted((s for s in sources if s[0] != first), key=single, reverse=True)
+        candidates = candidates[:self._candidates]
+
+        # Local search from the best single stops while the time budget lasts, the first start always runs
+        starts = [fixed] if fixed else [[c] for c in candidates[:self._starts]]
+        best, tour = None, None
+        for initial in starts:
+            if tour is not None and time.perf_counter() >= deadline:
+                break
+            value, variant = self._improve(start, base, capacity, initial, candidates, len(fixed), deadline)
+            if best is None or value > best:
+                best, tour = value, variant
+        if tour is None:
+            return []
+
+        # Stops which collect nothing only add distance
+        collected, plan = 0, []
+        for key, _, _, payload in tour:
+            if collected < capacity:
+                plan.append(key)
+            collected += payload
+        return plan
@@ -0,0 +1,173 @@
+import struct
+import weakref
+from itertools import chain
+from multiprocessing import shared_memory
+
+# Fields of the world state, one float64 per object each. These are exactly the fields the teams read,
+# plus the kind of the object: team is an index in WorldState.teams (0 - no team), is_alive is 0.0 / 1.0
+FIELDS = ('x', 'y', 'direction', 'payload', 'meter_2', 'is_alive', 'team', 'kind')
+KINDS = ('asteroid', 'mothership', 'drone')
+# Team table: names of teams in UTF-8, the index of a slot plus one is the team id
+MAX_TEAMS = 8
+TEAM_NAME_SIZE = 32
+
+# Header: sequence counter, game step, objects count, capacity, teams count
+_HEADER = 5
+_ITEM = 8
+_TEAMS = _HEADER * _ITEM
+_DATA = _TEAMS + MAX_TEAMS * TEAM_NAME_SIZE
+
+
+class WorldState:
+    # Fixed layout world state in shared memory: a row of FIELDS per object. The main process updates it in place
+    # once per game step with a single pack, worker processes attach by name and read the columns (strided views)
+    # without copying or pickling.
+    # The sequence counter is odd while an update is in progress, a reader retries when it changed
+    # during the read (seqlock). Rows follow the order of the first update, objects never leave the scene.
+    # Team names are appended to the table before the first row with their id is written
+    _instances = weakref.WeakSet()
+
+    @classmethod
+    def close_all(cls):
+        # Release the segments of the process, when it plays the next match
+        for world in list(cls._instances):
+            world.close()
+
+    def __init__(self, capacity=None, name=None):
+        if name is None:
+            size = _DATA + capacity * len(FIELDS) * _ITEM
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+            self._owner = True
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            self._owner = False
+        self._header = self._shm.buf[:_HEADER * _ITEM].cast('q')
+        if self._owner:
+            self._header[3] = capacity
+        # The segment may be rounded up to pages, the capacity is taken from the header
+        capacity = self._capacity = self._header[3]
+        self._data = self._shm.buf[_DATA:_DATA + capacity * len(FIELDS) * _ITEM].cast('d')
+        self._columns = {f: self._data[i::len(FIELDS)] for i, f in enumerate(FIELDS)}
+        self._packers = {}
+        self._objects = []
+        self._rows = {}
+        self._team_ids = {None: 0}
+        self._closed = False
+        WorldState._instances.add(self)
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def seq(self):
+        return self._header[0]
+
+    @property
+    def step(self):
+        return self._header[1]
+
+    @property
+    def teams(self):
+        # Team names by team id, readable in any process attached to the segment
+        buf = self._shm.buf
+        names = [None]
+        for i in range(self._header[4]):
+            offset = _TEAMS + i * TEAM_NAME_SIZE
+            names.append(bytes(buf[offset:offset + TEAM_NAME_SIZE]).rstrip(b'\0').decode('utf-8'))
+        return names
+
+    def __len__(self):
+        return self._header[2]
+
+    # Writer side
+
+    def objects(self):
+        return list(self._objects)
+
+    def row(self, obj):
+        return self._rows.get(obj)
+
+    def team_id(self, team):
+        if team not in self._team_ids:
+            count = self._header[4]
+            name = str(team).encode('utf-8')
+            if count == MAX_TEAMS or len(name) > TEAM_NAME_SIZE:
+                raise ValueError('world state can not hold team {!r}'.format(team))
+            offset = _TEAMS + count * TEAM_NAME_SIZE
+            self._shm.buf[offset:offset + TEAM_NAME_SIZE] = name.ljust(TEAM_NAME_SIZE, b'\0')
+            self._header[4] = count + 1
+            self._team_ids[team] = count + 1
+        return self._team_ids[team]
+
+    def sync(self, scene):
+        # Once per game step, teammates calling it on the same step share the update
+        if self._objects and self.step == scene._step:
+            return
+        for kind, objects in enumerate((scene.asteroids, scene.motherships, scene.drones)):
+            for obj in objects:
+                if obj not in self._rows:
+                    if len(self._objects) == self._capacity:
+                        raise ValueError('world state capacity {} exceeded'.format(self._capacity))
+                    self._rows[obj] = len(self._objects)
+                    self._objects.append((obj, kind))
+        self.update(scene._step)
+
+    def update(self, step):
+        # Values are gathered before the sequence counter goes odd
+        team_id = self.team_id
+        rows = [(obj.coord.x, obj.coord.y, obj.direction, obj.payload, obj.meter_2, obj.is_alive,
+                 team_id(obj.team), kind) for obj, kind in self._objects]
+        count = len(rows)
+        packer = self._packers.get(count)
+        if packer is None:
+            packer = self._packers[count] = struct.Struct('{}d'.format(count * len(FIELDS)))
+        header = self._header
+        header[0] += 1
+        packer.pack_into(self._shm.buf, _DATA, *chain.from_iterable(rows))
+        header[1] = step
+        header[2] = count
+        header[0] += 1
+
+    # Reader side
+
+    def column(self, field):
+        # Zero-copy view of the whole column, check seq around the use of it or take a read() copy
+        return self._columns[field]
+
+    def read(self, fields=FIELDS, retries=1000):
+        # Consistent copy of the columns: (step, {field: list}), None if the writer did not let it happen
+        header = self._header
+        for _ in range(retries):
+            seq = header[0]
+            if seq & 1:
+                continue
+            step, count = header[1], header[2]
+            rows = self._data[:count * len(FIELDS)].tolist()
+            if header[0] == seq:
+                return step, {f: rows[FIELDS.index(f)::len(FIELDS)] for f in fields}
+        return None
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        WorldState._instances.discard(self)
+        for view in self._columns.values():
+            view.release()
+        self._columns.clear()
+        self._data.release()
+        self._header.release()
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,13 +1,27 @@
 # -*- coding: utf-8 -*-
-from random import randint, choice, uniform, shuffle
-
 import math
+import random
+
 from astrobox.core import Drone, Asteroid
 from astrobox.themes.default import MOTHERSHIP_HEALING_DISTANCE
 from robogame_engine import GameObject
 from robogame_engine.geometry import Point, Vector, normalise_angle
 from robogame_engine.theme import theme
 
+from stage_03_harvesters.utils.distances import DistanceMatrix
+from stage_03_harvesters.utils.geometry import StaticGeometry
+from stage_03_harvesters.utils.threatmap import ThreatMap
+from stage_03_harvesters.utils.tours import TourPlanner
+
+# Порог здоровья для возврата на базу выбирается случайно из этого диапазона
+LIMIT_HEALTH_MIN = 0.3
+LIMIT_HEALTH_MAX = 0.5
+# Запас элериума на базе, после которого сборщики меняют роль
+ROLE_SWITCH_PAYLOAD = 1000
+# Сколько астероидов сборщик может обойти за один рейс, 1 - возврат на базу после каждого
+TOUR_STOPS = 1
+RNG = random
+
 
 class Headquarters:
     """
@@ -39,6 +53,7 @@ class Headquarters:
         self.soldiers = []
         self.asteroids_in_work = []
         self.victims = []
+        self.threats = None
 
     def new_soldier(self, soldier):
         number_drones = len(self.soldiers)
@@ -89,17 +104,17 @@ class Headquarters:
 
     def get_actions(self, soldier):
 
-        enemies = self.get_enemies(soldier)
+        threats = self.get_threats(soldier)
         if len([1 for s in self.soldiers if s.is_alive]) <= 2 \
                 and not isinstance(soldier.role, Turel) \
-                and len(enemies) > 0 \
+                and len(threats) > 0 \
                 and soldier.have_gun:
             soldier.role.change_role(Turel)
             soldier.actions.append(['move', soldier.my_mothership, 1])
             return
 
         if (isinstance(soldier.role, Collector) and not isinstance(soldier.role, Transport)
-                and soldier.have_gun and soldier.my_mothership.payload > 1000):
+                and soldier.have_gun and soldier.my_mothership.payload > ROLE_SWITCH_PAYLOAD):
             enemies = self.get_enemies_by_base(soldier.my_mothership)
             for enemy in enemies:
                 if not (enemy in self.victims):
@@ -114,11 +129,7 @@ class Headquarters:
 
         purpose = soldier.role.next_purpose()
         if isinstance(soldier.role, BaseGuard):
-            enemies = self.get_enemies_by_base(soldier.my_mothership, nearest=False)
-            if enemies:
-                purpose = enemies[0]
-            else:
-                purpose = None
+            purpose = threats.nearest(soldier.my_mothership, distance=DistanceMatrix.for_turn(soldier).distance)
 
         if purpose:
             soldier.role.next_step(purpose)
@@ -126,6 +137,8 @@ class Headquarters:
             soldier.role.change_role()
 
     def get_enemies_by_base(self, base, nearest=True):
+        if nearest:
+            return self.get_threats(base).within(base, MOTHERSHIP_HEALING_DISTANCE * 2)
         enemies = self.get_enemies(base)
         result = []
         for enemy in enemies:
@@ -139,8 +152,24 @@ class Headquarters:
         enemies.sort(key=lambda x: x[1])
         return enemies
 
+    def get_threats(self, soldier):
+        """
+        Карта угроз: живые противники и их присутствие около каждой клетки поля.
+        Обновляется один раз за шаг игры, только для противников, сменивших клетку или погибших.
+
+        :param soldier: свой дрон или база
+        :return: ThreatMap
+        """
+        scene = soldier.scene
+        if self.threats is None:
+            self.threats = ThreatMap(scene.field, reach=MOTHERSHIP_HEALING_DISTANCE * 2, weight=lambda drone: 1.0)
+        if self.threats.step != scene._step:
+            self.threats.update(scene._step, [drone for drone in scene.drones if soldier.team != drone.team])
+        return self.threats
+
     def get_bases(self, soldier):
-        bases = [(base, soldier.distance_to(base)) for base in soldier.scene.motherships if
+        distance = DistanceMatrix.for_turn(soldier).distance
+        bases = [(base, distance(soldier, base)) for base in soldier.scene.motherships if
                  base.team != soldier.team and base.is_alive]
         bases.sort(key=lambda x: x[1])
         return bases
@@ -159,22 +188,22 @@ class Headquarters:
         :return: Point  - место атаки или None - если не выбрано место атаки
         """
         if isinstance(target, GameObject):
-            vec = Vector.from_points(target.coord, soldier.coord)
+            target_x, target_y = target.coord.x, target.coord.y
         elif isinstance(target, Point):
-            vec = Vector.from_points(target, soldier.coord)
+            target_x, target_y = target.x, target.y
         else:
             raise Exception("target must be GameObject or Point!".format(target, ))
 
-        dist = vec.module
-        _koef = 1 / dist
-        norm_vec = Vector(vec.x * _koef, vec.y * _koef)
-        vec_gunshot = norm_vec * min(int(soldier.attack_range), int(dist))
-        purpose = Point(target.coord.x + vec_gunshot.x, target.coord.y + vec_gunshot.y)
+        # Считаем на числах, Point создаётся только для проверяемых мест
+        vec_x, vec_y = float(soldier.coord.x - target_x), float(soldier.coord.y - target_y)
+        dist = math.sqrt(vec_x ** 2 + vec_y ** 2)
+        gunshot = min(int(soldier.attack_range), int(dist)) / dist
+        purpose_x, purpose_y = target_x + vec_x * gunshot, target_y + vec_y * gunshot
         angles = [0, 60, -60, 30, -30]
-        shuffle(angles)
+        RNG.shuffle(angles)
         for ang in angles:
-            place = self.get_place_near(purpose, target, ang)
-            if place and soldier.valide_place(place):
+            place = Point(*self.get_place_near_xy(purpose_x, purpose_y, target_x, target_y, ang))
+            if soldier.valide_place(place):
                 return place
         return None
 
@@ -186,9 +215,17 @@ class Headquarters:
         :param angle:
         :return: new place point
         """
-        vec = Vector(point.x - target.x, point.y - target.y)
-        vec.rotate(angle)
-        return Point(target.x + vec.x, target.y + vec.y)
+        return Point(*self.get_place_near_xy(point.x, point.y, target.x, target.y, angle))
+
+    def get_place_near_xy(self, x, y, target_x, target_y, angle):
+        """
+        Расчет места рядом с (x, y) с отклонением angle от цели (target_x, target_y), без создания Point и Vector
+        :return: координаты (x, y) нового места
+        """
+        dx, dy = x - target_x, y - target_y
+        module = math.sqrt(dx ** 2 + dy ** 2)
+        rad = math.atan2(dy, dx) + math.radians(angle)
+        return target_x + math.cos(rad) * module, target_y + math.sin(rad) * module
 
     def get_place_near_mothership(self, soldier):
         center_field = Point(theme.FIELD_WIDTH // 2, theme.FIELD_HEIGHT // 2)
@@ -236,14 +273,12 @@ class DevastatorDrone(Drone):
 
         if self.have_gun:
             self.attack_range = self.gun.shot_distance
-        self.limit_health = uniform(0.3, 0.5)
+        self.limit_health = RNG.uniform(LIMIT_HEALTH_MIN, LIMIT_HEALTH_MAX)
 
         if isinstance(self.role, Transport):
-            candidats_asteroids_for_basa = min([(asteroid.distance_to(self.my_mothership), asteroid)
-                                                for asteroid in self.asteroids if
-                                                asteroid not in self.asteroids_for_basa])
-
-            candidat_basa = candidats_asteroids_for_basa[1]
+            # Ближайший к базе астероид, ещё не занятый другим транспортом
+            neighbours = StaticGeometry.for_scene(self.scene).neighbours(self.my_mothership)
+            candidat_basa = [asteroid for asteroid in neighbours if asteroid not in self.asteroids_for_basa][0]
             self.add_basa(candidat_basa)
             self.basa = candidat_basa
         else:
@@ -325,7 +360,8 @@ class DevastatorDrone(Drone):
             self.role.change_role(Collector)
             return
 
-        if self.distance_to(self.my_mothership) < 150:
+        distance = DistanceMatrix.for_turn(self).distance
+        if distance(self, self.my_mothership) < 150:
             self.actions.append(["pass", self, 1])
             return
 
@@ -333,10 +369,10 @@ class DevastatorDrone(Drone):
             if not partner.is_alive or partner is self:
                 continue
 
-            if isinstance(object, GameObject) and self.distance_to(object) > partner.distance_to(object) \
+            if isinstance(object, GameObject) and distance(self, object) > distance(partner, object) \
                     and self.get_angle(partner, object) < 20 \
-                    and self.distance_to(partner) < self.distance_to(object) \
-                    and partner.distance_to(object) > 10 \
+                    and distance(self, partner) < distance(self, object) \
+                    and distance(partner, object) > 10 \
                     and not isinstance(self.role, Turel):
                 point_attack = self.headquarters.get_place_for_attack(self, object)
                 if point_attack and self.cost_forpost < 10:
@@ -361,11 +397,12 @@ class DevastatorDrone(Drone):
         # TODO - на линии огня не проанализирвать, т.к. не ясно где цель
 
         is_valide = 0 < point.x < theme.FIELD_WIDTH and 0 < point.y < theme.FIELD_HEIGHT
+        distance = DistanceMatrix.for_turn(self).distance
         for partner in self.headquarters.soldiers:
             if not partner.is_alive or partner is self:
                 continue
 
-            is_valide = is_valide and (partner.distance_to(point) >= self.save_distance)
+            is_valide = is_valide and (distance(partner, point) >= self.save_distance)
 
         return is_valide
 
@@ -402,7 +439,8 @@ class DevastatorDrone(Drone):
     # callbacks:
     def on_born(self):
         self.born_soldier()
-        nearesst_aster = [(self.distance_to(aster), aster) for aster in self.asteroids]
+        distance = DistanceMatrix.for_turn(self).distance
+        nearesst_aster = [(distance(self, aster), aster) for aster in self.asteroids]
         nearesst_aster.sort(key=lambda x: x[0])
         idx = len(self.headquarters.soldiers) - 1
         if self.have_gun:
@@ -480,6 +518,11 @@ class Collector(Behavior):
         asteroids.extend([drone for drone in self.unit.scene.drones
                           if not drone.is_alive and not drone.is_empty])
 
+        if TOUR_STOPS > 1 and not isinstance(self, Transport):
+            tour_purpose = self.find_tour_purpose(asteroids=asteroids)
+            if tour_purpose:
+                return tour_purpose
+
         first_purpose = self.find_nearest_purpose(asteroids=asteroids, threshold=self.unit.free_space)
         if first_purpose:
             return first_purpose
@@ -492,7 +535,9 @@ class Collector(Behavior):
 
     def find_nearest_purpose(self, asteroids, threshold=1):
         soldier = self.unit
-        purposes = [(soldier.distance_to(asteroid) + asteroid.distance_to(soldier.basa), asteroid)
+        distance = DistanceMatrix.for_turn(soldier).distance
+        static_distance = StaticGeometry.for_scene(soldier.scene).distance
+        purposes = [(distance(soldier, asteroid) + static_distance(asteroid, soldier.basa), asteroid)
                     for asteroid in asteroids if
                     asteroid.payload >= threshold]
 
@@ -509,6 +554,22 @@ class Collector(Behavior):
 
         return purpose
 
+    def find_tour_purpose(self, asteroids):
+        """
+        Первый астероид маршрута, который заполняет трюм за несколько остановок до возврата на базу.
+        Маршрут пересчитывается при каждом выборе цели
+
+        :param asteroids: доступные астероиды
+        :return: астероид или None
+        """
+        soldier = self.unit
+        sources = [(asteroid, asteroid.coord.x, asteroid.coord.y, asteroid.payload) for asteroid in asteroids
+                   if asteroid != soldier.old_asteroid]
+        tour = TourPlanner(max_stops=TOUR_STOPS).plan((soldier.coord.x, soldier.coord.y),
+                                                      (soldier.basa.coord.x, soldier.basa.coord.y),
+                                                      sources, soldier.free_space)
+        return tour[0] if tour else None
+
     def next_step(self, purpose):
         soldier = self.unit
         soldier.actions.append(['move', purpose, 1])
@@ -516,7 +577,7 @@ class Collector(Behavior):
             if not soldier.is_empty:
                 soldier.actions.append(['unload', purpose, 1])
             else:
-                if soldier.my_mothership.payload > 1000:
+                if soldier.my_mothership.payload > ROLE_SWITCH_PAYLOAD:
                     soldier.role.change_role()
                 return
         elif not soldier.is_full:
@@ -528,7 +589,7 @@ class Collector(Behavior):
 
         if purpose == soldier.old_asteroid:
             soldier.next_action()
-            if soldier.my_mothership.payload > 1000:
+            if soldier.my_mothership.payload > ROLE_SWITCH_PAYLOAD:
                 self.change_role()
 
     def next(self):
@@ -539,7 +600,7 @@ class Collector(Behavior):
 
 class Transport(Collector):
     def next(self):
-        if self.unit.have_gun and self.unit.my_mothership.payload > 1000:
+        if self.unit.have_gun and self.unit.my_mothership.payload > ROLE_SWITCH_PAYLOAD:
             return Spy(self.unit)
         return Collector(self.unit)
 
@@ -598,9 +659,9 @@ class CombatBot(Defender):
             return self.victim
 
         soldier = self.unit
-        enemies = soldier.headquarters.get_enemies(soldier)
-        if enemies:
-            self.victim = enemies[0][0]
+        self.victim = soldier.headquarters.get_threats(soldier).nearest(
+            soldier, distance=DistanceMatrix.for_turn(soldier).distance)
+        if self.victim:
             return self.victim
 
         self.victim = None
@@ -638,8 +699,7 @@ class Spy(Defender):
 
     def next(self):
         soldier = self.unit
-        enemies = soldier.headquarters.get_enemies(soldier)
-        if enemies:
+        if soldier.headquarters.get_threats(soldier):
             return CombatBot(self.unit)
         return Collector(self.unit)
 
@@ -664,8 +724,7 @@ class BaseGuard(Defender):
 
     def next(self):
         soldier = self.unit
-        enemies = soldier.headquarters.get_enemies(soldier)
-        if len(enemies) == 0:
+        if not soldier.headquarters.get_threats(soldier):
             return Collector(self.unit)
         return Spy(self.unit)
 
@@ -674,11 +733,8 @@ class Turel(Defender):
 
     def next_purpose(self):
         soldier = self.unit
-        enemies = soldier.headquarters.get_enemies(soldier)
-        if enemies:
-            return enemies[0][0]
-
-        return None
+        return soldier.headquarters.get_threats(soldier).nearest(soldier,
+                                                                 distance=DistanceMatrix.for_turn(soldier).distance)
 
     def next_step(self, target):
         soldier = self.unit
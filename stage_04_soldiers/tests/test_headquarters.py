@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+import unittest
+from types import SimpleNamespace
+
+from robogame_engine.geometry import Point
+from robogame_engine.theme import theme
+
+from stage_04_soldiers.devastator import Headquarters
+
+
+class Unit:
+
+    def __init__(self, x, y, team):
+        self.coord = Point(x, y)
+        self.team = team
+        self.is_alive = True
+
+    @property
+    def x(self):
+        return self.coord.x
+
+    @property
+    def y(self):
+        return self.coord.y
+
+    def distance_to(self, other):
+        return self.coord.distance_to(other.coord)
+
+
+class HeadquartersTest(unittest.TestCase):
+
+    def test_threats_without_field(self) -> None:
+        # SpaceField без field= играет на поле темы, scene.field при этом None
+        base = Unit(90, 90, 'own')
+        enemy = Unit(theme.FIELD_WIDTH - 90, theme.FIELD_HEIGHT - 90, 'enemy')
+        scene = SimpleNamespace(field=None, _step=1, drones=[Unit(100, 100, 'own'), enemy])
+        base.scene = scene
+        threats = Headquarters().get_threats(base)
+        self.assertEqual(threats.enemies, [enemy])
+        self.assertEqual(threats.danger_near(enemy), 1.0)
+        self.assertEqual(threats.danger_near(base), 0.0)
+        self.assertEqual(threats.within(base, 400), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
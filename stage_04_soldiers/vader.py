@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
+import random
 
 from astrobox.core import Drone
 
+RNG = random
+
 
 class VaderDrone(Drone):
     my_team = []
@@ -12,11 +15,10 @@ class VaderDrone(Drone):
         self.my_team.append(self)
 
     def _get_my_asteroid(self):
-        asteroids_with_elerium = set(aster for aster in self.asteroids if aster.payload)
         asteroids_as_targets = set(drone.target for drone in self.my_team)
-        free_asteroids = asteroids_with_elerium - asteroids_as_targets
+        free_asteroids = [aster for aster in self.asteroids if aster.payload and aster not in asteroids_as_targets]
         if free_asteroids:
-            return free_asteroids.pop()
+            return RNG.choice(free_asteroids)
 
     def on_stop_at_asteroid(self, asteroid):
         self.load_from(asteroid)
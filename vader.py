@@ -3,6 +3,8 @@ import random
 
 from astrobox.core import Drone
 
+RNG = random
+
 
 class VaderDrone(Drone):
     my_team = []
@@ -13,7 +15,7 @@ class VaderDrone(Drone):
         self.my_team.append(self)
 
     def _get_my_asteroid(self):
-        return random.choice(self.asteroids)
+        return RNG.choice(self.asteroids)
 
     def on_stop_at_asteroid(self, asteroid):
         self.load_from(asteroid)
@@ -0,0 +1,253 @@
+import math
+import random
+
+from robogame_engine.theme import theme
+
+from yurikov_team import settings
+
+RNG = random
+
+ATTACK = 'attack'
+RETREAT = 'retreat'
+REGROUP = 'regroup'
+ACTIONS = (ATTACK, RETREAT, REGROUP)
+
+# Вероятность того, что вражеский дрон в розыгрыше идёт на сближение, а не держит позицию
+ENEMY_ADVANCE = .6
+
+
+class CombatModel:
+    """
+    Дешёвая модель боя для розыгрышей будущего.
+
+    Дроны хранятся по столбцам (координаты, курс, щит, перезарядка, сторона, база), шаг модели - step тиков игры.
+    Дрон поворачивается к цели со скоростью поворота, летит, когда повёрнут, и стреляет, когда цель
+    в пределах выстрела (gun.shot_distance + радиус снаряда) и на линии огня. Снаряд долетает мгновенно,
+    но промахивается, если цель успевает сместиться поперёк линии огня больше, чем на сумму радиусов.
+    Щит восстанавливается у своей базы быстрее, как в движке.
+
+    Оценка исхода несимметрична: сбитый союзник стоит settings.ROLLOUT_LOSS полных щитов, сбитый враг - одного.
+    Потерянный дрон не вернуть, а щит восстанавливается у базы, поэтому размен дрона с почти пустым щитом
+    на урон врагу в оценке невыгоден.
+
+    """
+
+    def __init__(self, drone, step: int = None):
+        gun = drone.gun
+        self.step = step = step or settings.ROLLOUT_STEP
+        self.shot_range = gun.shot_distance + gun.projectile.radius
+        self.hit_radius = gun.projectile.radius
+        self.speed = theme.DRONE_SPEED * step
+        self.turn = theme.DRONE_TURN_SPEED * step
+        self.damage = theme.PROJECTILE_DAMAGE
+        self.reload = theme.PLASMAGUN_COOLDOWN_TIME / theme.PLASMAGUN_COOLDOWN_RATE
+        self.flight = 1.0 / theme.PROJECTILE_SPEED
+        self.max_health = theme.DRONE_MAX_SHIELD
+        self.heal_distance = theme.MOTHERSHIP_HEALING_DISTANCE
+        self.heal = theme.MOTHERSHIP_HEALING_RATE * step
+        self.renewal = theme.DRONE_SHIELD_RENEWAL_RATE * step
+        self.loss = settings.ROLLOUT_LOSS * self.max_health
+
+        mates = [mate for mate in drone.teammates + [drone] if mate.is_alive]
+        enemies = [enemy for enemy in drone.manager.enemy_drones if enemy.is_alive]
+        units = mates + enemies
+        self.size = len(units)
+        self.mates = len(mates)
+        self.x = [unit.coord.x for unit in units]
+        self.y = [unit.coord.y for unit in units]
+        self.heading = [unit.direction for unit in units]
+        self.health = [float(unit.health) for unit in units]
+        self.cooldown = [unit.gun.cooldown / theme.PLASMAGUN_COOLDOWN_RATE if unit.have_gun else math.inf
+                         for unit in units]
+        self.radius = [unit.radius for unit in units]
+        self.base = [(unit.my_mothership.coord.x, unit.my_mothership.coord.y)
+                     if unit.my_mothership and unit.my_mothership.is_alive else None for unit in units]
+
+    @property
+    def enemies(self) -> int:
+        return self.size - self.mates
+
+    def cost(self, horizon: int) -> int:
+        """
+        Стоимость одного розыгрыша в шагах модели, умноженных на число дронов, для бюджета.
+
+        :param horizon: int, длина розыгрыша в тиках
+        :return: int
+        """
+
+        return -(-horizon // self.step) * self.size
+
+    def play(self, action: str, horizon: int, rnd: random.Random) -> float:
+        """
+        Разыграть будущее, в котором союзники выполняют action.
+
+        :param action: str, ATTACK - союзники идут на ближайшего врага, RETREAT - к своей базе,
+            REGROUP - на дистанцию выстрела от ближайшего врага (как utils.get_combat_point), дальше в атаку
+        :param horizon: int, длина розыгрыша в тиках
+        :param rnd: random.Random, поток розыгрыша (поведение врагов и разброс попаданий)
+        :return: float, оценка исхода: щит и жизни живых союзников минус щит и жизни живых врагов
+            (жизнь союзника стоит self.loss, врага - полного щита)
+        """
+
+        size, mates = self.size, self.mates
+        x, y, heading = self.x[:], self.y[:], self.heading[:]
+        health, cooldown = self.health[:], self.cooldown[:]
+        radius, base = self.radius, self.base
+        advance = [True] * mates + [rnd.random() < ENEMY_ADVANCE for _ in range(size - mates)]
+        retreat = action == RETREAT
+        speed, turn, step = self.speed, self.turn, self.step
+        points = [None] * mates
+        if action == REGROUP and size > mates:
+            for i in range(mates):
+                j = min(range(mates, size), key=lambda k: math.hypot(x[k] - x[i], y[k] - y[i]))
+                distance = math.hypot(x[i] - x[j], y[i] - y[j]) or 1.0
+                points[i] = (x[j] + (x[i] - x[j]) / distance * self.shot_range,
+                             y[j] + (y[i] - y[j]) / distance * self.shot_range)
+
+        for _ in range(-(-horizon // step)):
+            moved = [False] * size
+            targets = [None] * size
+            for i in range(size):
+                if health[i] <= 0:
+                    continue
+                mine = i < mates
+                best, best_distance = None, math.inf
+                for j in range(mates, size) if mine else range(mates):
+                    if health[j] > 0:
+                        distance = math.hypot(x[j] - x[i], y[j] - y[i])
+                        if distance < best_distance:
+                            best, best_distance = j, distance
+                targets[i] = best
+                if mine and points[i] is not None:
+                    gx, gy = points[i]
+                    if math.hypot(gx - x[i], gy - y[i]) <= speed:
+                        x[i], y[i] = gx, gy
+                        points[i] = None
+                        moved[i] = True
+                        continue
+                    go = True
+                elif mine and retreat and base[i] is not None:
+                    gx, gy = base[i]
+                    if math.hypot(gx - x[i], gy - y[i]) <= self.heal_distance / 2:
+                        if best is None:
+                            continue
+                        gx, gy = x[best], y[best]
+                        go = False
+                    else:
+                        go = True
+                elif best is None:
+                    continue
+                else:
+                    gx, gy = x[best], y[best]
+                    go = advance[i] and best_distance > self.shot_range
+                delta = (math.degrees(math.atan2(gy - y[i], gx - x[i])) - heading[i] + 180) % 360 - 180
+                if abs(delta) > turn:
+                    heading[i] += math.copysign(turn, delta)
+                else:
+                    heading[i] += delta
+                    if go:
+                        rad = math.radians(heading[i])
+                        x[i] += speed * math.cos(rad)
+                        y[i] += speed * math.sin(rad)
+                        moved[i] = True
+
+            for i in range(size):
+                j = targets[i]
+                if health[i] <= 0 or j is None or health[j] <= 0 or cooldown[i] > 0:
+                    continue
+                if i < mates and moved[i] and (retreat or action == REGROUP):
+                    continue
+                dx, dy = x[j] - x[i], y[j] - y[i]
+                distance = math.hypot(dx, dy)
+                if distance > self.shot_range:
+                    continue
+                reach = self.hit_radius + radius[j]
+                aim = (math.degrees(math.atan2(dy, dx)) - heading[i] + 180) % 360 - 180
+                if abs(aim) > 90 or distance * abs(math.sin(math.radians(aim))) > reach:
+                    continue
+                cooldown[i] = self.reload
+                # Цель в движении смещается поперёк линии огня, пока летит снаряд
+                drift = 0.0
+                if moved[j]:
+                    side = math.radians(heading[j]) - math.atan2(dy, dx)
+                    drift = self.speed / step * distance * self.flight * abs(math.sin(side))
+                if drift * rnd.uniform(.5, 1.5) <= reach:
+                    health[j] = max(health[j] - self.damage, 0.0)
+
+            for i in range(size):
+                if health[i] <= 0:
+                    continue
+                cooldown[i] -= step
+                home = base[i]
+                if home is not None and math.hypot(home[0] - x[i], home[1] - y[i]) < self.heal_distance:
+                    health[i] = min(health[i] + self.heal, self.max_health)
+                else:
+                    health[i] = min(health[i] + self.renewal, self.max_health)
+
+        score = 0.0
+        for i in range(size):
+            if health[i] > 0:
+                score += health[i] + self.loss if i < mates else -health[i] - self.max_health
+        return score
+
+
+class RolloutEvaluator:
+    """
+    Выбор между атакой, отступлением и перегруппировкой розыгрышами модели боя (CombatModel).
+
+    Для каждого действия из возможных в точке решения разыгрываются одни и те же futures вариантов будущего
+    (общие случайные числа), выбирается действие с лучшей средней оценкой, при равенстве - действие по порогу.
+    Действие общее для команды (отступление одного дрона уводит всех), поэтому решение принимается
+    одно на команду и держится hold тиков, пока действие по порогу и возможные действия те же самые.
+    Бюджет - шагов модели на дрона (CombatModel.cost) за тик игры для всей команды: если розыгрыш в него
+    не помещается, решение принимается по порогу. Бюджет считается в шагах модели, а не во времени,
+    чтобы решения оставались воспроизводимыми при одном зерне матча.
+
+    """
+
+    def __init__(self, futures: int = None, horizon: int = None, budget: int = None, hold: int = None):
+        self.futures = futures or settings.ROLLOUT_FUTURES
+        self.horizon = horizon or settings.ROLLOUT_HORIZON
+        self.budget = budget or settings.ROLLOUT_BUDGET
+        self.hold = hold or settings.ROLLOUT_HOLD
+        self._step = None
+        self._spent = 0
+        self._decision = None
+        self.evaluated = 0
+        self.skipped = 0
+
+    def choose(self, drone, default: str, actions: tuple = ACTIONS) -> str:
+        """
+        Выбрать действие команды для дрона в бою.
+
+        :param drone: YurikovDrone object, дрон в точке решения
+        :param default: str, действие по порогу
+        :param actions: tuple, возможные действия (из ACTIONS)
+        :return: str, одно из actions
+        """
+
+        step = drone.scene._step
+        if step != self._step:
+            self._step, self._spent = step, 0
+        if self._decision is not None:
+            until, threshold, choices, action = self._decision
+            if step < until and threshold == default and choices == actions:
+                return action
+
+        model = CombatModel(drone)
+        if not model.enemies:
+            return default
+        cost = model.cost(self.horizon) * len(actions)
+        futures = min(self.futures, (self.budget - self._spent) // cost)
+        if futures < 1:
+            self.skipped += 1
+            return default
+        self._spent += futures * cost
+        self.evaluated += 1
+
+        seeds = [RNG.random() for _ in range(futures)]
+        scores = {action: sum(model.play(action, self.horizon, random.Random(seed)) for seed in seeds)
+                  for action in actions}
+        best = max(actions, key=lambda action: (scores[action], action == default))
+        self._decision = (step + self.hold, default, actions, best)
+        return best
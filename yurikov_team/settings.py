@@ -3,3 +3,21 @@ DRONES_AMOUNT = 5
 DRONES_SPEED = 5
 FIELD_SIZE = (1200, 1200)
 
+# Параметры поведения дронов (подбираются тюнером, см. runner/params.py)
+RETREAT_HEALTH = .4
+SYNC_STEPS_DUEL = 50
+SYNC_STEPS_PER_TEAM = 100
+# Сколько астероидов дрон может обойти за один рейс, 1 - возврат на базу после каждого
+TOUR_STOPS = 1
+
+# Выбор между атакой, отступлением и перегруппировкой в бою розыгрышами модели боя (rollouts.py), False - по порогам
+ROLLOUTS = False
+# Вариантов будущего на каждое действие, длина розыгрыша и шаг модели в тиках
+ROLLOUT_FUTURES = 4
+ROLLOUT_HORIZON = 240
+ROLLOUT_STEP = 10
+# Шагов модели x дронов на тик игры для команды (около 2.5 мкс каждый) и сколько тиков держится решение
+ROLLOUT_BUDGET = 2000
+ROLLOUT_HOLD = 25
+# Во сколько полных щитов розыгрыш оценивает потерю своего дрона (сбитый враг - один щит)
+ROLLOUT_LOSS = 4
@@ -2,7 +2,12 @@ from abc import ABC, abstractmethod
 
 from astrobox.core import MotherShip, Asteroid, Drone
 
+from stage_03_harvesters.utils.distances import DistanceMatrix
+from stage_03_harvesters.utils.geometry import StaticGeometry
+from stage_03_harvesters.utils.tours import TourPlanner
+from yurikov_team import settings
 from yurikov_team import utils
+from yurikov_team.rollouts import ATTACK, REGROUP, RETREAT, RolloutEvaluator
 
 LOAD_TASK = 'load_task'
 UNLOAD_TASK = 'unload_task'
@@ -30,6 +35,8 @@ class DroneState(ABC):
         Если задача для перемещения "на загрузку":
             если список вражеских баз для менеджера не пустой:
                 возвращает объект первой непустой и разрушенной базы.
+            иначе, если дрону разрешено обходить несколько астероидов за рейс (settings.TOUR_STOPS > 1):
+                возвращает первый астероид маршрута, заполняющего трюм (см. tour_asteroid);
             иначе:
                 формирует список отношений (для каждого астероида) и возвращает самый "выгодный" астероид.
 
@@ -48,10 +55,16 @@ class DroneState(ABC):
                 if not base.is_empty and not base.is_alive:
                     return base
 
+            if settings.TOUR_STOPS > 1:
+                asteroid = self.tour_asteroid()
+                if asteroid is not None:
+                    return asteroid
+
             relations = []
+            distance = StaticGeometry.for_scene(self.drone.scene).distance
             for obj in self.drone.asteroids:
                 if not obj.is_empty:
-                    rel = obj.payload / self.drone.my_mothership.distance_to(obj)
+                    rel = obj.payload / distance(self.drone.my_mothership, obj)
                     relations.append((obj, rel))
 
             relations.sort(key=lambda k: k[1], reverse=True)
@@ -69,6 +82,34 @@ class DroneState(ABC):
                 self.drone.task = UNLOAD_TASK
                 return self.drone.my_mothership
 
+    def tour_asteroid(self) -> Asteroid or None:
+        """
+        Найти первый астероид маршрута из нескольких остановок, который заполняет трюм до возврата на базу.
+
+        Маршрут пересчитывается при каждом выборе цели. Если непустых астероидов не меньше 5,
+        астероиды с другим "рабочим" пропускаются, а дрон становится "рабочим" выбранного астероида.
+
+        :return: Asteroid object or None, астероид или None, если подходящих астероидов нет
+        """
+
+        asteroids = [obj for obj in self.drone.asteroids if not obj.is_empty]
+        with_workers = len(asteroids) >= 5
+        if with_workers:
+            asteroids = [obj for obj in asteroids if obj.worker is None or obj.worker is self.drone]
+
+        sources = [(obj, obj.coord.x, obj.coord.y, obj.payload) for obj in asteroids]
+        mothership = self.drone.my_mothership
+        tour = TourPlanner(max_stops=settings.TOUR_STOPS).plan((self.drone.coord.x, self.drone.coord.y),
+                                                               (mothership.coord.x, mothership.coord.y),
+                                                               sources, self.drone.free_space)
+        if not tour:
+            return None
+
+        asteroid = tour[0]
+        if with_workers and not self.drone.is_transition_started:
+            asteroid.worker = self.drone
+        return asteroid
+
     @abstractmethod
     def state_on_heartbeat(self) -> None:
         """
@@ -171,35 +212,42 @@ class CombatState(DroneState):
         """
         Метод обработки действия внутри состояния.
 
-        Ищет и возвращает ближайшую к союзной базе цель для атаки.
+        Ищет и возвращает ближайшую к союзной базе цель для атаки
+        (противники, угрожающие базе, всегда ближе остальных).
 
         :return: Drone or MotherShip object, объект для атаки
         """
 
-        relations = []
-        enemy_is_near = []
         manager = self.drone.manager
-        extra_dist = manager.turret_point.distance_to(manager.my_mothership)
-
-        for i, drone in enumerate(manager.enemy_drones):
-            _is_base_in_danger = utils.is_base_in_danger(manager, manager.turret_point, drone)
-            from_mother_to_enemy = manager.my_mothership.distance_to(drone) - extra_dist
-            if _is_base_in_danger:
-                enemy_is_near.append((drone, from_mother_to_enemy))
-            else:
-                rel = manager.my_mothership.distance_to(drone)
-                relations.append((drone, rel))
-
-        relations.sort(key=lambda k: k[1])
-        enemy_is_near.sort(key=lambda k: k[1])
-
-        enemy_targets = [enemy[0] for enemy in enemy_is_near + relations] + manager.enemy_bases
+        distance = DistanceMatrix.for_turn(self.drone).distance
+        enemy = min((drone for drone in manager.enemy_drones if drone.is_alive),
+                    key=lambda drone: distance(manager.my_mothership, drone), default=None)
+        enemy_targets = ([enemy] if enemy else []) + manager.enemy_bases
         if enemy_targets:
             return enemy_targets[0]
         else:
             self.drone.is_victory = True
             return
 
+    def choose_action(self, default: str, actions: tuple) -> str:
+        """
+        Выбрать действие команды: атаку, отступление или перегруппировку.
+
+        По умолчанию решение принимается по порогу (default). Если включены розыгрыши (settings.ROLLOUTS),
+        выбирает оценщик команды (см. rollouts.RolloutEvaluator), он хранится у менеджера.
+
+        :param default: str, действие по порогу, ATTACK, RETREAT или REGROUP
+        :param actions: tuple, возможные действия
+        :return: str, одно из actions
+        """
+
+        if not settings.ROLLOUTS:
+            return default
+        manager = self.drone.manager
+        if manager.rollouts is None:
+            manager.rollouts = RolloutEvaluator()
+        return manager.rollouts.choose(self.drone, default, actions)
+
     def state_on_heartbeat(self) -> None:
         """
         Выполняется при каждом шаге игры.
@@ -211,8 +259,10 @@ class CombatState(DroneState):
                 вызывает метод regroup();
         ! Если дрон не находится "в боевом перемещении":
 
-            ! если прочность щита дрона упала ниже 40%:
+            ! если прочность щита дрона упала ниже 40% (и розыгрыши, если включены, выбрали отступление):
                 вызывает метод retreat();
+            ! если розыгрыши выбрали перегруппировку:
+                сообщает всем союзникам, что необходимо перегруппироваться;
 
             ! если цель дрона уничтожена:
                 вызывает метод at_eliminating_of_enemy();
@@ -253,12 +303,21 @@ class CombatState(DroneState):
 
         elif not self.drone.in_combat_move:
 
-            if self.drone.meter_2 < .4:
+            action = ATTACK
+            if self.drone.meter_2 < settings.RETREAT_HEALTH:
+                target = self.drone.target
+                action = self.choose_action(RETREAT, (RETREAT, ATTACK, REGROUP) if target and target.is_alive
+                                            else (RETREAT, ATTACK))
+
+            if action == RETREAT:
                 if not self.drone.manager.enemy_drones:
                     self.retreat()
                 else:
                     self.drone.need_to_retreat = True
 
+            elif action == REGROUP:
+                self.drone.need_to_regroup = True
+
             elif self.drone.target and not self.drone.target.is_alive:
                 self.at_eliminating_of_enemy()
 
@@ -283,7 +342,10 @@ class CombatState(DroneState):
                 убирает цель дрона;
             сортирует список вражеских баз.
         Иначе:
-            сообщает всем союзникам, что необходимо отступить.
+            если вражеских дронов больше 3 (или так решили розыгрыши, см. choose_action()):
+                сообщает всем союзникам, что необходимо отступить;
+            иначе:
+                убирает цель дрона.
 
         :return: None
         """
@@ -303,7 +365,7 @@ class CombatState(DroneState):
                 self.drone.target = None
             manager.enemy_bases.sort(key=lambda b: b.payload, reverse=True)
         else:
-            if len(self.drone.manager.enemy_drones) > 3:
+            if self.choose_action(RETREAT if len(manager.enemy_drones) > 3 else ATTACK, (RETREAT, ATTACK)) == RETREAT:
                 self.drone.need_to_retreat = True
             else:
                 self.drone.target = None
@@ -319,7 +381,8 @@ class CombatState(DroneState):
                 движется к врагу;
 
         ! Если на линии огня есть союзник:
-            вызывает метод regroup();
+            вызывает метод regroup() (или, если так решили розыгрыши, сообщает всем союзникам,
+            что необходимо отступить);
 
         Иначе:
             стреляет во врага;
@@ -345,6 +408,8 @@ class CombatState(DroneState):
                 self.retreat()
             elif not self.drone.manager.enemy_drones:
                 self.regroup()
+            elif self.choose_action(REGROUP, (REGROUP, RETREAT)) == RETREAT:
+                self.drone.need_to_retreat = True
             else:
                 self.drone.need_to_regroup = True
 
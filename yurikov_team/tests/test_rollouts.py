@@ -0,0 +1,100 @@
+import random
+import unittest
+from unittest.mock import Mock, patch
+
+from robogame_engine.geometry import Point
+
+from astrobox.core import Drone
+from astrobox.guns import PlasmaProjectile
+from yurikov_team import rollouts, settings
+from yurikov_team.rollouts import ATTACK, REGROUP, RETREAT, CombatModel, RolloutEvaluator
+
+
+def make_drone(x, y, health=100, base=(90, 90)):
+    drone = Mock()
+    drone.coord = Point(x, y)
+    drone.direction = 0.0
+    drone.health = health
+    drone.radius = Drone.radius
+    drone.is_alive = True
+    drone.have_gun = True
+    drone.gun.cooldown = 0
+    drone.gun.shot_distance = PlasmaProjectile.max_distance
+    drone.gun.projectile.radius = PlasmaProjectile.radius
+    drone.my_mothership.coord = Point(*base)
+    drone.my_mothership.is_alive = True
+    drone.scene._step = 100
+    return drone
+
+
+class RolloutsTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.drone = make_drone(300, 300, health=20)
+        self.mate = make_drone(250, 350)
+        self.enemy = make_drone(700, 700, base=(1110, 1110))
+        self.drone.teammates, self.mate.teammates = [self.mate], [self.drone]
+        self.mate.manager = self.drone.manager
+        self.drone.manager.enemy_drones = [self.enemy]
+
+    def test_model(self) -> None:
+        model = CombatModel(self.drone, step=10)
+        self.assertEqual((model.size, model.mates, model.enemies), (3, 2, 1))
+        self.assertEqual(model.cost(240), 24 * 3)
+        # Розыгрыш не меняет исходное состояние и повторяется при том же потоке
+        score = model.play(ATTACK, 240, random.Random(1))
+        self.assertEqual(model.play(ATTACK, 240, random.Random(1)), score)
+        self.assertEqual(model.health, [100.0, 20.0, 100.0])
+        # Без боя у базы щит только растёт, живой союзник стоит ROLLOUT_LOSS полных щитов
+        self.drone.manager.enemy_drones = []
+        self.assertEqual(CombatModel(self.drone).play(RETREAT, 240, random.Random(1)),
+                         2 * (100.0 + settings.ROLLOUT_LOSS * 100.0))
+
+    def test_loss(self) -> None:
+        # Дрон с почти пустым щитом против двух целых врагов: при симметричной оценке размен его на урон врагам
+        # выгоднее, с ценой потери ROLLOUT_LOSS - отступление
+        self.drone.health = 5
+        self.drone.manager.enemy_drones.append(make_drone(760, 640, base=(1110, 1110)))
+
+        def scores():
+            model = CombatModel(self.drone)
+            return {action: sum(model.play(action, 240, random.Random(seed)) for seed in range(4))
+                    for action in (ATTACK, RETREAT)}
+
+        with patch.object(settings, 'ROLLOUT_LOSS', 1):
+            symmetric = scores()
+        self.assertGreater(symmetric[ATTACK], symmetric[RETREAT])
+        weighted = scores()
+        self.assertGreater(weighted[RETREAT], weighted[ATTACK])
+
+    def test_regroup(self) -> None:
+        model = CombatModel(self.drone, step=10)
+        score = model.play(REGROUP, 240, random.Random(1))
+        self.assertEqual(model.play(REGROUP, 240, random.Random(1)), score)
+        self.assertEqual(model.x, [250, 300, 700])
+
+    def test_evaluator(self) -> None:
+        with patch.object(rollouts, 'RNG', random.Random(3)):
+            evaluator = RolloutEvaluator(futures=4, horizon=240, budget=10 ** 6, hold=25)
+            action = evaluator.choose(self.drone, RETREAT)
+            self.assertEqual(evaluator.evaluated, 1)
+            # Решение команды держится hold тиков, пока не сменилось действие по порогу
+            self.assertEqual(evaluator.choose(self.mate, RETREAT), action)
+            self.assertEqual(evaluator.evaluated, 1)
+            evaluator.choose(self.mate, ATTACK)
+            self.assertEqual(evaluator.evaluated, 2)
+            # Выбор только из действий, возможных в точке решения
+            self.assertIn(evaluator.choose(self.mate, REGROUP, (REGROUP, RETREAT)), (REGROUP, RETREAT))
+            self.assertEqual(evaluator.evaluated, 3)
+
+            # Розыгрыш не помещается в бюджет - действие по порогу
+            poor = RolloutEvaluator(futures=4, horizon=240, budget=10, hold=25)
+            self.assertEqual(poor.choose(self.drone, RETREAT), RETREAT)
+            self.assertEqual((poor.evaluated, poor.skipped), (0, 1))
+
+            self.drone.manager.enemy_drones = []
+            self.assertEqual(RolloutEvaluator().choose(self.drone, ATTACK), ATTACK)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,7 @@
 import unittest
 from unittest.mock import Mock
 
-from robogame_engine.geometry import Point
+from robogame_engine.geometry import Point, Vector
 
 import yurikov_team.utils as utils
 from astrobox.core import MotherShip, Drone
@@ -205,6 +205,27 @@ class UtilsTest(unittest.TestCase):
         end_point = (round(result.x, 1), round(result.y, 1))
         self.assertEqual(end_point, (100.0, 0.0))
 
+    def test_get_direction(self) -> None:
+        for dx, dy in [(0, 0), (0, 5), (0, -5), (3, 4), (-3, 4), (-3, -4), (3, -4), (7.5, 0), (-7.5, 0)]:
+            vector = Vector(float(dx), float(dy))
+            self.assertEqual(utils.get_direction(dx=float(dx), dy=float(dy)), vector.direction)
+
+    def test_xy_variants(self) -> None:
+        self.drone_mock.scene.teams = {'mock_team': [0] * 5}
+        self.drone_mock.id = 1
+        self.drone_mock.coord = Point(200, 250)
+        target_clone = Point(365, 340)
+        target_clone.coord = Point(365, 340)
+        result = utils.get_combat_point(src=self.drone_mock, target=target_clone)
+        self.assertEqual(utils.get_combat_xy(src=self.drone_mock, target=target_clone), (result.x, result.y))
+
+        result = utils.get_next_point(point=Point(100, 100), angle=45.0, length=100)
+        self.assertEqual(utils.get_next_xy(x=100, y=100, angle=45.0, length=100), (result.x, result.y))
+
+        result = utils.normalize_point(src=self.drone_mock, point=Point(-3, 1500), radius=self.drone_mock.radius)
+        self.assertEqual(utils.normalize_xy(src=self.drone_mock, x=-3, y=1500, radius=self.drone_mock.radius),
+                         (result.x, result.y))
+
     def test_is_base_in_danger(self) -> None:
         turret_point = Point(232.0, 134.0)
 
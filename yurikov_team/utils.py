@@ -1,6 +1,6 @@
 import math
 from astrobox.core import MotherShip, Drone
-from robogame_engine.geometry import Point, Vector
+from robogame_engine.geometry import Point
 
 
 def get_turret_point(src: Drone) -> Point:
@@ -44,9 +44,21 @@ def get_combat_point(src: Drone, target: Drone or MotherShip) -> Point:
     :return: Point, точка атаки
     """
 
-    center = Point(src.scene.field[0] / 2, src.scene.field[1] / 2)
-    direction_to_center = Vector.from_points(src.coord, center).direction
-    direction_to_target = Vector.from_points(src.coord, target.coord).direction
+    return Point(*get_combat_xy(src=src, target=target))
+
+
+def get_combat_xy(src: Drone, target: Drone or MotherShip) -> tuple:
+    """
+    Получить координаты точки для атаки на цель (см. get_combat_point), не создавая Point и Vector.
+
+    :param src: Drone object, дрон, для которого высчитываем положение точки
+    :param target: Drone or MotherShip object, цель для атаки
+    :return: tuple, координаты (x, y) точки атаки
+    """
+
+    src_x, src_y = src.coord.x, src.coord.y
+    direction_to_center = get_direction(src.scene.field[0] / 2 - src_x, src.scene.field[1] / 2 - src_y)
+    direction_to_target = get_direction(target.coord.x - src_x, target.coord.y - src_y)
     delta = get_delta_angle(direction_to_target, direction_to_center)
     if delta > 0:
         angle_direction = src.id % len(src.scene.teams[src.team])
@@ -65,11 +77,7 @@ def get_combat_point(src: Drone, target: Drone or MotherShip) -> Point:
     next_x = target.x + radius * math.cos(math.radians(angle))
     next_y = target.y + radius * math.sin(math.radians(angle))
 
-    _point = Point(next_x, next_y)
-
-    res_point = normalize_point(src=src, point=_point, radius=src.radius)
-
-    return res_point
+    return normalize_xy(src=src, x=next_x, y=next_y, radius=src.radius)
 
 
 def check_for_enemy(src: Drone, enemy: Drone or MotherShip) -> bool:
@@ -82,7 +90,7 @@ def check_for_enemy(src: Drone, enemy: Drone or MotherShip) -> bool:
     """
 
     angle = get_firing_angle(shooter=src, target=enemy)
-    direction_to_enemy = Vector.from_points(src.coord, enemy.coord).direction
+    direction_to_enemy = get_direction(enemy.coord.x - src.coord.x, enemy.coord.y - src.coord.y)
     delta = get_delta_angle(a_angle=src.direction, b_angle=direction_to_enemy)
     return abs(delta) <= angle
 
@@ -104,7 +112,7 @@ def check_for_teammates(src: Drone) -> Drone or MotherShip:
             return mate
 
         angle = get_firing_angle(shooter=src, target=mate)
-        direction_to_mate = Vector.from_points(src.coord, mate.coord).direction
+        direction_to_mate = get_direction(mate.coord.x - src.coord.x, mate.coord.y - src.coord.y)
         delta = get_delta_angle(a_angle=src.direction, b_angle=direction_to_mate)
         if abs(delta) <= angle:
             return mate
@@ -147,6 +155,23 @@ def get_delta_angle(a_angle: float, b_angle: float) -> float:
         return delta
 
 
+def get_direction(dx: float, dy: float) -> float:
+    """
+    Получить направление вектора (в градусах), как Vector.direction движка, не создавая Vector.
+
+    :param dx: float, проекция вектора на ось x
+    :param dy: float, проекция вектора на ось y
+    :return: float, направление вектора от 0 до 360
+    """
+
+    if dx == 0:
+        return 90.0 if dy >= 0 else 270.0
+    direction = math.atan(dy / dx) * (180 / math.pi)
+    if dx < 0:
+        direction += 180
+    return direction % 360
+
+
 def get_next_point(point: Point, angle: float, length: float) -> Point:
     """
     Получить следующую точку для перемещения
@@ -158,10 +183,22 @@ def get_next_point(point: Point, angle: float, length: float) -> Point:
     :return: Point, следующая точка для перемещения
     """
 
+    return Point(*get_next_xy(x=point.x, y=point.y, angle=angle, length=length))
+
+
+def get_next_xy(x: float, y: float, angle: float, length: float) -> tuple:
+    """
+    Получить координаты следующей точки для перемещения (см. get_next_point).
+
+    :param x: float, координата x текущей точки
+    :param y: float, координата y текущей точки
+    :param angle: float, угол поворота отрезка
+    :param length: float, длина отрезка
+    :return: tuple, координаты (x, y) следующей точки
+    """
+
     _angle = math.radians(angle)
-    next_x = point.x + math.cos(_angle) * length
-    next_y = point.y + math.sin(_angle) * length
-    return Point(next_x, next_y)
+    return x + math.cos(_angle) * length, y + math.sin(_angle) * length
 
 
 def normalize_point(src: Drone, point: Point, radius: float) -> Point:
@@ -176,15 +213,23 @@ def normalize_point(src: Drone, point: Point, radius: float) -> Point:
     :return: Point, нормализованная точка
     """
 
-    x_list = [radius + 2, src.scene.field[0] - radius - 2, point.x]
-    y_list = [radius + 2, src.scene.field[1] - radius - 2, point.y]
+    return Point(*normalize_xy(src=src, x=point.x, y=point.y, radius=radius))
 
-    x_list.sort()
-    y_list.sort()
 
-    _point = Point(x_list[1], y_list[1])
+def normalize_xy(src: Drone, x: float, y: float, radius: float) -> tuple:
+    """
+    Нормализовать координаты точки (см. normalize_point).
+
+    :param src: Drone, дрон-источник
+    :param x: float, координата x точки
+    :param y: float, координата y точки
+    :param radius: float, радиус объекта
+    :return: tuple, нормализованные координаты (x, y)
+    """
 
-    return _point
+    low = radius + 2
+    return (min(max(x, low), src.scene.field[0] - low),
+            min(max(y, low), src.scene.field[1] - low))
 
 
 def is_base_in_danger(src: Drone, turret_point: Point, target: Drone or MotherShip) -> bool:
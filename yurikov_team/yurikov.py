@@ -1,5 +1,6 @@
 from astrobox.core import Drone, Asteroid, MotherShip
 from robogame_engine.geometry import Point
+from yurikov_team import settings
 from yurikov_team import states
 from yurikov_team import utils
 
@@ -33,6 +34,7 @@ class YurikovDrone(Drone):
         self.is_victory = False
         self.enemy_drones = None
         self.enemy_bases = None
+        self.rollouts = None
         self.task = None
         self.is_transition_started = False
         self.is_transition_finished = True
@@ -156,7 +158,7 @@ class YurikovDrone(Drone):
         self.states_handle_list = [states.CombatState(self), states.MoveState(self), states.TransitionState(self)]
 
         _teams = len(self.scene.teams)
-        self.max_game_step = 50 if _teams <= 2 else 100 * _teams
+        self.max_game_step = settings.SYNC_STEPS_DUEL if _teams <= 2 else settings.SYNC_STEPS_PER_TEAM * _teams
 
         self.turret_point = utils.get_turret_point(self)
         self.switch_state(mode=self.MOVE_MODE)